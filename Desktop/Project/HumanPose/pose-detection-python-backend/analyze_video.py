@@ -1,7 +1,7 @@
 from pathlib import Path
 import sys
 import cv2
-from src.ml.pose_detector import pose_detector
+from src.ml.pose_detector import PoseDetector
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -18,16 +18,17 @@ def analyze_video(input_path: str, output_path: str):
     fourcc = cv2.VideoWriter_fourcc(*"mp4v")
     out = cv2.VideoWriter(output_path, fourcc, fps, (w, h))
 
+    pose_detector = PoseDetector()
+    session_id = f"annotate:{input_path}"
+
     frame_idx = 0
     while True:
         ret, frame = cap.read()
         if not ret:
             break
-        # MediaPipe expects RGB
-        img_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = pose_detector.pose.process(img_rgb)
-        if results.pose_landmarks:
-            pose_detector.mp_drawing.draw_landmarks(frame, results.pose_landmarks, pose_detector.mp_pose.POSE_CONNECTIONS)
+        landmarks = pose_detector.detect_frame(frame, session_id)
+        if landmarks is not None:
+            pose_detector.draw_landmarks(frame, landmarks)
         out.write(frame)
         frame_idx += 1
         if frame_idx % 100 == 0:
@@ -35,6 +36,7 @@ def analyze_video(input_path: str, output_path: str):
 
     cap.release()
     out.release()
+    pose_detector.release_tracker(session_id)
     logger.info(f"Saved annotated video to {output_path}")
 
 if __name__ == "__main__":
@@ -42,8 +44,3 @@ if __name__ == "__main__":
         print("Usage: python analyze_video.py /path/to/input.mp4 /path/to/output.mp4")
         sys.exit(1)
     analyze_video(sys.argv[1], sys.argv[2])
-    cd /Users/mac/Desktop/Project/HumanPose/pose-detection-python-backend
-    python3 -m venv venv
-    source venv/bin/activate
-    pip install -r requirements.txt || pip install fastapi uvicorn[standard] python-multipart aiofiles opencv-python mediapipe numpy python-dotenv pillow
-    export PYTHONPATH="$(pwd):$PYTHONPATH"
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+Keyframe-plus-interpolation against detecting every frame
+
+Analyzes the synthetic clip once per keyframe interval and prints wall
+time, detected/interpolated frame counts, the overall score and how far
+the landmarks land from detecting every frame (mean x/y distance, in
+percent of the frame), so the speedup and the accuracy cost of
+keyframe_interval can be checked.
+
+The first interval is the reference for the drift column.
+
+Usage: python -m benchmarks.keyframes [frames] [interval ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_clip import write_clip
+from src.ml.landmark_frame import LandmarkFrame
+from src.services.video_analysis import analyze_video, get_pose_service
+
+
+def landmark_positions(result) -> dict:
+    """x/y of every frame's landmarks, by frame number"""
+    return {
+        frame["frame"]: LandmarkFrame.from_dict(frame["landmarks"]).data[:, :2]
+        for frame in result["results"]
+    }
+
+
+def run(frames: int = 90, intervals=(1, 5)):
+    pose_service = get_pose_service()
+    with tempfile.TemporaryDirectory() as directory:
+        clip = write_clip(os.path.join(directory, "clip.mp4"), frames)
+        # Load the models before timing anything
+        analyze_video(clip, "bench:warmup", "squat", keyframe_interval=1, pose_service=pose_service)
+
+        print(f"{'interval':>8} {'seconds':>8} {'detected':>8} {'interp.':>8} {'score':>6} {'drift %':>8}")
+        reference = None
+        for interval in intervals:
+            started = time.perf_counter()
+            result = analyze_video(
+                clip, f"bench:{interval}", "squat", keyframe_interval=interval, pose_service=pose_service
+            )
+            seconds = time.perf_counter() - started
+            stats = result["frame_stats"]
+            positions = landmark_positions(result)
+            if reference is None:
+                reference = positions
+            shared = sorted(set(positions) & set(reference))
+            drift = np.mean([
+                np.linalg.norm(positions[number] - reference[number], axis=1).mean() for number in shared
+            ]) * 100 if shared else float("nan")
+            print(
+                f"{interval:>8} {seconds:>8.2f} {stats['detected']:>8} "
+                f"{stats['interpolated']:>8} {result['score']:>6.2f} {drift:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(args[0] if args else 90, tuple(args[1:]) or (1, 5))
@@ -0,0 +1,56 @@
+"""
+Decode-ahead pipeline of the video analysis
+
+Analyzes the synthetic clip once per decode queue size and prints the
+FrameReader stats kept in frame_stats["pipeline"]: wall time, time spent
+decoding, time the decoder waited for room in the queue ("blocked"),
+time inference waited for a decoded frame ("starved") and how full the
+queue was on average and at most.
+
+Starved time close to zero means decoding is hidden behind inference;
+on a machine with a single core the two still share it, so the overlap
+shows up there as blocked time rather than a shorter wall time.
+
+Usage: python -m benchmarks.pipeline [frames] [queue size ...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_clip import write_clip
+from src.config import settings
+from src.services.video_analysis import detect_frames, get_pose_service
+
+
+def run(frames: int = 360, queue_sizes=(1, 8)):
+    pose_service = get_pose_service()
+    default_size = settings.VIDEO_DECODE_QUEUE_SIZE
+    with tempfile.TemporaryDirectory() as directory:
+        clip = write_clip(os.path.join(directory, "clip.mp4"), frames)
+        # Load the models before timing anything
+        detect_frames(clip, "bench:warmup", pose_service=pose_service, end=10)
+
+        print(
+            f"{'queue':>5} {'seconds':>8} {'decode':>7} {'blocked':>8} {'starved':>8} "
+            f"{'mean occ.':>9} {'max occ.':>8}"
+        )
+        try:
+            for size in queue_sizes:
+                settings.VIDEO_DECODE_QUEUE_SIZE = size
+                started = time.perf_counter()
+                detection = detect_frames(clip, f"bench:{size}", pose_service=pose_service)
+                seconds = time.perf_counter() - started
+                stats = detection["frame_stats"]["pipeline"]
+                print(
+                    f"{size:>5} {seconds:>8.2f} {stats['decode_seconds']:>7.2f} "
+                    f"{stats['decode_blocked_seconds']:>8.2f} {stats['inference_starved_seconds']:>8.2f} "
+                    f"{stats['mean_occupancy']:>9.2f} {stats['max_occupancy']:>8}"
+                )
+        finally:
+            settings.VIDEO_DECODE_QUEUE_SIZE = default_size
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(args[0] if args else 360, tuple(args[1:]) or (1, 8))
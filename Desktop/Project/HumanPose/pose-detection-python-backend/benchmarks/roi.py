@@ -0,0 +1,84 @@
+"""
+Crops around the previous pose against the full frame
+
+Runs the frames of the synthetic clip through PoseDetector.detect_frame
+once with ROI cropping and once without, the way a live session sends
+them, and prints for each: milliseconds per frame (mean and median),
+frames that went through a crop or the full frame, and how far the
+landmarks land from the full-frame run (mean x/y distance, in percent of
+the frame).
+
+The frames are decoded up front, so only inference and the crop itself
+are timed.
+
+Usage: python -m benchmarks.roi [frames]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from benchmarks.synthetic_clip import write_clip
+from src.services.video_analysis import get_pose_service
+
+
+def read_frames(path: str) -> list:
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def run_session(detector, frames, session_id: str):
+    """Per-frame seconds, landmarks and the tracker's crop/full counts of one pass"""
+    seconds, landmarks = [], []
+    for frame in frames:
+        started = time.perf_counter()
+        landmarks.append(detector.detect_frame(frame, session_id))
+        seconds.append(time.perf_counter() - started)
+    tracker = detector.trackers.get(session_id)
+    counts = (tracker.roi_frames, tracker.full_frames)
+    detector.release_tracker(session_id)
+    return np.array(seconds), landmarks, counts
+
+
+def run(frames: int = 150):
+    detector = get_pose_service().detector
+    roi = detector.roi
+    with tempfile.TemporaryDirectory() as directory:
+        clip = read_frames(write_clip(os.path.join(directory, "clip.mp4"), frames))
+
+    try:
+        # Load the models before timing anything
+        run_session(detector, clip[:10], "bench:warmup")
+
+        detector.roi = None
+        full = run_session(detector, clip, "bench:full")
+        detector.roi = roi
+        cropped = run_session(detector, clip, "bench:roi")
+    finally:
+        detector.roi = roi
+
+    reference = full[1]
+    print(f"{'run':>5} {'ms/frame':>9} {'median':>7} {'crops':>6} {'full':>5} {'drift %':>8}")
+    for name, (seconds, landmarks, (crops, full_frames)) in (("full", full), ("roi", cropped)):
+        drift = np.mean([
+            np.linalg.norm(found[:, :2] - expected[:, :2], axis=1).mean()
+            for found, expected in zip(landmarks, reference) if found is not None and expected is not None
+        ]) * 100
+        print(
+            f"{name:>5} {seconds.mean() * 1000:>9.2f} {np.median(seconds) * 1000:>7.2f} "
+            f"{crops:>6} {full_frames:>5} {drift:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    run(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,72 @@
+"""
+Segmented analysis against one pass over the whole video
+
+Analyzes the synthetic clip once as a whole and once split the way the
+job engine splits long videos (plan_segments, with the segment length
+scaled down to the clip), stitches the segments and prints, for each:
+wall time, frames recorded, whether the frame numbers match the whole
+pass exactly, how far the landmarks land from it (mean x/y distance, in
+percent of the frame) and the overall score.
+
+The segments run one after another here; in the job engine they run on
+separate workers, so the wall time of a job is closer to the slowest
+segment than to their sum.
+
+Usage: python -m benchmarks.segments [frames] [segments]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic_clip import write_clip
+from src.services.video_analysis import (
+    detect_frames, get_pose_service, plan_segments, probe_video, score_frames, stitch_segments
+)
+
+
+def run(frames: int = 240, segments: int = 3, keyframe_interval: int = 1):
+    pose_service = get_pose_service()
+    with tempfile.TemporaryDirectory() as directory:
+        clip = write_clip(os.path.join(directory, "clip.mp4"), frames)
+        info = probe_video(clip)
+        plan = plan_segments(info, segments, frames / segments / info["fps"], overlap_seconds=1.0)
+        # Load the models before timing anything
+        detect_frames(clip, "bench:warmup", pose_service=pose_service, end=10)
+
+        started = time.perf_counter()
+        whole = detect_frames(clip, "bench:whole", keyframe_interval=keyframe_interval, pose_service=pose_service)
+        whole_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        parts = [
+            detect_frames(
+                clip, f"bench:{index}", keyframe_interval=keyframe_interval, pose_service=pose_service, **segment
+            )
+            for index, segment in enumerate(plan)
+        ]
+        stitched = stitch_segments(parts)
+        stitched_seconds = time.perf_counter() - started
+
+        reference = {number: landmarks[:, :2] for number, landmarks, _ in whole["records"]}
+        bounds = ", ".join(f"{segment['start']}-{segment['end'] or frames}" for segment in plan)
+        print(f"segments: {bounds}")
+        print(f"{'run':>9} {'seconds':>8} {'frames':>7} {'same':>5} {'drift %':>8} {'score':>6}")
+        for name, detection, seconds in (("whole", whole, whole_seconds), ("segmented", stitched, stitched_seconds)):
+            numbers = [record[0] for record in detection["records"]]
+            drift = np.mean([
+                np.linalg.norm(landmarks[:, :2] - reference[number], axis=1).mean()
+                for number, landmarks, _ in detection["records"] if number in reference
+            ]) * 100
+            score = score_frames(detection, "squat", pose_service)["score"]
+            print(
+                f"{name:>9} {seconds:>8.2f} {len(numbers):>7} {str(numbers == list(reference)):>5} "
+                f"{drift:>8.2f} {score:>6.2f}"
+            )
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*args)
@@ -0,0 +1,73 @@
+"""
+Synthetic test clips for the benchmarks
+
+A flat-shaded figure sways side to side while bending its knees, on a
+plain background. MediaPipe finds it on every frame, and the clip is
+generated from code, so runs can be repeated on any machine without
+shipping video files.
+
+Usage: python -m benchmarks.synthetic_clip /path/to/clip.mp4 [frames]
+"""
+import sys
+
+import cv2
+import numpy as np
+
+WIDTH = 1280
+HEIGHT = 720
+FPS = 30
+
+
+def draw_figure(dx: int = 0, knee: int = 0) -> np.ndarray:
+    """
+    Draw one frame
+
+    Args:
+        dx: Horizontal offset of the figure from the center, in pixels
+        knee: How far the knees bend outwards, in pixels
+
+    Returns:
+        BGR frame of WIDTH x HEIGHT
+    """
+    image = np.full((HEIGHT, WIDTH, 3), (200, 200, 200), np.uint8)
+    cx = WIDTH // 2 + dx
+    skin, shirt, pants = (140, 170, 220), (60, 60, 180), (90, 50, 30)
+
+    cv2.circle(image, (cx, 150), 45, skin, -1)
+    cv2.circle(image, (cx - 15, 140), 6, (0, 0, 0), -1)
+    cv2.circle(image, (cx + 15, 140), 6, (0, 0, 0), -1)
+    cv2.rectangle(image, (cx - 70, 200), (cx + 70, 400), shirt, -1)
+    for side in (-1, 1):
+        cv2.line(image, (cx + side * 70, 215), (cx + side * 110, 320), shirt, 30)
+        cv2.line(image, (cx + side * 110, 320), (cx + side * 120, 420), skin, 25)
+        cv2.line(image, (cx + side * 40, 400), (cx + side * (45 + knee), 530), pants, 40)
+        cv2.line(image, (cx + side * (45 + knee), 530), (cx + side * 45, 660), pants, 35)
+        cv2.ellipse(image, (cx + side * 55, 670), (30, 12), 0, 0, 360, (0, 0, 0), -1)
+    return image
+
+
+def write_clip(path: str, frames: int = 90) -> str:
+    """
+    Write a clip of the moving figure as MPEG-4
+
+    Args:
+        path: Output .mp4 path
+        frames: Number of frames, the motion repeats every 90 or so
+
+    Returns:
+        The path written
+    """
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), FPS, (WIDTH, HEIGHT))
+    for i in range(frames):
+        # i % 90 keeps longer clips a loop of the same 90 frames
+        t = i % 90
+        out.write(draw_figure(dx=int(100 * np.sin(t / 15)), knee=int(20 * abs(np.sin(t / 10)))))
+    out.release()
+    return path
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m benchmarks.synthetic_clip /path/to/clip.mp4 [frames]")
+        sys.exit(1)
+    write_clip(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 90)
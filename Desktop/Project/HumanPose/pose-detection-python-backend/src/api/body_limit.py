@@ -0,0 +1,64 @@
+from typing import Dict
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+def too_large_detail(max_size: int) -> str:
+    """Same wording as the size check of StorageService"""
+    return f"File too large, at most {round(max_size / (1024 * 1024), 2):g}MB allowed"
+
+
+class BodySizeLimitMiddleware:
+    """
+    Refuse upload request bodies over a size limit before they are parsed.
+
+    FastAPI parses a multipart form, spooling every file to disk, before
+    the endpoint runs, so a size check in the endpoint comes after the
+    whole body was received. This checks the Content-Length header and
+    answers 413 right away when it is over the limit, and counts the
+    body bytes as they arrive for requests without one, raising a 413
+    HTTPException out of the form parsing once they pass the limit.
+
+    The limit of a path is its file size limit plus `overhead` for the
+    multipart boundaries, part headers and the other form fields.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, int], overhead: int = 64 * 1024):
+        """
+        Args:
+            app: Application to wrap
+            limits: File size limit in bytes by request path, other paths are not limited
+            overhead: Bytes allowed on top of the file size limit
+        """
+        self.app = app
+        self.limits = limits
+        self.overhead = overhead
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        max_size = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if max_size is None:
+            await self.app(scope, receive, send)
+            return
+
+        limit = max_size + self.overhead
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": too_large_detail(max_size)}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise HTTPException(status_code=413, detail=too_large_detail(max_size))
+            return message
+
+        await self.app(scope, limited_receive, send)
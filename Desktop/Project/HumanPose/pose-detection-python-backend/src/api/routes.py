@@ -6,6 +6,8 @@ from pydantic import BaseModel
 import numpy as np
 import cv2
 
+from src.ml.model_tiers import resolve_tier
+from src.feedback.catalog import feedback_catalog
 from src.services.pose_service import PoseService
 from src.services.chatbot_service import ChatbotService
 from src.utils.logger import setup_logger
@@ -24,6 +26,12 @@ async def health_check():
     return {"status": "healthy", "service": "pose-detection"}
 
 
+@router.get("/api/feedback/messages")
+async def feedback_messages():
+    """Feedback message catalog, live sessions send these ids instead of the texts"""
+    return {"messages": feedback_catalog.to_list()}
+
+
 @router.post("/api/chatbot")
 async def chatbot_endpoint(request: dict):
     """AI Chatbot endpoint"""
@@ -55,25 +63,29 @@ async def chatbot_endpoint(request: dict):
 @router.post("/analyze/image")
 async def analyze_image(
     file: UploadFile = File(...),
-    exercise_type: str = Form("squat")
+    exercise_type: str = Form("squat"),
+    quality: Optional[str] = Form(None)
 ):
     """Analyze uploaded image for pose"""
     try:
         logger.info(f"📸 Analyzing image: {file.filename}")
         
+        try:
+            resolve_tier(quality)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
         # Read file contents
         contents = await file.read()
         
-        # Convert to numpy array
-        nparr = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        
-        if image is None:
+        # Analyze the image (landmarks come from the cache for repeat uploads)
+        try:
+            result, image = await pose_service.analyze_image_bytes_async(
+                contents, exercise_type, quality, keep_image=True
+            )
+        except ValueError:
             raise HTTPException(status_code=400, detail="Invalid image format")
         
-        # Analyze the image
-        result = pose_service.analyze_image(image, exercise_type)
-        
         if not result:
             raise HTTPException(status_code=400, detail="No pose detected in image")
         
@@ -105,6 +117,8 @@ async def analyze_image(
                 'angles': {},
                 'score': result['score'],
                 'feedback': result['feedback'],
+                'model_tier': result['model_tier'],
+                'cached': result['cached'],
                 'visualized_image': f'data:image/jpeg;base64,{img_base64}'
             }
         }
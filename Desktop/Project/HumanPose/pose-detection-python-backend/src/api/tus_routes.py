@@ -0,0 +1,272 @@
+import asyncio
+import base64
+import binascii
+from email.utils import formatdate
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Request, Response
+from starlette.requests import ClientDisconnect
+
+from src.api.upload_routes import check_job_capacity, queue_video_analysis, validate_video_options
+from src.config import settings
+from src.services.storage_service import StorageService, UploadRejected
+from src.services.upload_store import ResumableUpload, UploadConflict, upload_store
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Resumable video uploads following the tus 1.0.0 core protocol (https://tus.io/protocols/resumable-upload)
+# with the creation, termination and expiration extensions:
+#   POST   /api/uploads       create an upload (Upload-Length, Upload-Metadata)
+#   HEAD   /api/uploads/{id}  current Upload-Offset, to resume after a dropped connection
+#   PATCH  /api/uploads/{id}  append bytes at Upload-Offset; the last one queues the analysis
+#   DELETE /api/uploads/{id}  abandon an upload
+# Uploads are removed RESUMABLE_UPLOAD_EXPIRY_HOURS after creation, reported in Upload-Expires
+router = APIRouter(prefix="/uploads")
+
+TUS_VERSION = "1.0.0"
+TUS_EXTENSIONS = "creation,termination,expiration"
+
+# Response headers a browser client has to be allowed to read
+TUS_EXPOSED_HEADERS = [
+    "Location", "Tus-Resumable", "Tus-Version", "Tus-Max-Size", "Tus-Extension",
+    "Upload-Offset", "Upload-Length", "Upload-Expires", "Upload-Session-Id", "Upload-Job-Id"
+]
+
+# Uploads whose analysis is being queued, a retried PATCH must not queue it twice
+_finalizing = set()
+
+
+def tus_headers(**headers: str) -> Dict[str, str]:
+    """Headers of every tus response plus the given ones, underscores written as dashes"""
+    return {"Tus-Resumable": TUS_VERSION, **{name.replace("_", "-"): value for name, value in headers.items()}}
+
+
+def tus_error(status_code: int, detail: str, **headers: str) -> HTTPException:
+    return HTTPException(status_code=status_code, detail=detail, headers=tus_headers(**headers))
+
+
+def check_tus_version(tus_resumable: Optional[str]):
+    """Refuse clients speaking another version of the protocol"""
+    if tus_resumable != TUS_VERSION:
+        raise tus_error(412, f"Unsupported tus version {tus_resumable}", Tus_Version=TUS_VERSION)
+
+
+def parse_metadata(header: Optional[str]) -> Dict[str, str]:
+    """
+    Decode an Upload-Metadata header
+
+    Args:
+        header: Comma separated "key base64(value)" pairs, the value may be left out
+
+    Returns:
+        Decoded metadata
+
+    Raises:
+        HTTPException: 400 for a malformed header
+    """
+    metadata = {}
+    for pair in filter(None, (part.strip() for part in (header or "").split(","))):
+        key, _, value = pair.partition(" ")
+        try:
+            metadata[key] = base64.b64decode(value, validate=True).decode("utf-8")
+        except (binascii.Error, UnicodeDecodeError):
+            raise tus_error(400, f"Invalid Upload-Metadata value for '{key}'")
+    return metadata
+
+
+def upload_headers(upload: ResumableUpload) -> Dict[str, str]:
+    """Offset, expiry and, once queued, the analysis of an upload"""
+    headers = {
+        "Upload_Offset": str(upload.offset),
+        "Upload_Length": str(upload.length),
+        "Upload_Expires": formatdate(upload.expires_at, usegmt=True)
+    }
+    if upload.session_id:
+        headers.update(Upload_Session_Id=upload.session_id, Upload_Job_Id=upload.job_id)
+    return tus_headers(**headers)
+
+
+def get_upload(upload_id: str) -> ResumableUpload:
+    upload = upload_store.get(upload_id)
+    if upload is None:
+        raise tus_error(404, "Upload not found")
+    return upload
+
+
+def analysis_options(metadata: Dict[str, str]) -> dict:
+    """
+    Analysis options sent as upload metadata, with the defaults of /api/upload/video
+
+    Raises:
+        HTTPException: 400 for invalid options
+    """
+    try:
+        keyframe_interval = int(metadata.get("keyframe_interval") or 1)
+    except ValueError:
+        raise tus_error(400, "keyframe_interval must be a number")
+    optical_flow = metadata.get("optical_flow", "").lower() in ("1", "true", "yes", "on")
+    quality = metadata.get("quality") or None
+    return {
+        "exercise_type": metadata.get("exercise_type") or "squat",
+        "model_tier": validate_video_options(quality, keyframe_interval, optical_flow),
+        "keyframe_interval": keyframe_interval,
+        "optical_flow": optical_flow
+    }
+
+
+@router.options("")
+async def tus_options():
+    """Protocol version, extensions and size limit of the server"""
+    return Response(status_code=204, headers=tus_headers(
+        Tus_Version=TUS_VERSION,
+        Tus_Extension=TUS_EXTENSIONS,
+        Tus_Max_Size=str(settings.MAX_FILE_SIZE)
+    ))
+
+
+@router.post("")
+async def create_upload(
+    request: Request,
+    tus_resumable: Optional[str] = Header(None),
+    upload_length: Optional[int] = Header(None),
+    upload_metadata: Optional[str] = Header(None)
+):
+    """
+    Create a resumable video upload
+
+    Upload-Metadata carries the file name ("filename" or "name") and the
+    analysis options of /api/upload/video: exercise_type, quality,
+    keyframe_interval and optical_flow. Everything that would refuse the
+    upload later is checked here, before any bytes are sent.
+    """
+    check_tus_version(tus_resumable)
+    if upload_length is None or upload_length < 0:
+        raise tus_error(400, "Upload-Length header required")
+    if upload_length > settings.MAX_FILE_SIZE:
+        raise tus_error(
+            413, f"Upload larger than {settings.MAX_FILE_SIZE} bytes", Tus_Max_Size=str(settings.MAX_FILE_SIZE)
+        )
+
+    metadata = parse_metadata(upload_metadata)
+    try:
+        extension = StorageService.check_extension(
+            metadata.get("filename") or metadata.get("name"), settings.ALLOWED_VIDEO_EXTENSIONS
+        )
+    except UploadRejected as e:
+        raise tus_error(e.status_code, str(e))
+    analysis_options(metadata)
+    check_job_capacity()
+
+    upload = upload_store.create(upload_length, extension, metadata)
+    location = f"{str(request.url.replace(query='')).rstrip('/')}/{upload.id}"
+    return Response(status_code=201, headers=tus_headers(
+        Location=location, Upload_Offset="0", Upload_Expires=formatdate(upload.expires_at, usegmt=True)
+    ))
+
+
+@router.head("/{upload_id}")
+async def get_upload_offset(upload_id: str, tus_resumable: Optional[str] = Header(None)):
+    """How many bytes of an upload the server has, to resume from there"""
+    check_tus_version(tus_resumable)
+    upload = get_upload(upload_id)
+    return Response(status_code=200, headers={**upload_headers(upload), "Cache-Control": "no-store"})
+
+
+@router.patch("/{upload_id}")
+async def append_upload(
+    upload_id: str,
+    request: Request,
+    tus_resumable: Optional[str] = Header(None),
+    upload_offset: Optional[int] = Header(None),
+    content_type: Optional[str] = Header(None)
+):
+    """
+    Append bytes to an upload
+
+    The request body is written to disk as it arrives; when the
+    connection drops the bytes received so far are kept and HEAD
+    reports where to resume. The PATCH that completes the upload queues
+    its analysis and reports it in Upload-Session-Id and Upload-Job-Id.
+    If the analysis queue is full the complete upload is kept and the
+    PATCH answered 503, so the client's retry queues it.
+    """
+    check_tus_version(tus_resumable)
+    if content_type != "application/offset+octet-stream":
+        raise tus_error(415, "Content-Type must be application/offset+octet-stream")
+    if upload_offset is None:
+        raise tus_error(400, "Upload-Offset header required")
+
+    upload = get_upload(upload_id)
+    if upload_id in _finalizing:
+        raise tus_error(409, "Upload is being finalized")
+
+    try:
+        if upload.complete:
+            # A retry of the last PATCH, only the analysis may still have to be queued
+            if upload_offset != upload.offset:
+                raise UploadConflict(f"Upload is complete at offset {upload.offset}")
+        else:
+            upload = await upload_store.append(upload, upload_offset, request.stream())
+    except UploadConflict as e:
+        raise tus_error(409, str(e), Upload_Offset=str(upload.offset))
+    except ValueError as e:
+        raise tus_error(413, str(e), Upload_Offset=str(upload.offset))
+    except ClientDisconnect:
+        logger.info(f"Upload {upload_id} interrupted at {upload.offset}/{upload.length} bytes")
+        return Response(status_code=204, headers=upload_headers(upload))
+
+    if upload.complete and upload.session_id is None:
+        await finalize_upload(upload)
+    return Response(status_code=204, headers=upload_headers(upload))
+
+
+async def finalize_upload(upload: ResumableUpload):
+    """
+    Queue the analysis of a complete upload
+
+    Raises:
+        HTTPException: 400 if it is not a readable video (the upload is
+            deleted), 503 if the analysis queue is full (the upload is
+            kept for the client's retry)
+    """
+    _finalizing.add(upload.id)
+    try:
+        options = analysis_options(upload.metadata)
+        try:
+            queued = await queue_video_analysis(upload_store.data_path(upload), **options)
+        except HTTPException as e:
+            if e.status_code != 503:
+                upload_store.delete(upload)
+            raise tus_error(e.status_code, e.detail, **{
+                name.replace("-", "_"): value for name, value in (e.headers or {}).items()
+            })
+        upload_store.mark_queued(upload, queued["session_id"], queued["job_id"])
+        logger.info(f"✅ Upload {upload.id} complete, queued job {upload.job_id}")
+    finally:
+        _finalizing.discard(upload.id)
+
+
+@router.delete("/{upload_id}")
+async def delete_upload(upload_id: str, tus_resumable: Optional[str] = Header(None)):
+    """Abandon an upload and free its disk space"""
+    check_tus_version(tus_resumable)
+    upload = get_upload(upload_id)
+    if upload_id in _finalizing:
+        raise tus_error(409, "Upload is being finalized")
+    try:
+        upload_store.delete(upload)
+    except UploadConflict as e:
+        raise tus_error(409, str(e))
+    return Response(status_code=204, headers=tus_headers())
+
+
+async def expire_uploads():
+    """Remove expired uploads every RESUMABLE_UPLOAD_EXPIRY_INTERVAL seconds, run as a task of the app"""
+    while True:
+        try:
+            # Uploads being queued are about to leave the store, never expire them under the request
+            await asyncio.to_thread(upload_store.expire, set(_finalizing))
+        except Exception as e:
+            logger.error(f"Failed to expire uploads: {e}")
+        await asyncio.sleep(settings.RESUMABLE_UPLOAD_EXPIRY_INTERVAL)
@@ -1,13 +1,20 @@
 import os
+import asyncio
+import time
 import cv2
-import numpy as np
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, BackgroundTasks
-from datetime import datetime
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 import base64
+from pathlib import Path
+from typing import List, Optional
 
+from src.config import settings
+from src.ml.backends import model_name
+from src.ml.model_tiers import resolve_tier, tier_name
+from src.services.job_engine import JobQueueFull, job_engine
 from src.services.pose_service import PoseService
-from src.services.storage_service import StorageService
-from src.services.session_service import session_service, SessionStatus
+from src.services.storage_service import StorageService, UploadRejected
+from src.services.video_analysis import VideoAnalysisError, probe_video
+from src.services.session_service import session_service
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -16,132 +23,12 @@ router = APIRouter()
 pose_service = PoseService()
 storage_service = StorageService()
 
-def process_video_analysis(video_path: str, session_id: str, exercise_type: str):
-    """Background task to process video"""
-    logger.info(f"Starting video analysis: {video_path}")
-    
-    cap = cv2.VideoCapture(video_path)
-    if not cap.isOpened():
-        logger.error(f"Cannot open video: {video_path}")
-        session_service.update_session_status(session_id, "failed")
-        return
-
-    fps = cap.get(cv2.CAP_PROP_FPS) or 30
-    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    duration = frame_count / fps if fps > 0 else 0
-    
-    session_service.update_session_status(session_id, "processing", 0)
-
-    frame_number = 0
-    all_results = []
-    all_scores = []
-    all_feedback = []
-    
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        try:
-            result = pose_service.analyze_frame(frame, exercise_type)
-            if result:
-                frame_score = result.get('score', {})
-                if isinstance(frame_score, dict):
-                    overall_score = frame_score.get('overall', 0)
-                else:
-                    overall_score = frame_score if isinstance(frame_score, (int, float)) else 0
-                
-                all_scores.append(overall_score)
-                frame_feedback = result.get('feedback', [])
-                if isinstance(frame_feedback, list):
-                    all_feedback.extend(frame_feedback)
-                
-                all_results.append({
-                    "frame": frame_number,
-                    "timestamp": frame_number / fps,
-                    "score": frame_score,
-                    "feedback": frame_feedback,
-                    "landmarks": result.get('landmarks', {})  # Include landmarks for AR overlay
-                })
-        except Exception as e:
-            logger.error(f"Error on frame {frame_number}: {e}")
-
-        frame_number += 1
-        
-        if frame_number % 10 == 0:
-            progress = int((frame_number / frame_count) * 100)
-            session_service.update_session_status(session_id, "processing", progress)
-
-    cap.release()
-    
-    # Calculate overall statistics
-    avg_score = sum(all_scores) / len(all_scores) if all_scores else 0
-    
-    # Aggregate feedback
-    feedback_summary = []
-    if all_feedback:
-        # Group feedback by type
-        success_count = sum(1 for f in all_feedback if isinstance(f, dict) and f.get('type') == 'success')
-        warning_count = sum(1 for f in all_feedback if isinstance(f, dict) and f.get('type') == 'warning')
-        error_count = sum(1 for f in all_feedback if isinstance(f, dict) and f.get('type') == 'error')
-        
-        total_feedback_items = success_count + warning_count + error_count
-        if total_feedback_items > 0:
-            success_percentage = (success_count / total_feedback_items) * 100
-            warning_percentage = (warning_count / total_feedback_items) * 100
-            error_percentage = (error_count / total_feedback_items) * 100
-            
-            if success_percentage >= 60:
-                feedback_summary.append({
-                    'type': 'success',
-                    'message': 'Great form overall! Most of your movements show good technique.'
-                })
-            elif success_percentage >= 40:
-                feedback_summary.append({
-                    'type': 'success',
-                    'message': 'Good effort! You maintained proper form for a significant portion of the exercise.'
-                })
-            
-            if warning_percentage >= 30:
-                feedback_summary.append({
-                    'type': 'warning',
-                    'message': 'Some minor form adjustments could improve your technique. Focus on maintaining consistency.'
-                })
-            elif warning_percentage >= 15:
-                feedback_summary.append({
-                    'type': 'warning',
-                    'message': 'A few areas need attention. Small adjustments will help improve your overall form.'
-                })
-            
-            if error_percentage >= 30:
-                feedback_summary.append({
-                    'type': 'error',
-                    'message': 'Several form corrections are needed. Review the specific feedback below and focus on these areas.'
-                })
-            elif error_percentage >= 15:
-                feedback_summary.append({
-                    'type': 'error',
-                    'message': 'Some form issues detected. Pay attention to the recommendations below.'
-                })
-    
-    # Calculate score breakdown from first frame if available
-    score_breakdown = {}
-    if all_results and all_results[0].get('score'):
-        first_score = all_results[0]['score']
-        if isinstance(first_score, dict) and 'breakdown' in first_score:
-            score_breakdown = first_score['breakdown']
-    
-    # Update session with aggregated results
-    session = session_service.get_session(session_id)
-    if session:
-        session.score = avg_score
-        session.feedback = feedback_summary
-        session.results = all_results
-        session.status = SessionStatus.COMPLETED
-        session.updated_at = datetime.now()
-        session_service._save_session(session)
-    
-    logger.info(f"✅ Video analysis complete: {len(all_results)} frames, avg score: {avg_score:.1f}")
+def encode_annotated_image(image, landmarks) -> str:
+    """Draw the skeleton on a copy of the image and return it as a JPEG data URL"""
+    annotated_image = pose_service.detector.draw_landmarks(image.copy(), landmarks)
+    _, buffer = cv2.imencode('.jpg', annotated_image)
+    img_base64 = base64.b64encode(buffer).decode('utf-8')
+    return f'data:image/jpeg;base64,{img_base64}'
 
 @router.get("/sessions/{session_id}")
 async def get_session(session_id: str):
@@ -153,18 +40,33 @@ async def get_session(session_id: str):
     # Format response for frontend
     if session.type == "video":
         # Calculate video stats
-        fps = 30  # Default, could be extracted from video
-        total_frames = len(session.results) if session.results else 0
+        video_info = session.video_info or {}
+        fps = video_info.get("fps") or 30  # Sessions saved before uploads were probed
+        # Results may be a sample of the frames, the statistics count them all
+        if session.stats:
+            total_frames = session.stats.get("frames", 0)
+        else:
+            total_frames = len(session.results) if session.results else 0
         duration = total_frames / fps if fps > 0 else 0
         
         # Aggregate score and breakdown from results
+        overall = session.score
+        if overall is None and session.stats:
+            # Still running: mean of the frames scored so far
+            overall = session.stats.get("score", {}).get("mean")
         score_data = {
-            "overall": round(session.score, 1) if session.score is not None else 0,
+            "overall": round(overall, 1) if overall is not None else 0,
             "breakdown": {}
         }
         
-        # Extract breakdown from frame results
-        if session.results:
+        if session.stats:
+            # Averages accumulated while the video was scored
+            score_data["breakdown"] = {
+                key: stat["mean"] for key, stat in session.stats.get("breakdown", {}).items() if stat.get("count")
+            }
+        
+        # Sessions saved before statistics were kept: extract breakdown from frame results
+        elif session.results:
             # Get breakdown from first frame that has it
             for result in session.results:
                 frame_score = result.get('score', {})
@@ -206,7 +108,15 @@ async def get_session(session_id: str):
             "feedback": session.feedback if isinstance(session.feedback, list) else [],
             "total_frames": total_frames,
             "duration": round(duration, 2),  # Round duration to 2 decimal places
-            "progress": session.progress
+            "progress": session.progress,
+            "model_tier": session.model_tier,
+            "video_info": session.video_info,
+            "frame_stats": session.frame_stats,
+            "kinematics": session.kinematics,
+            "reps": session.reps,
+            "stats": session.stats,
+            "job": session.job,
+            "error": session.error
         }
     
     return session.dict()
@@ -214,43 +124,43 @@ async def get_session(session_id: str):
 @router.post("/analyze/image")
 async def analyze_image(
     file: UploadFile = File(...),
-    exercise_type: str = Form("squat")
+    exercise_type: str = Form("squat"),
+    quality: Optional[str] = Form(None)
 ):
     """Analyze an image"""
     try:
         logger.info(f"Analyzing image: {file.filename}")
         
-        contents = await file.read()
-        nparr = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        try:
+            resolve_tier(quality)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        try:
+            contents = await storage_service.read_upload(file, settings.ALLOWED_IMAGE_EXTENSIONS)
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
         
-        if image is None:
+        try:
+            result, image = await pose_service.analyze_image_bytes_async(
+                contents, exercise_type, quality, keep_image=True
+            )
+        except ValueError:
             raise HTTPException(status_code=400, detail="Invalid image")
         
-        result = pose_service.analyze_image(image, exercise_type)
         if not result:
             raise HTTPException(status_code=400, detail="No pose detected")
         
-        # Draw landmarks using MediaPipe
-        annotated_image = image.copy()
-        # Re-process to get MediaPipe results for drawing
-        mp_results = pose_service.detector.process_image(image)
-        if mp_results and mp_results.pose_landmarks:
-            pose_service.detector.mp_drawing.draw_landmarks(
-                annotated_image,
-                mp_results.pose_landmarks,
-                pose_service.detector.mp_pose.POSE_CONNECTIONS,
-                landmark_drawing_spec=pose_service.detector.mp_drawing_styles.get_default_pose_landmarks_style()
-            )
-        
-        _, buffer = cv2.imencode('.jpg', annotated_image)
-        img_base64 = base64.b64encode(buffer).decode('utf-8')
+        # Draw the skeleton from the landmarks we already have
+        annotated_image = await asyncio.to_thread(encode_annotated_image, image, result['landmarks'])
         
         return {
             'status': 'success',
             'score': result.get('score'),
             'feedback': result.get('feedback'),
-            'annotated_image': f'data:image/jpeg;base64,{img_base64}'
+            'model_tier': result.get('model_tier'),
+            'cached': result.get('cached', False),
+            'annotated_image': annotated_image
         }
         
     except HTTPException:
@@ -259,41 +169,254 @@ async def analyze_image(
         logger.error(f"Image analysis error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/upload/video")
-async def upload_video(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    exercise_type: str = Form("squat")
-):
-    """Upload and analyze video"""
+async def analyze_batch_item(
+    index: int,
+    file: UploadFile,
+    exercise_type: str,
+    quality: Optional[str],
+    annotate: bool
+) -> dict:
+    """Analyze one image of a batch, reporting failures in the result instead of raising"""
+    started = time.perf_counter()
+    item = {'index': index, 'filename': file.filename}
     try:
-        logger.info(f"Uploading video: {file.filename}")
+        try:
+            contents = await storage_service.read_upload(file, settings.ALLOWED_IMAGE_EXTENSIONS)
+        except UploadRejected as e:
+            item.update(status='error', error=str(e))
+            return item
+        read = time.perf_counter()
+        item['timings'] = {'read_ms': round((read - started) * 1000, 1)}
+        
+        try:
+            result, image = await pose_service.analyze_image_bytes_async(
+                contents, exercise_type, quality, keep_image=annotate
+            )
+        except ValueError:
+            item.update(status='error', error='Invalid image')
+            return item
+        item['timings']['analysis_ms'] = round((time.perf_counter() - read) * 1000, 1)
+        
+        if not result:
+            item.update(status='error', error='No pose detected')
+            return item
         
-        contents = await file.read()
-        video_path = storage_service.save_file(
-            contents, 
-            file.filename or "upload.mp4", 
-            'videos'
+        item.update(
+            status='success',
+            score=result.get('score'),
+            feedback=result.get('feedback'),
+            landmarks=result.get('landmarks'),
+            cached=result.get('cached', False)
         )
+        if annotate:
+            item['annotated_image'] = await asyncio.to_thread(encode_annotated_image, image, result['landmarks'])
         
-        session = session_service.create_session(
-            type="video",
-            exercise_type=exercise_type,
-            file_path=video_path
+    except Exception as e:
+        logger.error(f"Batch image {index} ({file.filename}) failed: {e}", exc_info=True)
+        item.update(status='error', error=str(e))
+    finally:
+        item.setdefault('timings', {})['total_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    
+    return item
+
+@router.post("/analyze/images")
+async def analyze_images(
+    files: List[UploadFile] = File(...),
+    exercise_type: str = Form("squat"),
+    quality: Optional[str] = Form(None),
+    annotate: bool = Form(False)
+):
+    """
+    Analyze a set of images in one request
+
+    Images are decoded concurrently and all of them are in flight on the
+    detector pool at once. Results come back in upload order; an image
+    that fails gets an error entry without failing the rest of the batch.
+    """
+    if len(files) > settings.MAX_BATCH_IMAGES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many images, at most {settings.MAX_BATCH_IMAGES} per request"
         )
+    
+    try:
+        model_tier = model_name(resolve_tier(quality))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    logger.info(f"Analyzing batch of {len(files)} images")
+    started = time.perf_counter()
+    
+    results = await asyncio.gather(*(
+        analyze_batch_item(index, file, exercise_type, quality, annotate)
+        for index, file in enumerate(files)
+    ))
+    
+    succeeded = sum(1 for item in results if item['status'] == 'success')
+    return {
+        'status': 'success',
+        'model_tier': model_tier,
+        'count': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'total_ms': round((time.perf_counter() - started) * 1000, 1),
+        'results': results
+    }
+
+def validate_video_options(quality: Optional[str], keyframe_interval: int, optical_flow: bool) -> str:
+    """
+    Check the analysis options of a video upload
+
+    Returns:
+        Name of the model tier to analyze with
+
+    Raises:
+        HTTPException: 400 for invalid options
+    """
+    try:
+        model_tier = tier_name(resolve_tier(quality))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if not 1 <= keyframe_interval <= settings.MAX_KEYFRAME_INTERVAL:
+        raise HTTPException(
+            status_code=400,
+            detail=f"keyframe_interval must be between 1 and {settings.MAX_KEYFRAME_INTERVAL}"
+        )
+    
+    if optical_flow and keyframe_interval > 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Use either keyframe_interval or optical_flow, not both"
+        )
+    return model_tier
+
+def check_job_capacity():
+    """Raise 503 when a video analysis could not be queued right now"""
+    try:
+        job_engine.check_capacity()
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+
+async def queue_video_analysis(
+    temp_path: Path,
+    exercise_type: str,
+    model_tier: str,
+    keyframe_interval: int = 1,
+    optical_flow: bool = False
+) -> dict:
+    """
+    Probe a received video, move it into uploads/videos and queue its analysis
+
+    The received file is left in place when this raises, for the caller
+    to discard or keep: when the queue fills up while the file is being
+    probed, the file is moved back and the session deleted again.
+
+    Returns:
+        Response with the new session and job ids
 
-        background_tasks.add_task(
-            process_video_analysis,
-            video_path,
+    Raises:
+        HTTPException: 400 if OpenCV cannot decode the video, 503 if the
+            analysis queue is full
+    """
+    check_job_capacity()
+    
+    try:
+        # Refuse files the workers could not read before a job is created for them
+        video_info = await asyncio.to_thread(probe_video, str(temp_path))
+    except VideoAnalysisError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid video: {e}")
+    video_path = storage_service.store_upload(temp_path, 'videos')
+    
+    session = session_service.create_session(
+        type="video",
+        exercise_type=exercise_type,
+        file_path=video_path,
+        model_tier=model_tier
+    )
+    # Saved with the session when the job is recorded on it
+    session_service.update_session(str(session.id), save=False, video_info=video_info)
+
+    try:
+        job = job_engine.submit(
             str(session.id),
-            exercise_type
+            video_path=video_path,
+            exercise_type=exercise_type,
+            quality=model_tier,
+            keyframe_interval=keyframe_interval,
+            optical_flow=optical_flow
         )
+    except JobQueueFull as e:
+        # Filled up while the file was being probed, a retry starts over from the received file
+        session_service.delete_session(str(session.id))
+        storage_service.unstore_upload(video_path, temp_path)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
 
-        return {
-            'message': 'Video uploaded, analysis started',
-            'session_id': str(session.id)
-        }
+    return {
+        'message': 'Video uploaded, analysis queued',
+        'session_id': str(session.id),
+        'job_id': job.id,
+        'model_tier': model_tier
+    }
+
+@router.post("/upload/video")
+async def upload_video(
+    file: UploadFile = File(...),
+    exercise_type: str = Form("squat"),
+    quality: Optional[str] = Form(None),
+    keyframe_interval: int = Form(1),
+    optical_flow: bool = Form(False)
+):
+    """
+    Upload and analyze video
+
+    keyframe_interval > 1 runs detection every keyframe_interval frames and
+    interpolates the rest, which suits slow exercises like squats.
+    optical_flow tracks landmarks between detections instead.
+
+    The upload is streamed to disk and must be an allowed video type of
+    at most MAX_FILE_SIZE bytes (415 / 413 otherwise) that OpenCV can
+    decode (400). The analysis is then queued on the job engine and the
+    request returns right away; 503 when the analysis queue is full.
+    Large videos on unreliable connections should use the resumable
+    upload API instead (see tus_routes).
+    """
+    try:
+        logger.info(f"Uploading video: {file.filename}")
+        
+        model_tier = validate_video_options(quality, keyframe_interval, optical_flow)
         
+        # Refuse before reading the upload when it could not be queued anyway
+        check_job_capacity()
+        
+        try:
+            temp_path = await storage_service.receive_upload(file, settings.ALLOWED_VIDEO_EXTENSIONS)
+        except UploadRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        
+        try:
+            return await queue_video_analysis(
+                temp_path, exercise_type, model_tier, keyframe_interval, optical_flow
+            )
+        finally:
+            # Only still there if it was refused
+            storage_service.discard_upload(temp_path)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Video upload error: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/jobs/stats")
+async def get_job_stats():
+    """Video analysis queue depth and worker utilization"""
+    return job_engine.stats()
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Status, timing and error of a video analysis job"""
+    job = job_engine.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
\ No newline at end of file
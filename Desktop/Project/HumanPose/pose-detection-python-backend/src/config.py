@@ -33,19 +33,89 @@ class Settings(BaseSettings):
     POSE_MODEL_COMPLEXITY: int = 1
     MIN_DETECTION_CONFIDENCE: float = 0.5
     MIN_TRACKING_CONFIDENCE: float = 0.5
+    DETECTOR_POOL_SIZE: int = 0  # Worker processes for image detection, 0 = one per CPU core
+    VIDEO_JOB_WORKERS: int = 0  # Video analysis jobs running at once, 0 = half the CPU cores
+    VIDEO_JOB_QUEUE_SIZE: int = 8  # Jobs allowed to wait for a worker before uploads are refused
+    VIDEO_DECODE_QUEUE_SIZE: int = 8  # Frames decoded ahead of pose inference, bounds memory per job
+    VIDEO_PARALLEL_SEGMENTS: bool = True  # Split long videos into segments analyzed by several workers
+    VIDEO_SEGMENT_MIN_SECONDS: float = 60.0  # Shortest segment worth a worker of its own
+    VIDEO_SEGMENT_OVERLAP: float = 1.0  # Seconds analyzed before each segment to warm up tracking
+    VIDEO_SCORING_CHUNK_FRAMES: int = 256  # Frames smoothed and scored per pass, bounds the landmarks held
+    VIDEO_JOB_SAVE_INTERVAL: float = 2.0  # Seconds between session writes for job progress
+    VIDEO_RESULTS_MAX_FRAMES: int = 3600  # Per-frame results stored per video session, evenly spaced, 0 = all
+    MAX_TRACKERS: int = 16  # Tracking graphs leased to live/video sessions
+    TRACKER_IDLE_POOL_SIZE: int = 4  # Released graphs kept warm for reuse
+    
+    # Inference backend for image detection and offline video
+    INFERENCE_BACKEND: str = "mediapipe"  # mediapipe, onnxruntime or opencv
+    POSE_MODEL_PATH: str = ""  # Exported landmark model for onnxruntime/opencv
+    POSE_MODEL_INPUT_SIZE: int = 256
+    POSE_DETECTOR_MODEL_PATH: str = ""  # Exported pose detector run before the landmark model
+    POSE_DETECTOR_INPUT_SIZE: int = 224
+    ONNX_NUM_THREADS: int = 0  # 0 = let ONNX Runtime decide
+    INFERENCE_BATCH_SIZE: int = 8  # Video frames per call on backends that batch
+    
+    # Region-of-interest cropping for video frames
+    ROI_ENABLED: bool = True
+    ROI_PADDING: float = 0.25  # Margin around the previous pose, fraction of its size
+    ROI_INPUT_SIZE: int = 256  # Longest side of the crop handed to the model
+    ROI_MIN_VISIBILITY: float = 0.5  # Below this the crop is distrusted and the next frame uses the full frame
+    
+    # Keyframe detection for uploaded videos
+    MAX_KEYFRAME_INTERVAL: int = 30
+    KEYFRAME_MOTION_THRESHOLD: float = 0.04  # Thumbnail change (0-1) that forces a keyframe, 0 = off
+    KINEMATICS_TIMELINE_POINTS: int = 300  # Angle timeline samples stored per video session
+    
+    # Optical-flow landmark propagation between detector runs
+    OPTICAL_FLOW_MAX_ERROR: float = 12.0  # Mean Lucas-Kanade error above which the detector runs again
+    OPTICAL_FLOW_MIN_TRACKED_RATIO: float = 0.8  # Share of visible landmarks the flow must keep
+    OPTICAL_FLOW_MIN_VISIBILITY: float = 0.5
+    OPTICAL_FLOW_MAX_TRACKED_FRAMES: int = 10  # Force a detection at least this often
+    
+    # Temporal landmark smoothing
+    LANDMARK_SMOOTHING: str = "one_euro"  # Live sessions: one_euro, kalman or none
+    ONE_EURO_MIN_CUTOFF: float = 1.0  # Hz when still, lower = smoother
+    ONE_EURO_BETA: float = 20.0  # Cutoff increase with speed, higher = less lag
+    ONE_EURO_D_CUTOFF: float = 1.0
+    KALMAN_PROCESS_NOISE: float = 10.0
+    KALMAN_MEASUREMENT_NOISE: float = 1e-4
+    SMOOTHING_MAX_GAP: float = 1.0  # Seconds without a pose after which filter state resets
+    OFFLINE_SMOOTHING_ENABLED: bool = True  # Zero-phase smoothing of uploaded videos
+    OFFLINE_SMOOTHING_CUTOFF: float = 3.0  # Hz
+    
+    # Live feedback
+    FEEDBACK_COOLDOWN: float = 5.0  # Seconds before a message that is still active is sent again
+    FEEDBACK_CLEAR_AFTER: float = 0.5  # Seconds a message must be gone before the client is told to clear it
     
     # File Upload Configuration
     MAX_FILE_SIZE: int = 100 * 1024 * 1024  # 100MB
     ALLOWED_IMAGE_EXTENSIONS: set = {".jpg", ".jpeg", ".png", ".webp"}
     ALLOWED_VIDEO_EXTENSIONS: set = {".mp4", ".webm", ".mov", ".avi"}
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024  # Bytes read from an upload at a time
+    UPLOAD_MULTIPART_OVERHEAD: int = 64 * 1024  # Request bytes allowed over MAX_FILE_SIZE for form fields
+    RESUMABLE_UPLOAD_EXPIRY_HOURS: float = 24.0  # Resumable uploads are removed this long after creation
+    RESUMABLE_UPLOAD_EXPIRY_INTERVAL: int = 3600  # Seconds between sweeps for expired uploads
+    MAX_BATCH_IMAGES: int = 32  # Images accepted by one /api/analyze/images request
+    MAX_BATCH_BYTES: int = 256 * 1024 * 1024  # Request body of one /api/analyze/images request
     
     # Storage Configuration
     UPLOAD_DIR: str = "uploads"
     RESULTS_DIR: str = "results"
     
+    # Landmark cache for repeated image uploads
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_SIZE: int = 256  # Entries kept in memory
+    RESULT_CACHE_TTL: int = 3600  # Seconds
+    RESULT_CACHE_DISK: bool = False  # Also keep entries on disk under RESULT_CACHE_DIR
+    RESULT_CACHE_DIR: str = "cache/landmarks"  # Not served by the app, unlike UPLOAD_DIR/RESULTS_DIR
+    RESULT_CACHE_DISK_SIZE: int = 10000  # Entries kept on disk
+    RESULT_CACHE_SWEEP_INTERVAL: int = 300  # Minimum seconds between sweeps of the disk tier
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "logs/app.log"
+    LOG_HOT_PATH: bool = True  # Per-frame debug/info logs, disable in production
+    LOG_HOT_PATH_RATE: float = 2.0  # Per-frame records per second and logger
     
     class Config:
         env_file = ".env"
@@ -1,17 +1,35 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any
+from src.feedback.catalog import Emission, render_feedback
+from src.ml.features import point_angle
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 
 class FeedbackGenerator(ABC):
-    """Base class for generating exercise feedback"""
-    
-    def __init__(self):
-        self.feedback_messages: List[Dict[str, str]] = []
+    """
+    Base class for generating exercise feedback
+
+    Generators are stateless and shared by every session: they pick
+    interned messages from the feedback catalog instead of building
+    strings, so the same instance can serve concurrent frames.
+    """
     
     @abstractmethod
+    def select_feedback(self, landmarks: Dict[str, Any], score: Dict[str, Any]) -> List[Emission]:
+        """
+        Select the catalog messages that apply to a score
+        
+        Args:
+            landmarks: Detected pose landmarks
+            score: Score calculation result
+            
+        Returns:
+            (message, params) pairs, params None for messages without placeholders
+        """
+        pass
+    
     def generate_feedback(self, landmarks: Dict[str, Any], score: Dict[str, Any]) -> List[Dict[str, str]]:
         """
         Generate feedback based on landmarks and score
@@ -23,22 +41,7 @@ class FeedbackGenerator(ABC):
         Returns:
             List of feedback messages with type and message
         """
-        pass
-    
-    def add_feedback(self, feedback_type: str, message: str):
-        """Add a feedback message"""
-        self.feedback_messages.append({
-            'type': feedback_type,  # 'success', 'warning', 'error'
-            'message': message
-        })
-    
-    def get_feedback(self) -> List[Dict[str, str]]:
-        """Get all feedback messages"""
-        return self.feedback_messages
-    
-    def clear_feedback(self):
-        """Clear all feedback messages"""
-        self.feedback_messages = []
+        return render_feedback(self.select_feedback(landmarks, score))
     
     def calculate_angle(self, point1: Dict, point2: Dict, point3: Dict) -> float:
         """
@@ -52,34 +55,11 @@ class FeedbackGenerator(ABC):
         Returns:
             Angle in degrees
         """
-        import math
-        
-        # Vector from point2 to point1
-        v1 = {
-            'x': point1['x'] - point2['x'],
-            'y': point1['y'] - point2['y']
-        }
-        
-        # Vector from point2 to point3
-        v2 = {
-            'x': point3['x'] - point2['x'],
-            'y': point3['y'] - point2['y']
-        }
-        
-        # Calculate dot product and magnitudes
-        dot_product = v1['x'] * v2['x'] + v1['y'] * v2['y']
-        magnitude1 = math.sqrt(v1['x']**2 + v1['y']**2)
-        magnitude2 = math.sqrt(v2['x']**2 + v2['y']**2)
-        
-        if magnitude1 == 0 or magnitude2 == 0:
-            return 0.0
-        
-        # Calculate angle
-        cos_angle = dot_product / (magnitude1 * magnitude2)
-        cos_angle = max(-1.0, min(1.0, cos_angle))  # Clamp to [-1, 1]
-        
-        angle = math.acos(cos_angle)
-        return math.degrees(angle)
+        return point_angle(
+            (point1['x'], point1['y']),
+            (point2['x'], point2['y']),
+            (point3['x'], point3['y'])
+        )
     
     def get_distance(self, point1: Dict, point2: Dict) -> float:
         """
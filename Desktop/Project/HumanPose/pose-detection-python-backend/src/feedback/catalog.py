@@ -0,0 +1,106 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class FeedbackMessage:
+    """
+    An interned feedback message template
+
+    Attributes:
+        id: Small integer sent to clients instead of the text
+        code: Stable readable name, e.g. "squat.knee_alignment"
+        type: "success", "warning" or "error"
+        text: Message text, may contain {placeholders}
+        priority: 1 = most important
+    """
+    id: int
+    code: str
+    type: str
+    text: str
+    priority: int = 2
+    _static: Optional[Dict[str, Any]] = field(default=None, compare=False, repr=False)
+
+    def render(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Full feedback dict as returned by the REST API"""
+        if not params:
+            # Texts without parameters are rendered once; copy so callers can't alter the template
+            return dict(self._static)
+        return {
+            "type": self.type,
+            "message": self.text.format(**params),
+            "priority": self.priority
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"id": self.id, "code": self.code, "type": self.type, "text": self.text, "priority": self.priority}
+
+
+# A message selected for a frame, with its template parameters (None if it has none)
+Emission = Tuple[FeedbackMessage, Optional[Dict[str, Any]]]
+
+
+class MessageCatalog:
+    """
+    Registry of every feedback message template.
+
+    Feedback modules add their templates at import, so ids are assigned
+    once per process and clients can fetch the id -> text table up front.
+    """
+
+    def __init__(self):
+        self._messages: List[FeedbackMessage] = []
+        self._by_code: Dict[str, FeedbackMessage] = {}
+
+    def add(self, code: str, type: str, text: str, priority: int = 2) -> FeedbackMessage:
+        """
+        Intern a message template
+
+        Args:
+            code: Unique readable name of the message
+            type: "success", "warning" or "error"
+            text: Message text, may contain {placeholders}
+            priority: 1 = most important
+
+        Returns:
+            The interned message (the existing one if the code is already known)
+        """
+        message = self._by_code.get(code)
+        if message is not None:
+            if (message.type, message.text, message.priority) != (type, text, priority):
+                raise ValueError(f"Feedback message '{code}' is already defined differently")
+            return message
+
+        message = FeedbackMessage(
+            id=len(self._messages),
+            code=code,
+            type=type,
+            text=text,
+            priority=priority,
+            _static={"type": type, "message": text, "priority": priority}
+        )
+        self._messages.append(message)
+        self._by_code[code] = message
+        return message
+
+    def get(self, message_id: int) -> FeedbackMessage:
+        return self._messages[message_id]
+
+    def by_code(self, code: str) -> FeedbackMessage:
+        return self._by_code[code]
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """id -> template table for clients"""
+        return [message.to_dict() for message in self._messages]
+
+
+def render_feedback(emissions: List[Emission]) -> List[Dict[str, Any]]:
+    """Render selected messages to the feedback dicts returned by the REST API"""
+    return [message.render(params) for message, params in emissions]
+
+
+# Global instance
+feedback_catalog = MessageCatalog()
@@ -0,0 +1,83 @@
+from typing import Any, Dict, Hashable, List, Optional, Union
+
+from src.config import settings
+from src.feedback.catalog import Emission
+
+# What the client receives for one message: the bare id, or the id with its template parameters
+WireMessage = Union[int, Dict[str, Any]]
+
+
+class FeedbackEngine:
+    """
+    Per-session feedback deduplication for live coaching.
+
+    Scorers select the same messages on most consecutive frames. Instead
+    of resending them every frame, the engine only reports a message when
+    it first appears, again once the cooldown has passed while it is still
+    active, and clears it once it has been gone for clear_after seconds,
+    so a message flickering on and off between frames is neither
+    repeated nor cleared.
+
+    Messages are reported by catalog id, the client resolves the text
+    from the catalog sent when the session starts.
+    """
+
+    def __init__(self, cooldown: Optional[float] = None, clear_after: Optional[float] = None):
+        """
+        Args:
+            cooldown: Seconds before an active message is reported again
+            clear_after: Seconds a message must be gone before it is cleared
+        """
+        self.cooldown = settings.FEEDBACK_COOLDOWN if cooldown is None else cooldown
+        self.clear_after = settings.FEEDBACK_CLEAR_AFTER if clear_after is None else clear_after
+        self._sent: Dict[Hashable, float] = {}
+        self._seen: Dict[Hashable, float] = {}
+        self._wire: Dict[Hashable, WireMessage] = {}
+
+    def update(self, messages: List[Emission], timestamp: float) -> Dict[str, List[WireMessage]]:
+        """
+        Feed the messages selected for one frame
+
+        Args:
+            messages: (message, params) pairs from the scorer
+            timestamp: Frame time in seconds
+
+        Returns:
+            {"show": messages to display, "clear": messages to remove},
+            both usually empty
+        """
+        show = []
+        current = set()
+        for message, params in messages:
+            key = message.id if not params else (message.id, tuple(sorted(params.items())))
+            current.add(key)
+            self._seen[key] = timestamp
+            sent = self._sent.get(key)
+            # A timestamp going backwards means the client restarted its clock
+            if sent is None or timestamp - sent >= self.cooldown or timestamp < sent:
+                self._sent[key] = timestamp
+                wire = self._wire.get(key)
+                if wire is None:
+                    wire = self._wire[key] = message.id if not params else {"id": message.id, "params": params}
+                show.append(wire)
+
+        clear = []
+        if len(self._seen) > len(current):
+            for key, seen in list(self._seen.items()):
+                if key not in current and timestamp - seen >= self.clear_after:
+                    clear.append(self._wire.pop(key))
+                    del self._seen[key]
+                    del self._sent[key]
+
+        return {"show": show, "clear": clear}
+
+    @property
+    def active(self) -> List[WireMessage]:
+        """Messages the client is currently displaying"""
+        return list(self._wire.values())
+
+    def reset(self):
+        """Forget all messages, e.g. when the client reconnects"""
+        self._sent.clear()
+        self._seen.clear()
+        self._wire.clear()
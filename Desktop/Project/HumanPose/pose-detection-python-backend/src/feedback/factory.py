@@ -18,6 +18,8 @@ class FeedbackFactory:
         'plank': GeneralFeedback,  # Use general for now
         'deadlift': GeneralFeedback,  # Use general for now
     }
+    # Generators are stateless, so one shared instance per class serves every frame
+    _instances: Dict[Type[FeedbackGenerator], FeedbackGenerator] = {}
     
     @classmethod
     def get_feedback_generator(cls, exercise_type: str) -> FeedbackGenerator:
@@ -28,13 +30,14 @@ class FeedbackFactory:
             exercise_type: Type of exercise
             
         Returns:
-            Instance of FeedbackGenerator
+            Shared instance of FeedbackGenerator
         """
-        exercise_type = exercise_type.lower()
-        generator_class = cls._generators.get(exercise_type, cls._generators['general'])
-        
-        logger.info(f"Creating feedback generator for: {exercise_type}")
-        return generator_class()
+        generator_class = cls._generators.get(exercise_type.lower(), cls._generators['general'])
+        generator = cls._instances.get(generator_class)
+        if generator is None:
+            generator = cls._instances[generator_class] = generator_class()
+            logger.debug(f"Created feedback generator {generator_class.__name__}")
+        return generator
     
     @classmethod
     def register_generator(cls, exercise_type: str, generator_class: Type[FeedbackGenerator]):
@@ -1,51 +1,76 @@
 from typing import Dict, List, Any
 from src.feedback.base import FeedbackGenerator
+from src.feedback.catalog import Emission, feedback_catalog
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+add = feedback_catalog.add
+
+EXCELLENT = add('general.excellent', 'success', '🎉 Excellent form! Keep up the great work!', 1)
+GREAT = add('general.great', 'success', '👍 Great job! Your form is very good.', 1)
+GOOD_EFFORT = add('general.good_effort', 'warning', '⚠️ Good effort! Some areas need improvement.', 2)
+FAIR = add('general.fair', 'warning', '⚠️ Fair performance. Focus on maintaining proper form.', 2)
+NEEDS_WORK = add('general.needs_work', 'error', '❌ Form needs significant improvement. Review the key points.', 1)
+WORK_ON = add('general.work_on', 'warning', '⚠️ Work on your {key}', 2)
+EXCELLENT_AREA = add('general.excellent_area', 'success', '✅ Excellent {key}', 3)
+TIP_BREATHING = add('general.tip_breathing', 'warning', '💡 Tip: Maintain steady breathing throughout the movement', 3)
+TIP_CORE = add('general.tip_core', 'warning', '💡 Tip: Keep your core engaged for better stability', 3)
+
+# Messages of the visibility/symmetry/posture GeneralScorer (src.ml.general_scorer)
+LOW_VISIBILITY = add('general_scorer.low_visibility', 'warning', 'Some body parts are not clearly visible. Adjust your position or camera angle.', 1)
+GOOD_VISIBILITY = add('general_scorer.good_visibility', 'success', 'Excellent visibility! All body parts are clearly detected.', 3)
+ASYMMETRY = add('general_scorer.asymmetry', 'error', 'Body asymmetry detected. Check your left-right balance.', 1)
+GOOD_SYMMETRY = add('general_scorer.good_symmetry', 'success', 'Great symmetry! Your body is well-balanced.', 3)
+POOR_POSTURE = add('general_scorer.poor_posture', 'warning', 'Posture needs improvement. Keep your spine aligned.', 2)
+GOOD_POSTURE = add('general_scorer.good_posture', 'success', 'Excellent posture! Spine alignment looks good.', 3)
+OUTSTANDING = add('general_scorer.outstanding', 'success', 'Outstanding form! Keep up the great work.', 1)
+STEADY_EFFORT = add('general_scorer.good_effort', 'warning', 'Good effort! Small adjustments will improve your form.', 2)
+POOR_FORM = add('general_scorer.needs_work', 'error', 'Form needs significant improvement. Focus on the feedback above.', 1)
+
 
 class GeneralFeedback(FeedbackGenerator):
     """General feedback generator for all exercises"""
     
-    def generate_feedback(self, landmarks: Dict[str, Any], score: Dict[str, Any]) -> List[Dict[str, str]]:
+    def select_feedback(self, landmarks: Dict[str, Any], score: Dict[str, Any]) -> List[Emission]:
         """
-        Generate general feedback based on score
+        Select general feedback based on score
         
         Args:
             landmarks: Detected pose landmarks
             score: Score calculation result
             
         Returns:
-            List of feedback messages
+            List of (message, params) pairs
         """
-        self.clear_feedback()
+        feedback = []
         
         overall_score = score.get('overall', 0)
         breakdown = score.get('breakdown', {})
         
         # Overall performance feedback
         if overall_score >= 90:
-            self.add_feedback('success', '🎉 Excellent form! Keep up the great work!')
+            feedback.append((EXCELLENT, None))
         elif overall_score >= 80:
-            self.add_feedback('success', '👍 Great job! Your form is very good.')
+            feedback.append((GREAT, None))
         elif overall_score >= 70:
-            self.add_feedback('warning', '⚠️ Good effort! Some areas need improvement.')
+            feedback.append((GOOD_EFFORT, None))
         elif overall_score >= 60:
-            self.add_feedback('warning', '⚠️ Fair performance. Focus on maintaining proper form.')
+            feedback.append((FAIR, None))
         else:
-            self.add_feedback('error', '❌ Form needs significant improvement. Review the key points.')
+            feedback.append((NEEDS_WORK, None))
         
-        # Breakdown feedback
+        # Breakdown feedback. The value is left out of the text so the
+        # message stays the same, and is deduplicated, while the value moves.
         for key, value in breakdown.items():
             if value < 70:
-                self.add_feedback('warning', f'⚠️ Work on your {key}: {value}/100')
+                feedback.append((WORK_ON, {'key': key}))
             elif value >= 90:
-                self.add_feedback('success', f'✅ Excellent {key}: {value}/100')
+                feedback.append((EXCELLENT_AREA, {'key': key}))
         
         # General tips
         if overall_score < 80:
-            self.add_feedback('warning', '💡 Tip: Maintain steady breathing throughout the movement')
-            self.add_feedback('warning', '💡 Tip: Keep your core engaged for better stability')
+            feedback.append((TIP_BREATHING, None))
+            feedback.append((TIP_CORE, None))
         
-        return self.get_feedback()
\ No newline at end of file
+        return feedback
@@ -1,50 +1,58 @@
 from typing import Dict, List, Any
 from src.feedback.base import FeedbackGenerator
+from src.feedback.catalog import Emission, feedback_catalog
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+add = feedback_catalog.add
+
+EXCELLENT = add('pushup.excellent', 'success', '🎉 Excellent pushup form!', 1)
+GOOD = add('pushup.good', 'success', '👍 Good pushup technique!', 1)
+NEEDS_WORK = add('pushup.needs_work', 'warning', '⚠️ Pushup form needs work', 2)
+ELBOW_ANGLE = add('pushup.elbow_angle', 'error', '❌ Keep your elbows at 45° angle from your body', 1)
+BODY_ALIGNMENT = add('pushup.body_alignment', 'error', '❌ Maintain a straight line from head to heels', 1)
+TIP_CORE = add('pushup.tip_core', 'warning', '💡 Engage your core throughout the movement', 3)
+TIP_DEPTH = add('pushup.tip_depth', 'warning', '💡 Lower your chest to just above the ground', 3)
+
 
 class PushupFeedback(FeedbackGenerator):
     """Pushup-specific feedback generator"""
     
-    def generate_feedback(self, landmarks: Dict[str, Any], score: Dict[str, Any]) -> List[Dict[str, str]]:
+    def select_feedback(self, landmarks: Dict[str, Any], score: Dict[str, Any]) -> List[Emission]:
         """
-        Generate pushup-specific feedback
+        Select pushup-specific feedback
         
         Args:
             landmarks: Detected pose landmarks
             score: Score calculation result
             
         Returns:
-            List of feedback messages
+            List of (message, params) pairs
         """
-        self.clear_feedback()
+        feedback = []
         
         overall_score = score.get('overall', 0)
         breakdown = score.get('breakdown', {})
         
         # Overall performance
         if overall_score >= 85:
-            self.add_feedback('success', '🎉 Excellent pushup form!')
+            feedback.append((EXCELLENT, None))
         elif overall_score >= 70:
-            self.add_feedback('success', '👍 Good pushup technique!')
+            feedback.append((GOOD, None))
         else:
-            self.add_feedback('warning', '⚠️ Pushup form needs work')
+            feedback.append((NEEDS_WORK, None))
         
         # Specific pushup feedback
-        elbow_score = breakdown.get('elbow_angle', 0)
-        body_score = breakdown.get('body_alignment', 0)
-        
-        if elbow_score < 70:
-            self.add_feedback('error', '❌ Keep your elbows at 45° angle from your body')
+        if breakdown.get('elbow_angle', 0) < 70:
+            feedback.append((ELBOW_ANGLE, None))
         
-        if body_score < 70:
-            self.add_feedback('error', '❌ Maintain a straight line from head to heels')
+        if breakdown.get('body_alignment', 0) < 70:
+            feedback.append((BODY_ALIGNMENT, None))
         
         # Pro tips
         if overall_score < 80:
-            self.add_feedback('warning', '💡 Engage your core throughout the movement')
-            self.add_feedback('warning', '💡 Lower your chest to just above the ground')
+            feedback.append((TIP_CORE, None))
+            feedback.append((TIP_DEPTH, None))
         
-        return self.get_feedback()
\ No newline at end of file
+        return feedback
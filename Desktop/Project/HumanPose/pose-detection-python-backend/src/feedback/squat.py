@@ -1,54 +1,62 @@
 from typing import Dict, List, Any
 from src.feedback.base import FeedbackGenerator
+from src.feedback.catalog import Emission, feedback_catalog
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+add = feedback_catalog.add
+
+PERFECT = add('squat.perfect', 'success', '🎉 Perfect squat form!', 1)
+GOOD = add('squat.good', 'success', '👍 Good squat technique!', 1)
+NEEDS_WORK = add('squat.needs_work', 'warning', '⚠️ Squat form needs improvement', 2)
+KNEE_ALIGNMENT = add('squat.knee_alignment', 'error', '❌ Keep your knees aligned with your toes', 1)
+HIP_DEPTH = add('squat.hip_depth', 'warning', '⚠️ Try to lower your hips to parallel or below', 2)
+BACK_ANGLE = add('squat.back_angle', 'error', '❌ Maintain a neutral spine - avoid rounding your back', 1)
+TIP_HEELS = add('squat.tip_heels', 'warning', '💡 Push through your heels when standing up', 3)
+TIP_CHEST = add('squat.tip_chest', 'warning', '💡 Keep your chest up and core tight', 3)
+
 
 class SquatFeedback(FeedbackGenerator):
     """Squat-specific feedback generator"""
     
-    def generate_feedback(self, landmarks: Dict[str, Any], score: Dict[str, Any]) -> List[Dict[str, str]]:
+    def select_feedback(self, landmarks: Dict[str, Any], score: Dict[str, Any]) -> List[Emission]:
         """
-        Generate squat-specific feedback
+        Select squat-specific feedback
         
         Args:
             landmarks: Detected pose landmarks
             score: Score calculation result
             
         Returns:
-            List of feedback messages
+            List of (message, params) pairs
         """
-        self.clear_feedback()
+        feedback = []
         
         overall_score = score.get('overall', 0)
         breakdown = score.get('breakdown', {})
         
         # Overall performance
         if overall_score >= 85:
-            self.add_feedback('success', '🎉 Perfect squat form!')
+            feedback.append((PERFECT, None))
         elif overall_score >= 70:
-            self.add_feedback('success', '👍 Good squat technique!')
+            feedback.append((GOOD, None))
         else:
-            self.add_feedback('warning', '⚠️ Squat form needs improvement')
+            feedback.append((NEEDS_WORK, None))
         
         # Specific squat feedback
-        knee_score = breakdown.get('knee_alignment', 0)
-        hip_score = breakdown.get('hip_depth', 0)
-        back_score = breakdown.get('back_angle', 0)
-        
-        if knee_score < 70:
-            self.add_feedback('error', '❌ Keep your knees aligned with your toes')
+        if breakdown.get('knee_alignment', 0) < 70:
+            feedback.append((KNEE_ALIGNMENT, None))
         
-        if hip_score < 70:
-            self.add_feedback('warning', '⚠️ Try to lower your hips to parallel or below')
+        if breakdown.get('hip_depth', 0) < 70:
+            feedback.append((HIP_DEPTH, None))
         
-        if back_score < 70:
-            self.add_feedback('error', '❌ Maintain a neutral spine - avoid rounding your back')
+        if breakdown.get('back_angle', 0) < 70:
+            feedback.append((BACK_ANGLE, None))
         
         # Pro tips
         if overall_score < 80:
-            self.add_feedback('warning', '💡 Push through your heels when standing up')
-            self.add_feedback('warning', '💡 Keep your chest up and core tight')
+            feedback.append((TIP_HEELS, None))
+            feedback.append((TIP_CHEST, None))
         
-        return self.get_feedback()
\ No newline at end of file
+        return feedback
@@ -1,26 +1,30 @@
-import logging
-from fastapi import FastAPI
+import asyncio
+import json
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from starlette.websockets import WebSocketState
 import os
 import uvicorn
 
 from src.config import settings
-from src.api.routes import router
+from src.api.body_limit import BodySizeLimitMiddleware
+from src.api.routes import pose_service, router
 from src.api.upload_routes import router as upload_router
 from src.api.chatbot_routes import router as chatbot_router
+from src.api.tus_routes import TUS_EXPOSED_HEADERS, expire_uploads, router as tus_router
 from src.websocket.manager import manager
-from src.utils.logger import setup_logger
+from src.websocket.events import WebSocketEvents, WebSocketMessageType
+from src.websocket.handlers import handle_start_session, handle_stop_session, handle_video_frame
+from src.services.session_service import session_service
+from src.ml.detector_pool import detector_pool
+from src.services.result_cache import landmark_cache
+from src.services.job_engine import job_engine
+from src.ml.tracker_registry import tracker_registry
+from src.utils.logger import setup_logger, shutdown_logging
 from src.services.chatbot_service import ChatbotService
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-
-logger = logging.getLogger(__name__)
+logger = setup_logger(__name__)
 
 app = FastAPI(
     title="Pose Detection API",
@@ -39,12 +43,28 @@ if settings.DEBUG:
             f"http://127.0.0.1:{port}",
         ])
 
+# Upload bodies over the size limit are refused before the form is parsed.
+# Added first so CORS wraps it and browsers can read the 413
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    limits={
+        **{
+            path: settings.MAX_FILE_SIZE
+            for path in ("/api/upload/video", "/api/analyze/image", "/analyze/image", "/analyze/video")
+        },
+        "/api/analyze/images": settings.MAX_BATCH_BYTES
+    },
+    overhead=settings.UPLOAD_MULTIPART_OVERHEAD
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Resumable upload clients read the offset and location headers
+    expose_headers=TUS_EXPOSED_HEADERS,
 )
 
 # Create required directories
@@ -59,6 +79,7 @@ app.mount("/results", StaticFiles(directory=settings.RESULTS_DIR), name="results
 # Include routers
 app.include_router(router)
 app.include_router(upload_router, prefix="/api")  # Upload routes with /api prefix
+app.include_router(tus_router, prefix="/api")  # Resumable uploads at /api/uploads
 app.include_router(chatbot_router)
 
 # Initialize chatbot
@@ -81,9 +102,71 @@ async def root():
 async def health_check():
     return {
         "status": "healthy",
-        "websocket_connections": len(manager.active_connections)
+        "websocket_connections": len(manager.active_connections),
+        "detector_pool": detector_pool.stats(),
+        "trackers": tracker_registry.stats(),
+        "landmark_cache": landmark_cache.stats(),
+        "video_jobs": job_engine.stats()
     }
 
+@app.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket):
+    """
+    Live coaching over one connection
+
+    Clients send {"type": ..., "data": {...}} messages: start_session,
+    then video_frame for every frame, then stop_session; ping at any
+    time. A session still running when the connection drops is stopped,
+    so its tracking graph goes back to the pool.
+    """
+    await manager.connect(websocket)
+    session_id = None
+    try:
+        while True:
+            try:
+                message = json.loads(await websocket.receive_text())
+                event = message.get("type")
+                data = message.get("data") or {}
+            except (ValueError, AttributeError):
+                await manager.send_personal_message(
+                    WebSocketMessageType.error("Messages must be JSON objects", "INVALID_MESSAGE"), websocket
+                )
+                continue
+
+            if event == WebSocketEvents.START_SESSION:
+                if session_id is not None:
+                    await handle_stop_session(session_id, session_service, manager, pose_service)
+                session_id = await handle_start_session(websocket, data, session_service, manager)
+                if session_id is None and websocket.application_state == WebSocketState.DISCONNECTED:
+                    # Refused for capacity, the handler closed the connection
+                    break
+            elif event == WebSocketEvents.VIDEO_FRAME:
+                if session_id is None:
+                    await manager.send_personal_message(
+                        WebSocketMessageType.error(
+                            "No active session. Please start a session first.", "NO_SESSION"
+                        ),
+                        websocket
+                    )
+                    continue
+                await handle_video_frame(session_id, data, pose_service, session_service, manager)
+            elif event == WebSocketEvents.STOP_SESSION:
+                if session_id is not None:
+                    await handle_stop_session(session_id, session_service, manager, pose_service)
+                    session_id = None
+            elif event == WebSocketEvents.PING:
+                await manager.send_personal_message(WebSocketMessageType.pong(), websocket)
+            else:
+                await manager.send_personal_message(
+                    WebSocketMessageType.error(f"Unknown message type '{event}'", "UNKNOWN_EVENT"), websocket
+                )
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if session_id is not None:
+            await handle_stop_session(session_id, session_service, manager, pose_service)
+        manager.disconnect(websocket)
+
 @app.post("/api/chatbot")
 async def chatbot_endpoint(request: dict):
     """AI Chatbot endpoint"""
@@ -139,10 +222,23 @@ def generate_fallback_response(message: str, context: dict) -> str:
 async def startup_event():
     logger.info("🚀 Starting HumanPose AI Backend")
     logger.info("✅ FastAPI application initialized")
+    # Jobs cut short by the last shutdown or crash
+    job_engine.resume_pending()
+    # Resumable uploads the clients gave up on
+    app.state.upload_expiry = asyncio.create_task(expire_uploads())
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("👋 Shutting down HumanPose AI Backend")
+    upload_expiry = getattr(app.state, "upload_expiry", None)
+    if upload_expiry is not None:
+        upload_expiry.cancel()
+    detector_pool.shutdown()
+    # Running jobs are left to finish, queued ones are resumed on the next start
+    job_engine.shutdown(wait=False)
+    tracker_registry.close_all()
+    # Flush queued log records before the process exits
+    shutdown_logging()
 
 if __name__ == "__main__":
     logger.info(f"Starting server on {settings.HOST}:{settings.PORT}")
@@ -1,3 +1,4 @@
+from .landmark_frame import LandmarkFrame
 from .pose_detector import PoseDetector
 
-__all__ = ['PoseDetector']
\ No newline at end of file
+__all__ = ['LandmarkFrame', 'PoseDetector']
@@ -0,0 +1,85 @@
+import os
+from typing import Optional
+
+from src.config import settings
+from src.ml.backends.base import InferenceBackend, LandmarkModelBackend
+from src.ml.model_tiers import tier_name
+
+BACKEND_NAMES = ("mediapipe", "onnxruntime", "opencv")
+
+
+def create_backend(name: Optional[str] = None, complexity: Optional[int] = None) -> InferenceBackend:
+    """
+    Build an inference backend from settings
+
+    Args:
+        name: "mediapipe", "onnxruntime" or "opencv", defaults to INFERENCE_BACKEND
+        complexity: MediaPipe model tier, defaults to POSE_MODEL_COMPLEXITY.
+            Exported-model backends always run POSE_DETECTOR_MODEL_PATH
+            followed by POSE_MODEL_PATH.
+
+    Returns:
+        Ready-to-use InferenceBackend
+    """
+    name = (name or settings.INFERENCE_BACKEND).lower().strip()
+    if complexity is None:
+        complexity = settings.POSE_MODEL_COMPLEXITY
+
+    # Backends are imported lazily so a missing optional runtime only
+    # matters when that backend is actually selected
+    if name == "mediapipe":
+        from src.ml.backends.mediapipe_backend import MediaPipeBackend
+        return MediaPipeBackend(complexity, settings.MIN_DETECTION_CONFIDENCE)
+    if name == "onnxruntime":
+        from src.ml.backends.onnx_backend import OnnxRuntimeBackend
+        return OnnxRuntimeBackend(
+            settings.POSE_MODEL_PATH,
+            settings.POSE_DETECTOR_MODEL_PATH,
+            input_size=settings.POSE_MODEL_INPUT_SIZE,
+            detector_input_size=settings.POSE_DETECTOR_INPUT_SIZE,
+            min_presence=settings.MIN_DETECTION_CONFIDENCE,
+            num_threads=settings.ONNX_NUM_THREADS
+        )
+    if name == "opencv":
+        from src.ml.backends.opencv_dnn_backend import OpenCVDnnBackend
+        return OpenCVDnnBackend(
+            settings.POSE_MODEL_PATH,
+            settings.POSE_DETECTOR_MODEL_PATH,
+            input_size=settings.POSE_MODEL_INPUT_SIZE,
+            detector_input_size=settings.POSE_DETECTOR_INPUT_SIZE,
+            min_presence=settings.MIN_DETECTION_CONFIDENCE
+        )
+
+    raise ValueError(f"Unknown inference backend '{name}', expected one of: {', '.join(BACKEND_NAMES)}")
+
+
+def backend_tier(complexity: int, name: Optional[str] = None) -> Optional[int]:
+    """
+    Model tier a backend actually runs for a requested complexity
+
+    MediaPipe has a model per tier. The exported-model backends run the
+    same POSE_MODEL_PATH whatever tier is asked for, so every tier maps to
+    None and shares one backend, one cache entry and one model name.
+
+    Args:
+        complexity: Requested model complexity
+        name: Backend name, defaults to INFERENCE_BACKEND
+
+    Returns:
+        The complexity for MediaPipe, None for exported-model backends
+    """
+    name = (name or settings.INFERENCE_BACKEND).lower().strip()
+    return complexity if name == "mediapipe" else None
+
+
+def model_name(complexity: int, name: Optional[str] = None) -> str:
+    """Name of the model a backend runs for a requested complexity: the tier for MediaPipe, else the model file"""
+    tier = backend_tier(complexity, name)
+    if tier is None:
+        return os.path.basename(settings.POSE_MODEL_PATH)
+    return tier_name(tier)
+
+
+__all__ = [
+    'InferenceBackend', 'LandmarkModelBackend', 'BACKEND_NAMES', 'create_backend', 'backend_tier', 'model_name'
+]
@@ -0,0 +1,288 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+NUM_LANDMARKS = 33
+
+
+class InferenceBackend(ABC):
+    """
+    Abstract base class for pose inference engines
+
+    Every backend takes BGR images as decoded by OpenCV and returns
+    (33, 4) float32 arrays of x, y, z, visibility normalized to the input
+    image, the same layout PoseService scores.
+    """
+
+    name = "base"
+    # True when detect_batch runs several images in one model call
+    supports_batch = False
+
+    @abstractmethod
+    def detect(self, image: np.ndarray) -> Optional[np.ndarray]:
+        """Detect the pose in one BGR image, None if no pose found"""
+        pass
+
+    def detect_batch(self, images: Sequence[np.ndarray]) -> List[Optional[np.ndarray]]:
+        """Detect the pose in several BGR images, one result per image"""
+        return [self.detect(image) for image in images]
+
+    def warmup(self):
+        """Run a dummy inference so the first real request doesn't pay for model loading"""
+        self.detect(np.zeros((256, 256, 3), dtype=np.uint8))
+
+    @abstractmethod
+    def describe(self) -> dict:
+        """Return backend name, model and runtime details"""
+        pass
+
+    def close(self):
+        """Release the model"""
+        pass
+
+
+def ssd_anchors(input_size: int = 224, strides: Sequence[int] = (8, 16, 32, 32, 32)) -> np.ndarray:
+    """
+    Anchor centers of the BlazePose detector
+
+    Same as MediaPipe's SsdAnchorsCalculator for the pose detector: fixed
+    size anchors, two per cell and layer, layers of equal stride sharing
+    one grid.
+
+    Returns:
+        (N, 2) float32 anchor centers normalized to the input, 2254 for 224x224
+    """
+    centers = []
+    layer = 0
+    while layer < len(strides):
+        stride = strides[layer]
+        per_cell = 0
+        while layer < len(strides) and strides[layer] == stride:
+            per_cell += 2
+            layer += 1
+        cells = int(np.ceil(input_size / stride))
+        ys, xs = np.mgrid[0:cells, 0:cells]
+        grid = np.stack([(xs.ravel() + 0.5) / cells, (ys.ravel() + 0.5) / cells], axis=1)
+        centers.append(np.repeat(grid, per_cell, axis=0))
+    return np.concatenate(centers).astype(np.float32)
+
+
+class LandmarkModelBackend(InferenceBackend):
+    """
+    Shared pre/post-processing for the exported two-stage BlazePose models
+
+    Like MediaPipe's own pose pipeline, a detector finds the person and
+    the landmark model only looks at the region it returns:
+
+    1. The detector takes the letterboxed image as RGB scaled to -1..1 and
+       outputs a score and a box with 4 keypoints for each SSD anchor. The
+       best scoring anchor gives the region: centered on the hip midpoint,
+       2.5 times the hip-to-head distance wide, rotated so the body is
+       upright.
+    2. The landmark model takes that region warped to a square RGB image
+       scaled to 0-1 and outputs 39 x (x, y, z, visibility, presence),
+       with x, y, z in input pixels and visibility/presence as logits;
+       the first 33 points are the pose landmarks. An optional second
+       output holds a pose presence score.
+    """
+
+    supports_batch = True
+
+    def __init__(
+        self,
+        model_path: str,
+        detector_path: str,
+        input_size: int = 256,
+        detector_input_size: int = 224,
+        min_presence: float = 0.5,
+        min_detection_score: float = 0.5
+    ):
+        """
+        Args:
+            model_path: Path to the exported landmark model
+            detector_path: Path to the exported pose detector model
+            input_size: Square landmark model input side in pixels
+            detector_input_size: Square detector input side in pixels
+            min_presence: Pose presence score below which no pose is reported
+            min_detection_score: Detector score below which no pose is reported
+        """
+        self.model_path = model_path
+        self.detector_path = detector_path
+        self.input_size = input_size
+        self.detector_input_size = detector_input_size
+        self.min_presence = min_presence
+        self.min_detection_score = min_detection_score
+        self.anchors = ssd_anchors(detector_input_size)
+        # Set by subclasses from the models' declared input shapes
+        self.channels_first = False
+        self.detector_channels_first = False
+
+    @staticmethod
+    def _letterbox(image: np.ndarray, size: int) -> Tuple[np.ndarray, Tuple[int, int, int]]:
+        """Pad an image to a square, resize it to size x size and convert to RGB"""
+        height, width = image.shape[:2]
+        side = max(height, width)
+        pad_x = (side - width) // 2
+        pad_y = (side - height) // 2
+        square = cv2.copyMakeBorder(
+            image, pad_y, side - height - pad_y, pad_x, side - width - pad_x,
+            cv2.BORDER_CONSTANT, value=(0, 0, 0)
+        )
+        resized = cv2.resize(square, (size, size), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(resized, cv2.COLOR_BGR2RGB), (side, pad_x, pad_y)
+
+    def preprocess_detector(self, images: Sequence[np.ndarray]) -> Tuple[np.ndarray, list]:
+        """
+        Build the detector input for a batch of BGR images
+
+        Returns:
+            (N, H, W, 3) or (N, 3, H, W) float32 tensor and per-image letterbox geometry
+        """
+        size = self.detector_input_size
+        batch = np.empty((len(images), size, size, 3), dtype=np.float32)
+        geometry = []
+        for i, image in enumerate(images):
+            batch[i], geo = self._letterbox(image, size)
+            geometry.append(geo)
+        batch *= 2.0 / 255.0
+        batch -= 1.0
+        if self.detector_channels_first:
+            batch = np.ascontiguousarray(batch.transpose(0, 3, 1, 2))
+        return batch, geometry
+
+    def decode_regions(
+        self,
+        raw_boxes: np.ndarray,
+        raw_scores: np.ndarray,
+        geometry: list
+    ) -> List[Optional[Tuple[float, float, float, float]]]:
+        """
+        Turn detector output into one pose region per image
+
+        Args:
+            raw_boxes: (N, anchors, 12) box and keypoint offsets in detector input pixels
+            raw_scores: (N, anchors, 1) score logits
+            geometry: Letterbox geometry from preprocess_detector
+
+        Returns:
+            (center x, center y, side, rotation) in original image pixels and
+            radians per image, None where no person was found
+        """
+        size = self.detector_input_size
+        raw_boxes = raw_boxes.reshape(len(geometry), len(self.anchors), -1)
+        scores = 1.0 / (1.0 + np.exp(-np.clip(raw_scores.reshape(len(geometry), -1), -100, 100)))
+
+        regions = []
+        for i, (side, pad_x, pad_y) in enumerate(geometry):
+            best = int(np.argmax(scores[i]))
+            if scores[i, best] < self.min_detection_score:
+                regions.append(None)
+                continue
+            # Keypoint 0 is the hip midpoint, keypoint 1 a point above the head
+            offsets = raw_boxes[i, best, 4:8].reshape(2, 2) / size + self.anchors[best]
+            points = offsets * side - (pad_x, pad_y)
+            (x0, y0), (x1, y1) = points
+            rotation = np.pi / 2 - np.arctan2(-(y1 - y0), x1 - x0)
+            rotation = (rotation + np.pi) % (2 * np.pi) - np.pi
+            region_side = 2.0 * np.hypot(x1 - x0, y1 - y0) * 1.25
+            regions.append((float(x0), float(y0), float(region_side), float(rotation)))
+        return regions
+
+    def _region_to_input(self, region: Tuple[float, float, float, float]) -> np.ndarray:
+        """Affine map from landmark model input pixels to original image pixels"""
+        center_x, center_y, side, rotation = region
+        scale = side / self.input_size
+        cos, sin = np.cos(rotation), np.sin(rotation)
+        return np.array([
+            [cos * scale, -sin * scale, center_x - 0.5 * side * (cos - sin)],
+            [sin * scale, cos * scale, center_y - 0.5 * side * (sin + cos)]
+        ], dtype=np.float64)
+
+    def preprocess(self, images: Sequence[np.ndarray], regions: list) -> np.ndarray:
+        """
+        Warp each image's pose region to the landmark model input
+
+        Returns:
+            (N, H, W, 3) or (N, 3, H, W) float32 tensor
+        """
+        size = self.input_size
+        batch = np.empty((len(images), size, size, 3), dtype=np.float32)
+        for i, (image, region) in enumerate(zip(images, regions)):
+            crop = cv2.warpAffine(
+                image, self._region_to_input(region), (size, size),
+                flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
+                borderMode=cv2.BORDER_CONSTANT, borderValue=(0, 0, 0)
+            )
+            batch[i] = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+        batch *= 1.0 / 255.0
+        if self.channels_first:
+            batch = np.ascontiguousarray(batch.transpose(0, 3, 1, 2))
+        return batch
+
+    def postprocess(
+        self,
+        raw_landmarks: np.ndarray,
+        presence: Optional[np.ndarray],
+        images: Sequence[np.ndarray],
+        regions: list
+    ) -> List[Optional[np.ndarray]]:
+        """Map raw model output back to (33, 4) landmarks normalized to each original image"""
+        raw = raw_landmarks.reshape(len(regions), -1, 5)[:, :NUM_LANDMARKS].astype(np.float64)
+        if presence is not None:
+            presence = presence.reshape(len(regions), -1)[:, 0]
+
+        results = []
+        for i, (image, region) in enumerate(zip(images, regions)):
+            if presence is not None and presence[i] < self.min_presence:
+                results.append(None)
+                continue
+
+            height, width = image.shape[:2]
+            matrix = self._region_to_input(region)
+            points = raw[i, :, :2] @ matrix[:, :2].T + matrix[:, 2]
+            landmarks = np.empty((NUM_LANDMARKS, 4), dtype=np.float32)
+            landmarks[:, 0] = points[:, 0] / width
+            landmarks[:, 1] = points[:, 1] / height
+            # MediaPipe z uses the same scale as x
+            landmarks[:, 2] = raw[i, :, 2] * (region[2] / self.input_size) / width
+            landmarks[:, 3] = 1.0 / (1.0 + np.exp(-raw[i, :, 3]))
+            results.append(landmarks)
+        return results
+
+    @abstractmethod
+    def _run_detector(self, batch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Run the detector, returning raw boxes and score logits"""
+        pass
+
+    @abstractmethod
+    def _run(self, batch: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Run the landmark model, returning raw landmarks and optional presence scores"""
+        pass
+
+    @staticmethod
+    def _split_detector_outputs(outputs: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Tell the (N, anchors, 12) boxes from the (N, anchors, 1) scores, export order varies"""
+        boxes, scores = sorted(outputs[:2], key=lambda output: output.shape[-1], reverse=True)
+        return boxes, scores
+
+    def detect(self, image: np.ndarray) -> Optional[np.ndarray]:
+        return self.detect_batch([image])[0]
+
+    def detect_batch(self, images: Sequence[np.ndarray]) -> List[Optional[np.ndarray]]:
+        if len(images) == 0:
+            return []
+        batch, geometry = self.preprocess_detector(images)
+        regions = self.decode_regions(*self._run_detector(batch), geometry)
+
+        found = [i for i, region in enumerate(regions) if region is not None]
+        results: List[Optional[np.ndarray]] = [None] * len(images)
+        if not found:
+            return results
+        found_images = [images[i] for i in found]
+        found_regions = [regions[i] for i in found]
+        raw_landmarks, presence = self._run(self.preprocess(found_images, found_regions))
+        for i, landmarks in zip(found, self.postprocess(raw_landmarks, presence, found_images, found_regions)):
+            results[i] = landmarks
+        return results
@@ -0,0 +1,45 @@
+from typing import Optional
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+from src.ml.backends.base import InferenceBackend
+from src.ml.landmark_frame import LandmarkFrame
+from src.ml.model_tiers import tier_name
+
+
+class MediaPipeBackend(InferenceBackend):
+    """
+    MediaPipe Pose in static-image mode (the default backend)
+
+    MediaPipe graphs take one image per call, so detect_batch falls back
+    to running the images one after another.
+    """
+
+    name = "mediapipe"
+
+    def __init__(self, model_complexity: int = 1, min_detection_confidence: float = 0.5):
+        self.model_complexity = model_complexity
+        self.min_detection_confidence = min_detection_confidence
+        self.pose = mp.solutions.pose.Pose(
+            static_image_mode=True,
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence
+        )
+
+    def detect(self, image: np.ndarray) -> Optional[np.ndarray]:
+        results = self.pose.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        if not results or not results.pose_landmarks:
+            return None
+        return LandmarkFrame.from_mediapipe(results.pose_landmarks).data
+
+    def describe(self) -> dict:
+        return {
+            "backend": self.name,
+            "model_tier": tier_name(self.model_complexity),
+            "batching": self.supports_batch
+        }
+
+    def close(self):
+        self.pose.close()
@@ -0,0 +1,84 @@
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.ml.backends.base import LandmarkModelBackend
+
+try:
+    import onnxruntime as ort
+except ImportError:  # Optional dependency
+    ort = None
+
+
+class OnnxRuntimeBackend(LandmarkModelBackend):
+    """
+    Exported BlazePose detector and landmark models on the ONNX Runtime CPU provider
+
+    A whole batch of images goes through each model in one session.run
+    call, which is what makes offline video jobs cheap on CPU-only nodes.
+    The models' batch dimension must be dynamic for batches larger than 1.
+    """
+
+    name = "onnxruntime"
+
+    def __init__(
+        self,
+        model_path: str,
+        detector_path: str,
+        input_size: int = 256,
+        detector_input_size: int = 224,
+        min_presence: float = 0.5,
+        num_threads: int = 0
+    ):
+        """
+        Args:
+            model_path: Path to the .onnx landmark model
+            detector_path: Path to the .onnx pose detector model
+            input_size: Square landmark model input side in pixels
+            detector_input_size: Square detector input side in pixels
+            min_presence: Pose presence and detector score below which no pose is reported
+            num_threads: Intra-op threads, 0 lets ONNX Runtime decide
+        """
+        if ort is None:
+            raise ImportError("onnxruntime is required for the onnxruntime backend: pip install onnxruntime")
+        for path in (model_path, detector_path):
+            if not path or not os.path.exists(path):
+                raise FileNotFoundError(f"Pose model not found: {path!r}")
+
+        super().__init__(model_path, detector_path, input_size, detector_input_size, min_presence, min_presence)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.num_threads = num_threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.detector = ort.InferenceSession(detector_path, options, providers=["CPUExecutionProvider"])
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        self.channels_first = len(model_input.shape) == 4 and model_input.shape[1] == 3
+        self.output_names = [output.name for output in self.session.get_outputs()[:2]]
+
+        detector_input = self.detector.get_inputs()[0]
+        self.detector_input_name = detector_input.name
+        self.detector_channels_first = len(detector_input.shape) == 4 and detector_input.shape[1] == 3
+
+    def _run_detector(self, batch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self._split_detector_outputs(self.detector.run(None, {self.detector_input_name: batch}))
+
+    def _run(self, batch: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        outputs = self.session.run(self.output_names, {self.input_name: batch})
+        return outputs[0], outputs[1] if len(outputs) > 1 else None
+
+    def describe(self) -> dict:
+        return {
+            "backend": self.name,
+            "model": os.path.basename(self.model_path),
+            "detector": os.path.basename(self.detector_path),
+            "input_size": self.input_size,
+            "providers": self.session.get_providers(),
+            "threads": self.num_threads or "auto",
+            "batching": self.supports_batch
+        }
@@ -0,0 +1,71 @@
+import os
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+from src.ml.backends.base import LandmarkModelBackend
+
+
+class OpenCVDnnBackend(LandmarkModelBackend):
+    """
+    Exported BlazePose detector and landmark models on OpenCV's DNN module
+
+    Needs no extra dependency beyond OpenCV. cv2.dnn expects NCHW input,
+    so both models have to be exported channels-first.
+    """
+
+    name = "opencv"
+
+    def __init__(
+        self,
+        model_path: str,
+        detector_path: str,
+        input_size: int = 256,
+        detector_input_size: int = 224,
+        min_presence: float = 0.5
+    ):
+        """
+        Args:
+            model_path: Path to the .onnx landmark model
+            detector_path: Path to the .onnx pose detector model
+            input_size: Square landmark model input side in pixels
+            detector_input_size: Square detector input side in pixels
+            min_presence: Pose presence and detector score below which no pose is reported
+        """
+        for path in (model_path, detector_path):
+            if not path or not os.path.exists(path):
+                raise FileNotFoundError(f"Pose model not found: {path!r}")
+
+        super().__init__(model_path, detector_path, input_size, detector_input_size, min_presence, min_presence)
+        self.channels_first = True
+        self.detector_channels_first = True
+        self.net = self._load(model_path)
+        self.output_names = self.net.getUnconnectedOutLayersNames()[:2]
+        self.detector_net = self._load(detector_path)
+        self.detector_output_names = self.detector_net.getUnconnectedOutLayersNames()[:2]
+
+    @staticmethod
+    def _load(path: str):
+        net = cv2.dnn.readNet(path)
+        net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        return net
+
+    def _run_detector(self, batch: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        self.detector_net.setInput(batch)
+        return self._split_detector_outputs(self.detector_net.forward(list(self.detector_output_names)))
+
+    def _run(self, batch: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        self.net.setInput(batch)
+        outputs = self.net.forward(list(self.output_names))
+        return outputs[0], outputs[1] if len(outputs) > 1 else None
+
+    def describe(self) -> dict:
+        return {
+            "backend": self.name,
+            "model": os.path.basename(self.model_path),
+            "detector": os.path.basename(self.detector_path),
+            "input_size": self.input_size,
+            "batching": self.supports_batch
+        }
@@ -1,25 +1,44 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import numpy as np
 
+from src.feedback.catalog import Emission, render_feedback
+from src.ml.landmark_frame import LandmarkFrame
+
 class BaseScorer(ABC):
     """Base class for all exercise scorers"""
     
     def __init__(self):
         self.name = "Base Scorer"
         self.exercise_type = "general"
+        # Exercises without repetitions have no RepSpec
+        self.rep_spec = None
+        # Standard feature names (see src.ml.features) read by calculate_score/generate_feedback
+        self.required_features = ()
     
     @abstractmethod
-    def calculate_score(self, landmarks: List[Dict], angles: Dict[str, float]) -> Dict[str, Any]:
+    def calculate_score(self, landmarks: LandmarkFrame, angles: Dict[str, float]) -> Dict[str, Any]:
         pass
     
+    def calculate_scores(self, landmarks: np.ndarray) -> List[Dict[str, Any]]:
+        """Score an (N, 33, 4) tensor, one score dict per frame"""
+        return [self.calculate_score(LandmarkFrame(frame), {}) for frame in landmarks]
+    
+    def create_rep_counter(self):
+        """New streaming rep counter for a session, None if the exercise has no reps"""
+        return None
+    
     @abstractmethod
-    def generate_feedback(self, landmarks: List[Dict], angles: Dict[str, float], score: Dict) -> List[Dict]:
+    def select_feedback(self, landmarks: LandmarkFrame, angles: Dict[str, float], score: Dict) -> List[Emission]:
+        """Interned catalog messages for a score, as (message, params) pairs"""
         pass
     
-    def get_landmark_by_id(self, landmarks: List[Dict], landmark_id: int) -> Dict:
-        """Get landmark by ID"""
-        for lm in landmarks:
-            if lm.get('id') == landmark_id:
-                return lm
-        return None
\ No newline at end of file
+    def generate_feedback(self, landmarks: LandmarkFrame, angles: Dict[str, float], score: Dict) -> List[Dict]:
+        """Feedback dicts for a score, rendered from select_feedback"""
+        return render_feedback(self.select_feedback(landmarks, angles, score))
+    
+    def get_landmark_by_id(self, landmarks: LandmarkFrame, landmark_id: int) -> Optional[np.ndarray]:
+        """Get the x, y, z, visibility row of a landmark"""
+        if landmarks is None or not 0 <= landmark_id < len(landmarks):
+            return None
+        return landmarks[landmark_id]
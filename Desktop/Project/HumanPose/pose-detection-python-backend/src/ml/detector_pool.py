@@ -0,0 +1,172 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.config import settings
+from src.ml.backends import InferenceBackend, backend_tier, create_backend
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Per-process inference backends keyed by the model tier they run (see backend_tier)
+_worker_backends: Dict[Optional[int], InferenceBackend] = {}
+
+
+def _get_worker_backend(complexity: int) -> InferenceBackend:
+    """Get this worker's backend for a model tier, building it on first use"""
+    key = backend_tier(complexity)
+    backend = _worker_backends.get(key)
+    if backend is None:
+        backend = create_backend(complexity=complexity)
+        # First call loads the model, do it before any real request arrives
+        backend.warmup()
+        _worker_backends[key] = backend
+    return backend
+
+
+def _init_worker(model_complexity: int):
+    """Build and warm the default-tier backend owned by this worker process"""
+    _get_worker_backend(model_complexity)
+
+
+def _detect_in_worker(image: np.ndarray, complexity: int) -> Optional[np.ndarray]:
+    """
+    Run pose detection inside a worker process
+
+    Returns:
+        (33, 4) float32 array of x, y, z, visibility or None if no pose found
+    """
+    return _get_worker_backend(complexity).detect(image)
+
+
+def _detect_batch_in_worker(images: Sequence[np.ndarray], complexity: int) -> List[Optional[np.ndarray]]:
+    """Run pose detection on several images inside a worker process"""
+    return _get_worker_backend(complexity).detect_batch(images)
+
+
+class DetectorPool:
+    """
+    Pool of worker processes, each owning its own warmed inference backend.
+
+    The pool is started lazily on first use so importing a module that
+    references it does not spawn processes.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        model_complexity: int = 1
+    ):
+        self.size = size or max(1, os.cpu_count() or 1)
+        self.model_complexity = model_complexity
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+
+    def start(self) -> ProcessPoolExecutor:
+        """Start worker processes if they are not running yet"""
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a parent that already runs MediaPipe threads can deadlock
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.size,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_complexity,)
+                )
+                logger.info(f"✅ DetectorPool started with {self.size} workers")
+            return self._executor
+
+    def submit(self, image: np.ndarray, complexity: Optional[int] = None) -> Future:
+        """
+        Submit a BGR image for detection
+
+        Args:
+            image: BGR image as decoded by OpenCV
+            complexity: Model tier, defaults to the pool's model_complexity
+
+        Returns:
+            Future resolving to a (33, 4) landmark array or None
+        """
+        return self._submit(_detect_in_worker, image, complexity)
+
+    def submit_batch(self, images: Sequence[np.ndarray], complexity: Optional[int] = None) -> Future:
+        """
+        Submit several BGR images to one worker for a single batched call
+
+        Returns:
+            Future resolving to a list of (33, 4) landmark arrays or None, one per image
+        """
+        return self._submit(_detect_batch_in_worker, list(images), complexity)
+
+    def _submit(self, fn, payload, complexity: Optional[int]) -> Future:
+        if complexity is None:
+            complexity = self.model_complexity
+
+        executor = self.start()
+        try:
+            future = executor.submit(fn, payload, complexity)
+        except BrokenProcessPool:
+            logger.error("DetectorPool workers died, restarting pool")
+            self.shutdown(wait=False)
+            future = self.start().submit(fn, payload, complexity)
+
+        with self._lock:
+            self._submitted += 1
+        future.add_done_callback(self._on_done)
+        return future
+
+    async def detect(self, image: np.ndarray, complexity: Optional[int] = None) -> Optional[np.ndarray]:
+        """Submit an image and await its landmarks without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(image, complexity))
+
+    def detect_sync(self, image: np.ndarray, complexity: Optional[int] = None) -> Optional[np.ndarray]:
+        """Submit an image and block until its landmarks are available"""
+        return self.submit(image, complexity).result()
+
+    def detect_batch_sync(
+        self,
+        images: Sequence[np.ndarray],
+        complexity: Optional[int] = None
+    ) -> List[Optional[np.ndarray]]:
+        """Submit a batch of images and block until all landmarks are available"""
+        return self.submit_batch(images, complexity).result()
+
+    def _on_done(self, future: Future):
+        with self._lock:
+            self._completed += 1
+
+    def stats(self) -> dict:
+        """Return pool size and request counters"""
+        with self._lock:
+            return {
+                "workers": self.size,
+                "backend": settings.INFERENCE_BACKEND,
+                "started": self._executor is not None,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "in_flight": self._submitted - self._completed
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop all worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("DetectorPool shut down")
+
+
+# Global instance
+detector_pool = DetectorPool(
+    size=settings.DETECTOR_POOL_SIZE,
+    model_complexity=settings.POSE_MODEL_COMPLEXITY
+)
@@ -0,0 +1,197 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Tuple, Union
+
+import numpy as np
+
+from src.ml.kinematics import JOINT_ANGLES
+from src.ml.landmark_frame import LANDMARK_INDEX, LANDMARK_NAMES, LandmarkFrame
+
+# A landmark name, or several names whose midpoint is used
+PointRef = Union[str, Tuple[str, ...]]
+
+
+@dataclass(frozen=True)
+class Feature:
+    """
+    A per-frame measurement
+
+    Kinds:
+        angle: joint angle at points[1] formed by points[0]-points[1]-points[2], degrees
+        lean: angle of the points[0] -> points[1] segment from vertical, degrees
+        vertical_gap: y of points[1] minus y of points[0] (positive = points[1] lower in the image)
+        horizontal_gap: |x of points[1] - x of points[0]|
+        visibility: fraction of all landmarks visible above 0.5
+        symmetry: mean |y_left - y_right| over the (left, right) pairs in points
+    """
+    name: str
+    kind: str
+    points: Tuple[Any, ...] = ()
+
+    @property
+    def key(self) -> Tuple[str, Tuple[Any, ...]]:
+        """Identity of the measurement, shared by features that differ only in name"""
+        return self.kind, self.points
+
+
+def _point_index(ref: PointRef) -> np.ndarray:
+    names = (ref,) if isinstance(ref, str) else ref
+    return np.array([LANDMARK_INDEX[name] for name in names])
+
+
+def _point(xy: np.ndarray, index: np.ndarray) -> np.ndarray:
+    """(N, 2) position of a landmark or the midpoint of several"""
+    return xy[:, index].mean(axis=1)
+
+
+@lru_cache(maxsize=None)
+def _compile(kind: str, points: Tuple[Any, ...]) -> Callable[[np.ndarray], np.ndarray]:
+    if kind == "angle":
+        a, b, c = (_point_index(ref) for ref in points)
+
+        def kernel(landmarks):
+            xy = landmarks[..., :2]
+            ba = _point(xy, a) - _point(xy, b)
+            bc = _point(xy, c) - _point(xy, b)
+            cross = ba[:, 0] * bc[:, 1] - ba[:, 1] * bc[:, 0]
+            dot = (ba * bc).sum(axis=1)
+            return np.degrees(np.abs(np.arctan2(cross, dot)))
+        return kernel
+
+    if kind == "lean":
+        a, b = (_point_index(ref) for ref in points)
+
+        def kernel(landmarks):
+            xy = landmarks[..., :2]
+            dx, dy = (_point(xy, a) - _point(xy, b)).T
+            return np.degrees(np.arctan2(np.abs(dx), np.abs(dy)))
+        return kernel
+
+    if kind == "vertical_gap":
+        a, b = (_point_index(ref) for ref in points)
+        return lambda landmarks: _point(landmarks[..., :2], b)[:, 1] - _point(landmarks[..., :2], a)[:, 1]
+
+    if kind == "horizontal_gap":
+        a, b = (_point_index(ref) for ref in points)
+        return lambda landmarks: np.abs(_point(landmarks[..., :2], b)[:, 0] - _point(landmarks[..., :2], a)[:, 0])
+
+    if kind == "visibility":
+        return lambda landmarks: (landmarks[..., 3] > 0.5).mean(axis=1)
+
+    if kind == "symmetry":
+        left = np.array([LANDMARK_INDEX[l] for l, _ in points])
+        right = np.array([LANDMARK_INDEX[r] for _, r in points])
+        return lambda landmarks: np.abs(landmarks[:, left, 1] - landmarks[:, right, 1]).mean(axis=1)
+
+    raise ValueError(f"Unknown feature kind '{kind}'")
+
+
+def compile_feature(feature: Feature) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Kernel mapping an (N, 33, 4) tensor to the (N,) feature values
+
+    Kernels are cached, so features with the same kind and points share one.
+    """
+    try:
+        return _compile(feature.kind, feature.points)
+    except ValueError:
+        raise ValueError(f"Unknown feature kind '{feature.kind}' in feature '{feature.name}'") from None
+
+
+# Features every frame can provide by name: the kinematics joint angles plus back lean
+STANDARD_FEATURES: Dict[str, Feature] = {
+    name: Feature(name, "angle", tuple(LANDMARK_NAMES[idx] for idx in points))
+    for name, points in JOINT_ANGLES.items()
+}
+STANDARD_FEATURES["back"] = Feature(
+    "back", "lean", (("left_shoulder", "right_shoulder"), ("left_hip", "right_hip"))
+)
+
+
+def compute_features(landmarks: np.ndarray, names: Iterable[str]) -> Dict[str, np.ndarray]:
+    """
+    Vectorized values of the named standard features for a stack of frames
+
+    Args:
+        landmarks: (N, 33, 4) landmark tensor
+        names: Feature names from STANDARD_FEATURES
+
+    Returns:
+        Dict of name -> (N,) values
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float64).reshape(-1, 33, 4)
+    return {name: compile_feature(STANDARD_FEATURES[name])(landmarks) for name in names}
+
+
+class FrameFeatures(Mapping):
+    """
+    Lazy feature graph of one frame.
+
+    Reads like a dict of feature values (e.g. angles["left_knee"]), but a
+    feature is only computed the first time a consumer asks for it and is
+    then memoized for the rest of the frame. Features with the same kind
+    and points are computed once even when consumers name them
+    differently. Precomputed values (e.g. from whole-video kinematics) can
+    be seeded so they are never recomputed.
+    """
+
+    __slots__ = ("frame", "_data", "_values", "_computed")
+
+    def __init__(self, frame: Union[LandmarkFrame, np.ndarray], values: Mapping[str, float] = None):
+        """
+        Args:
+            frame: Landmarks of the frame
+            values: Already known standard feature values by name
+        """
+        self.frame = frame if isinstance(frame, LandmarkFrame) else LandmarkFrame(frame)
+        self._data = None
+        self._values: Dict[Any, float] = {}
+        self._computed = 0
+        for name, value in (values or {}).items():
+            feature = STANDARD_FEATURES.get(name)
+            self._values[feature.key if feature else name] = value
+
+    def value(self, feature: Feature) -> float:
+        """Value of any feature definition, computed at most once per frame"""
+        key = feature.key
+        value = self._values.get(key)
+        if value is None:
+            if self._data is None:
+                self._data = self.frame.data[None].astype(np.float64)
+            value = float(compile_feature(feature)(self._data)[0])
+            self._values[key] = value
+            self._computed += 1
+        return value
+
+    def __getitem__(self, name: str) -> float:
+        feature = STANDARD_FEATURES.get(name)
+        if feature is None:
+            raise KeyError(name)
+        return self.value(feature)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(STANDARD_FEATURES)
+
+    def __len__(self) -> int:
+        return len(STANDARD_FEATURES)
+
+    @property
+    def computed(self) -> int:
+        """Number of features actually computed for this frame"""
+        return self._computed
+
+
+def point_angle(a, b, c) -> float:
+    """
+    Angle at b formed by a-b-c in the image plane, from (x, y) pairs
+
+    Returns:
+        Angle in degrees (0-180), 0 if two points coincide
+    """
+    ba = (a[0] - b[0], a[1] - b[1])
+    bc = (c[0] - b[0], c[1] - b[1])
+    if ba == (0, 0) or bc == (0, 0):
+        return 0.0
+    cross = ba[0] * bc[1] - ba[1] * bc[0]
+    dot = ba[0] * bc[0] + ba[1] * bc[1]
+    return float(np.degrees(abs(np.arctan2(cross, dot))))
@@ -0,0 +1,89 @@
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+def interpolate_landmarks(start: np.ndarray, end: np.ndarray, steps: int) -> np.ndarray:
+    """
+    Linearly interpolate landmarks for the frames between two keyframes
+
+    Args:
+        start: (33, 4) landmarks of the earlier keyframe
+        end: (33, 4) landmarks of the later keyframe
+        steps: Number of frames strictly between the two keyframes
+
+    Returns:
+        (steps, 33, 4) landmarks, one entry per in-between frame
+    """
+    if steps <= 0:
+        return np.empty((0,) + start.shape, dtype=np.float32)
+
+    t = np.arange(1, steps + 1, dtype=np.float32) / (steps + 1)
+    return (start[None] + (end - start)[None] * t[:, None, None]).astype(np.float32)
+
+
+class KeyframeScheduler:
+    """
+    Decide which video frames get a full detection pass.
+
+    Every interval-th frame is a keyframe. When a motion threshold is set,
+    a frame is also promoted to keyframe as soon as it differs enough from
+    the last keyframe, measured on a tiny grayscale thumbnail.
+    """
+
+    def __init__(
+        self,
+        interval: int = 1,
+        motion_threshold: float = 0.0,
+        thumbnail_size: tuple = (64, 36)
+    ):
+        """
+        Args:
+            interval: Run detection every interval frames (1 = every frame)
+            motion_threshold: Mean absolute thumbnail difference (0-1) that
+                forces a keyframe, 0 disables adaptive keyframes
+            thumbnail_size: (width, height) of the motion thumbnail
+        """
+        self.interval = max(1, int(interval))
+        self.motion_threshold = motion_threshold
+        self.thumbnail_size = thumbnail_size
+
+        self._frames_since_keyframe = 0
+        self._keyframe_thumbnail: Optional[np.ndarray] = None
+        self._force_next = True
+
+    def _thumbnail(self, frame: np.ndarray) -> np.ndarray:
+        # Resize first so the color conversion only touches a few pixels
+        small = cv2.resize(frame, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def should_detect(self, frame: np.ndarray) -> bool:
+        """Return True if this frame should be a keyframe"""
+        if self.interval == 1:
+            return True
+
+        self._frames_since_keyframe += 1
+        if self._force_next or self._frames_since_keyframe >= self.interval:
+            return True
+
+        if self.motion_threshold > 0 and self._keyframe_thumbnail is not None:
+            diff = cv2.absdiff(self._thumbnail(frame), self._keyframe_thumbnail)
+            if diff.mean() / 255.0 >= self.motion_threshold:
+                return True
+
+        return False
+
+    def mark_keyframe(self, frame: np.ndarray, detected: bool):
+        """
+        Record the outcome of a keyframe detection
+
+        Args:
+            frame: The keyframe's BGR pixels
+            detected: Whether a pose was found. A miss forces the next frame
+                to be a keyframe so tracking is recovered quickly.
+        """
+        self._frames_since_keyframe = 0
+        self._force_next = not detected
+        if self.motion_threshold > 0 and self.interval > 1:
+            self._keyframe_thumbnail = self._thumbnail(frame)
@@ -0,0 +1,238 @@
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.ml.landmark_frame import LANDMARK_INDEX as I
+
+# Joint angles as name -> (a, vertex, c)
+JOINT_ANGLES: Dict[str, tuple] = {
+    'left_knee': (I['left_hip'], I['left_knee'], I['left_ankle']),
+    'right_knee': (I['right_hip'], I['right_knee'], I['right_ankle']),
+    'left_hip': (I['left_shoulder'], I['left_hip'], I['left_knee']),
+    'right_hip': (I['right_shoulder'], I['right_hip'], I['right_knee']),
+    'left_elbow': (I['left_shoulder'], I['left_elbow'], I['left_wrist']),
+    'right_elbow': (I['right_shoulder'], I['right_elbow'], I['right_wrist']),
+    'left_shoulder': (I['left_elbow'], I['left_shoulder'], I['left_hip']),
+    'right_shoulder': (I['right_elbow'], I['right_shoulder'], I['right_hip']),
+    'left_ankle': (I['left_knee'], I['left_ankle'], I['left_foot_index']),
+    'right_ankle': (I['right_knee'], I['right_ankle'], I['right_foot_index']),
+}
+
+# Body segments as name -> (start, end)
+SEGMENTS: Dict[str, tuple] = {
+    'left_upper_arm': (I['left_shoulder'], I['left_elbow']),
+    'right_upper_arm': (I['right_shoulder'], I['right_elbow']),
+    'left_forearm': (I['left_elbow'], I['left_wrist']),
+    'right_forearm': (I['right_elbow'], I['right_wrist']),
+    'left_thigh': (I['left_hip'], I['left_knee']),
+    'right_thigh': (I['right_hip'], I['right_knee']),
+    'left_shin': (I['left_knee'], I['left_ankle']),
+    'right_shin': (I['right_knee'], I['right_ankle']),
+    'shoulder_width': (I['left_shoulder'], I['right_shoulder']),
+    'hip_width': (I['left_hip'], I['right_hip']),
+}
+
+_ANGLE_NAMES = list(JOINT_ANGLES)
+_ANGLE_IDX = np.array([JOINT_ANGLES[name] for name in _ANGLE_NAMES])
+_SEGMENT_NAMES = list(SEGMENTS)
+_SEGMENT_IDX = np.array([SEGMENTS[name] for name in _SEGMENT_NAMES])
+
+
+def joint_angles(landmarks: np.ndarray) -> np.ndarray:
+    """
+    Every joint angle of every frame in one pass
+
+    Args:
+        landmarks: (N, 33, 4) landmark tensor
+
+    Returns:
+        (N, len(JOINT_ANGLES)) angles in degrees (0-180), columns in JOINT_ANGLES order
+    """
+    xy = landmarks[..., :2].astype(np.float64)
+    a = xy[:, _ANGLE_IDX[:, 0]]
+    b = xy[:, _ANGLE_IDX[:, 1]]
+    c = xy[:, _ANGLE_IDX[:, 2]]
+    ba = a - b
+    bc = c - b
+    # atan2 of cross and dot is stable near 0 and 180 degrees, unlike acos
+    cross = ba[..., 0] * bc[..., 1] - ba[..., 1] * bc[..., 0]
+    dot = (ba * bc).sum(axis=-1)
+    return np.degrees(np.abs(np.arctan2(cross, dot)))
+
+
+def back_angle(landmarks: np.ndarray) -> np.ndarray:
+    """
+    Spine lean from vertical for every frame, 0 degrees = perfectly vertical
+
+    Args:
+        landmarks: (N, 33, 4) landmark tensor
+
+    Returns:
+        (N,) angles in degrees
+    """
+    xy = landmarks[..., :2].astype(np.float64)
+    shoulder_mid = (xy[:, I['left_shoulder']] + xy[:, I['right_shoulder']]) / 2
+    hip_mid = (xy[:, I['left_hip']] + xy[:, I['right_hip']]) / 2
+    dx, dy = (shoulder_mid - hip_mid).T
+    return np.degrees(np.arctan2(np.abs(dx), np.abs(dy)))
+
+
+def segment_lengths(landmarks: np.ndarray) -> np.ndarray:
+    """
+    Image-plane length of every body segment in every frame
+
+    Returns:
+        (N, len(SEGMENTS)) lengths in normalized units, columns in SEGMENTS order
+    """
+    xy = landmarks[..., :2].astype(np.float64)
+    return np.linalg.norm(xy[:, _SEGMENT_IDX[:, 1]] - xy[:, _SEGMENT_IDX[:, 0]], axis=-1)
+
+
+def derivative(values: np.ndarray, timestamps: np.ndarray) -> np.ndarray:
+    """
+    Time derivative along the frame axis, tolerant of uneven frame spacing
+
+    Args:
+        values: (N, ...) series
+        timestamps: (N,) seconds
+
+    Returns:
+        (N, ...) rate of change per second, zeros when fewer than 2 frames
+    """
+    if len(values) < 2:
+        return np.zeros_like(values, dtype=np.float64)
+    return np.gradient(values, timestamps, axis=0)
+
+
+def frame_displacement(landmarks: np.ndarray) -> np.ndarray:
+    """
+    Mean 3D landmark movement between consecutive frames
+
+    Returns:
+        (N,) movement per frame, 0 for the first frame
+    """
+    if len(landmarks) < 2:
+        return np.zeros(len(landmarks))
+    steps = np.linalg.norm(np.diff(landmarks[..., :3].astype(np.float64), axis=0), axis=-1)
+    return np.concatenate(([0.0], steps.mean(axis=1)))
+
+
+@dataclass
+class Kinematics:
+    """Per-frame kinematics of a whole clip, every array indexed by frame"""
+    timestamps: np.ndarray
+    angles: np.ndarray  # (N, A) degrees
+    back_angle: np.ndarray  # (N,) degrees
+    angular_velocity: np.ndarray  # (N, A) degrees / second
+    angular_acceleration: np.ndarray  # (N, A) degrees / second^2
+    segment_lengths: np.ndarray  # (N, S)
+    landmark_velocity: np.ndarray  # (N, 33, 3) normalized units / second
+    displacement: np.ndarray  # (N,) mean landmark movement since the previous frame
+    angle_names: List[str] = field(default_factory=lambda: list(_ANGLE_NAMES))
+    segment_names: List[str] = field(default_factory=lambda: list(_SEGMENT_NAMES))
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _series(self) -> List[str]:
+        """Names of the per-frame array fields"""
+        return [f.name for f in fields(self) if f.name not in ('angle_names', 'segment_names')]
+
+    def select(self, start: int, stop: int) -> "Kinematics":
+        """Kinematics of the frames [start, stop)"""
+        return replace(self, **{name: getattr(self, name)[start:stop] for name in self._series()})
+
+    def without_landmarks(self) -> "Kinematics":
+        """
+        Drop the per-landmark velocities, by far the largest series
+
+        Summaries, timelines and rep counting only use the per-joint series.
+        """
+        return replace(self, landmark_velocity=self.landmark_velocity[:, :0])
+
+    @classmethod
+    def concatenate(cls, parts: List["Kinematics"]) -> "Kinematics":
+        """Join the kinematics of consecutive stretches of frames"""
+        first = parts[0]
+        return replace(first, **{
+            name: np.concatenate([getattr(part, name) for part in parts]) for name in first._series()
+        })
+
+    def angle(self, name: str) -> np.ndarray:
+        """(N,) series of one joint angle"""
+        return self.angles[:, self.angle_names.index(name)]
+
+    def frame_angles(self, index: int) -> Dict[str, float]:
+        """Angles of one frame as the dict scorers take"""
+        angles = dict(zip(self.angle_names, self.angles[index].tolist()))
+        angles['back'] = float(self.back_angle[index])
+        return angles
+
+    def stable_frames(self, threshold: float = 0.05) -> np.ndarray:
+        """(N,) True where the pose barely moved since the previous frame"""
+        return self.displacement < threshold
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Range of motion and peak speed per joint"""
+        if len(self) == 0:
+            return {}
+        speed = np.abs(self.angular_velocity)
+        return {
+            name: {
+                'min': round(float(self.angles[:, i].min()), 1),
+                'max': round(float(self.angles[:, i].max()), 1),
+                'mean': round(float(self.angles[:, i].mean()), 1),
+                'range_of_motion': round(float(np.ptp(self.angles[:, i])), 1),
+                'peak_velocity': round(float(speed[:, i].max()), 1)
+            }
+            for i, name in enumerate(self.angle_names)
+        }
+
+    def timeline(self, max_points: Optional[int] = None) -> Dict[str, list]:
+        """
+        JSON-friendly angle timeline
+
+        Args:
+            max_points: Downsample to at most this many evenly spaced frames
+
+        Returns:
+            Dict of timestamps plus one rounded angle series per joint
+        """
+        index = np.arange(len(self))
+        if max_points and len(self) > max_points:
+            index = np.linspace(0, len(self) - 1, max_points).round().astype(int)
+
+        timeline = {'timestamp': np.round(self.timestamps[index], 3).tolist()}
+        for i, name in enumerate(self.angle_names):
+            timeline[name] = np.round(self.angles[index, i], 1).tolist()
+        timeline['back'] = np.round(self.back_angle[index], 1).tolist()
+        return timeline
+
+
+def compute_kinematics(landmarks: np.ndarray, timestamps: np.ndarray) -> Kinematics:
+    """
+    Compute every angle, segment length, velocity and acceleration of a clip in one call
+
+    Args:
+        landmarks: (N, 33, 4) landmark tensor, frames in time order
+        timestamps: (N,) frame times in seconds
+
+    Returns:
+        Kinematics for all N frames
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, 33, 4)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+
+    angles = joint_angles(landmarks)
+    angular_velocity = derivative(angles, timestamps)
+    return Kinematics(
+        timestamps=timestamps,
+        angles=angles,
+        back_angle=back_angle(landmarks),
+        angular_velocity=angular_velocity,
+        angular_acceleration=derivative(angular_velocity, timestamps),
+        segment_lengths=segment_lengths(landmarks),
+        landmark_velocity=derivative(landmarks[..., :3].astype(np.float64), timestamps),
+        displacement=frame_displacement(landmarks)
+    )
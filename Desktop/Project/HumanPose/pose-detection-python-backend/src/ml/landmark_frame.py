@@ -0,0 +1,144 @@
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+LANDMARK_NAMES = [
+    'nose', 'left_eye_inner', 'left_eye', 'left_eye_outer',
+    'right_eye_inner', 'right_eye', 'right_eye_outer',
+    'left_ear', 'right_ear', 'mouth_left', 'mouth_right',
+    'left_shoulder', 'right_shoulder', 'left_elbow', 'right_elbow',
+    'left_wrist', 'right_wrist', 'left_pinky', 'right_pinky',
+    'left_index', 'right_index', 'left_thumb', 'right_thumb',
+    'left_hip', 'right_hip', 'left_knee', 'right_knee',
+    'left_ankle', 'right_ankle', 'left_heel', 'right_heel',
+    'left_foot_index', 'right_foot_index'
+]
+
+# Shared name -> row lookup
+LANDMARK_INDEX: Dict[str, int] = {name: idx for idx, name in enumerate(LANDMARK_NAMES)}
+
+NUM_LANDMARKS = len(LANDMARK_NAMES)
+
+# Columns of the landmark array
+X, Y, Z, VISIBILITY = 0, 1, 2, 3
+
+LandmarkKey = Union[int, str]
+
+
+class LandmarkFrame:
+    """
+    One frame of pose landmarks backed by a (33, 4) float32 array.
+
+    Rows follow MediaPipe's landmark order and columns are x, y, z,
+    visibility. Landmarks are addressed by index or by name through the
+    shared LANDMARK_INDEX table. Scorers and angle code read the array
+    directly; dict/list views are only built at the API boundary.
+    """
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: np.ndarray):
+        """
+        Args:
+            data: (33, 4) array of x, y, z, visibility (used as-is when already float32)
+        """
+        self.data = np.asarray(data, dtype=np.float32)
+
+    @classmethod
+    def from_mediapipe(cls, pose_landmarks) -> "LandmarkFrame":
+        """Fill a frame from MediaPipe pose landmarks in a single pass"""
+        values = np.fromiter(
+            (v for lm in pose_landmarks.landmark for v in (lm.x, lm.y, lm.z, lm.visibility)),
+            dtype=np.float32,
+            count=NUM_LANDMARKS * 4
+        )
+        return cls(values.reshape(NUM_LANDMARKS, 4))
+
+    @classmethod
+    def from_dict(cls, landmarks_dict: Dict[str, Dict[str, float]]) -> "LandmarkFrame":
+        """Rebuild a frame from the named dict sent to the frontend"""
+        data = np.zeros((NUM_LANDMARKS, 4), dtype=np.float32)
+        for name, lm in landmarks_dict.items():
+            idx = LANDMARK_INDEX.get(name)
+            if idx is not None and lm:
+                data[idx] = (lm['x'], lm['y'], lm.get('z') or 0.0, lm.get('visibility', 0.0))
+        return cls(data)
+
+    @staticmethod
+    def index(key: LandmarkKey) -> int:
+        """Resolve a landmark name or index to its row"""
+        return LANDMARK_INDEX[key] if isinstance(key, str) else key
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, key: LandmarkKey) -> np.ndarray:
+        """Row view of x, y, z, visibility for one landmark"""
+        return self.data[self.index(key)]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.data if dtype is None else self.data.astype(dtype)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self.data[:, X]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self.data[:, Y]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self.data[:, Z]
+
+    @property
+    def visibility(self) -> np.ndarray:
+        return self.data[:, VISIBILITY]
+
+    def point(self, key: LandmarkKey) -> np.ndarray:
+        """(x, y) of one landmark"""
+        return self.data[self.index(key), :2]
+
+    def is_visible(self, key: LandmarkKey, threshold: float = 0.5) -> bool:
+        """Check if a landmark is visible above threshold"""
+        return bool(self.data[self.index(key), VISIBILITY] >= threshold)
+
+    def midpoint(self, a: LandmarkKey, b: LandmarkKey) -> np.ndarray:
+        """(x, y) halfway between two landmarks"""
+        return (self.point(a) + self.point(b)) / 2
+
+    def angle(self, a: LandmarkKey, b: LandmarkKey, c: LandmarkKey) -> float:
+        """
+        Angle at b formed by a-b-c in the image plane
+
+        Returns:
+            Angle in degrees (0-180), 0 if two points coincide
+        """
+        ba = self.point(a) - self.point(b)
+        bc = self.point(c) - self.point(b)
+        norms = float(np.linalg.norm(ba) * np.linalg.norm(bc))
+        if norms == 0:
+            return 0.0
+        cos_angle = np.clip(np.dot(ba, bc) / norms, -1.0, 1.0)
+        return float(np.degrees(np.arccos(cos_angle)))
+
+    def to_dict(self) -> Dict[str, Dict[str, float]]:
+        """Named dict view for API responses"""
+        return {
+            name: {'x': x, 'y': y, 'z': z, 'visibility': visibility}
+            for name, (x, y, z, visibility) in zip(LANDMARK_NAMES, self.data.tolist())
+        }
+
+    def to_list(self) -> List[Dict[str, float]]:
+        """List-of-dicts view with ids, for API responses"""
+        return [
+            {'id': idx, 'name': name, 'x': x, 'y': y, 'z': z, 'visibility': visibility}
+            for idx, (name, (x, y, z, visibility)) in enumerate(zip(LANDMARK_NAMES, self.data.tolist()))
+        ]
+
+
+def as_frame(landmarks: Optional[Union["LandmarkFrame", np.ndarray]]) -> Optional[LandmarkFrame]:
+    """Wrap an array as a LandmarkFrame without copying, passing frames and None through"""
+    if landmarks is None or isinstance(landmarks, LandmarkFrame):
+        return landmarks
+    return LandmarkFrame(landmarks)
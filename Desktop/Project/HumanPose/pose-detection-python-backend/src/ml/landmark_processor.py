@@ -1,5 +1,6 @@
 import math
 from typing import List, Tuple
+from src.ml.features import point_angle
 from src.models.pose import Keypoint, PoseAngles
 
 
@@ -40,29 +41,7 @@ class LandmarkProcessor:
         Returns:
             Angle in degrees (0-180)
         """
-        # Calculate vectors
-        ba = (a.x - b.x, a.y - b.y)
-        bc = (c.x - b.x, c.y - b.y)
-        
-        # Calculate angle using dot product
-        dot_product = ba[0] * bc[0] + ba[1] * bc[1]
-        
-        # Calculate magnitudes
-        magnitude_ba = math.sqrt(ba[0]**2 + ba[1]**2)
-        magnitude_bc = math.sqrt(bc[0]**2 + bc[1]**2)
-        
-        # Avoid division by zero
-        if magnitude_ba == 0 or magnitude_bc == 0:
-            return 0.0
-        
-        # Calculate angle
-        cos_angle = dot_product / (magnitude_ba * magnitude_bc)
-        cos_angle = max(-1.0, min(1.0, cos_angle))  # Clamp to [-1, 1]
-        
-        angle = math.acos(cos_angle)
-        angle_degrees = math.degrees(angle)
-        
-        return angle_degrees
+        return point_angle((a.x, a.y), (b.x, b.y), (c.x, c.y))
     
     @classmethod
     def extract_squat_angles(cls, keypoints: List[Keypoint]) -> PoseAngles:
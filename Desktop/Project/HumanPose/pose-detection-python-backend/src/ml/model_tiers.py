@@ -0,0 +1,49 @@
+from typing import Optional, Union
+
+from src.config import settings
+
+# MediaPipe model_complexity per quality tier
+MODEL_TIERS = {
+    'lite': 0,
+    'full': 1,
+    'heavy': 2
+}
+
+TIER_NAMES = {complexity: name for name, complexity in MODEL_TIERS.items()}
+
+
+def resolve_tier(quality: Optional[Union[str, int]] = None) -> int:
+    """
+    Resolve a requested quality to a MediaPipe model complexity
+
+    Args:
+        quality: Tier name ('lite', 'full', 'heavy'), complexity (0-2) or
+            None for the configured POSE_MODEL_COMPLEXITY
+
+    Returns:
+        Model complexity (0, 1 or 2)
+
+    Raises:
+        ValueError if the quality is not a known tier
+    """
+    if quality is None or quality == "":
+        return settings.POSE_MODEL_COMPLEXITY
+
+    if isinstance(quality, str):
+        value = quality.lower().strip()
+        if value in MODEL_TIERS:
+            return MODEL_TIERS[value]
+        if value.isdigit():
+            quality = int(value)
+
+    if isinstance(quality, int) and quality in TIER_NAMES:
+        return quality
+
+    raise ValueError(
+        f"Invalid quality '{quality}'. Supported: {', '.join(MODEL_TIERS)}"
+    )
+
+
+def tier_name(complexity: int) -> str:
+    """Return the tier name for a model complexity"""
+    return TIER_NAMES.get(complexity, str(complexity))
@@ -0,0 +1,143 @@
+from typing import Optional
+
+import cv2
+import numpy as np
+
+
+class LandmarkFlowTracker:
+    """
+    Carry landmarks forward between detector runs with sparse Lucas-Kanade flow.
+
+    After each detection the tracker is re-seeded with the detected
+    landmarks. On following frames the visible landmarks are moved along
+    the optical flow; update() returns None when the flow is no longer
+    trustworthy, which is the caller's cue to run the detector again.
+    """
+
+    def __init__(
+        self,
+        max_error: float = 12.0,
+        min_tracked_ratio: float = 0.8,
+        min_visibility: float = 0.5,
+        max_tracked_frames: int = 10,
+        max_side: int = 480
+    ):
+        """
+        Args:
+            max_error: Highest mean Lucas-Kanade error accepted for tracked points
+            min_tracked_ratio: Fraction of visible landmarks that must be tracked
+            min_visibility: Visibility needed for a landmark to be tracked at all
+            max_tracked_frames: Frames to track before forcing a fresh detection
+            max_side: Frames are downscaled to this longest side before computing flow
+        """
+        self.max_error = max_error
+        self.min_tracked_ratio = min_tracked_ratio
+        self.min_visibility = min_visibility
+        self.max_tracked_frames = max_tracked_frames
+        self.max_side = max_side
+
+        self.landmarks: Optional[np.ndarray] = None
+        self.tracked_frames = 0
+        self.detected_frames = 0
+        self._prev_gray: Optional[np.ndarray] = None
+        self._last_gray: Optional[np.ndarray] = None
+        self._last_frame_id: Optional[int] = None
+        self._frames_since_detection = 0
+        self._lk_params = dict(
+            winSize=(21, 21),
+            maxLevel=3,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03)
+        )
+
+    def _gray(self, frame: np.ndarray) -> np.ndarray:
+        height, width = frame.shape[:2]
+        scale = self.max_side / max(height, width)
+        if scale < 1:
+            frame = cv2.resize(frame, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+    def update(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Propagate the last landmarks onto a new frame
+
+        Args:
+            frame: BGR frame following the previous update or reset
+
+        Returns:
+            (33, 4) landmarks moved along the flow, or None if detection is needed
+        """
+        gray = self._gray(frame)
+        # Kept so a reset() on this same frame doesn't convert it again
+        self._last_gray = gray
+        self._last_frame_id = id(frame)
+
+        if self.landmarks is None or self._prev_gray is None:
+            return None
+        if self._frames_since_detection >= self.max_tracked_frames:
+            return None
+
+        visible = self.landmarks[:, 3] >= self.min_visibility
+        if not visible.any():
+            return None
+
+        height, width = gray.shape
+        points = self.landmarks[visible, :2] * (width, height)
+        next_points, status, error = cv2.calcOpticalFlowPyrLK(
+            self._prev_gray,
+            gray,
+            points.reshape(-1, 1, 2).astype(np.float32),
+            None,
+            **self._lk_params
+        )
+        next_points = next_points.reshape(-1, 2)
+        tracked = status.reshape(-1) == 1
+        tracked &= (next_points[:, 0] >= 0) & (next_points[:, 0] < width)
+        tracked &= (next_points[:, 1] >= 0) & (next_points[:, 1] < height)
+
+        if tracked.mean() < self.min_tracked_ratio:
+            return None
+        if error.reshape(-1)[tracked].mean() > self.max_error:
+            return None
+
+        landmarks = self.landmarks.copy()
+        moved = landmarks[visible]
+        moved[tracked, 0] = next_points[tracked, 0] / width
+        moved[tracked, 1] = next_points[tracked, 1] / height
+        # Points the flow lost are no longer trusted
+        moved[~tracked, 3] = 0.0
+        landmarks[visible] = moved
+
+        self.landmarks = landmarks
+        self._prev_gray = gray
+        self._frames_since_detection += 1
+        self.tracked_frames += 1
+        return landmarks
+
+    def reset(self, frame: np.ndarray, landmarks: Optional[np.ndarray]):
+        """
+        Re-seed the tracker with freshly detected landmarks
+
+        Args:
+            frame: The BGR frame the landmarks were detected on
+            landmarks: (33, 4) detected landmarks, or None if no pose was found
+        """
+        self.detected_frames += 1
+        self._frames_since_detection = 0
+        if landmarks is None:
+            self.landmarks = None
+            self._prev_gray = None
+            return
+
+        if self._last_gray is not None and self._last_frame_id == id(frame):
+            gray = self._last_gray
+        else:
+            gray = self._gray(frame)
+        self.landmarks = landmarks.astype(np.float32, copy=True)
+        self._prev_gray = gray
+
+    def stats(self) -> dict:
+        """Return tracked versus detected frame counts"""
+        return {
+            "tracked": self.tracked_frames,
+            "detected": self.detected_frames
+        }
@@ -1,7 +1,18 @@
 import cv2
 import mediapipe as mp
+import numpy as np
 import ssl
 import certifi
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+from src.config import settings
+from src.ml.backends import InferenceBackend, backend_tier, create_backend, model_name
+from src.ml.landmark_frame import LandmarkFrame, as_frame
+from src.ml.optical_flow import LandmarkFlowTracker
+from src.ml.roi import RoiCropper
+from src.ml.skeleton_renderer import skeleton_renderer
+from src.ml.smoothing import create_filter
+from src.ml.tracker_registry import tracker_registry
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -12,64 +23,242 @@ class PoseDetector:
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
-        # For static images - use model_complexity=1 to avoid download issues
-        self.static_pose = self.mp_pose.Pose(
-            static_image_mode=True,
-            model_complexity=1,  # Changed from 2 to 1 to use lighter model
-            min_detection_confidence=0.5
-        )
+        # For static images - one inference backend per model tier, built on first use
+        # (the heavy model is downloaded by MediaPipe the first time it is needed).
+        # Exported-model backends run one model for every tier and share one entry.
+        self._backends: Dict[Optional[int], InferenceBackend] = {}
+        self._backend_lock = threading.Lock()
+        # Backends are not thread-safe: calls into one backend are serialized on its own lock
+        self._inference_locks: Dict[Optional[int], threading.Lock] = {}
         
-        # For video streams
-        self.stream_pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+        # For video streams - one tracking graph leased per session
+        self.trackers = tracker_registry
+        
+        # Crop video frames to the previous pose instead of processing the full frame
+        self.roi = RoiCropper(
+            padding=settings.ROI_PADDING,
+            input_size=settings.ROI_INPUT_SIZE,
+            min_visibility=settings.ROI_MIN_VISIBILITY
+        ) if settings.ROI_ENABLED else None
         
         logger.info("PoseDetector initialized")
 
-    def process_image(self, image):
-        """Process a single image"""
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        return self.static_pose.process(image_rgb)
+    def get_backend(self, complexity: Optional[int] = None) -> InferenceBackend:
+        """Get the static-image backend for a model tier, building it if needed"""
+        if complexity is None:
+            complexity = settings.POSE_MODEL_COMPLEXITY
+        key = backend_tier(complexity)
+
+        with self._backend_lock:
+            backend = self._backends.get(key)
+            if backend is None:
+                backend = create_backend(complexity=complexity)
+                self._backends[key] = backend
+                self._inference_locks[key] = threading.Lock()
+                logger.info(f"Built {backend.name} backend for '{model_name(complexity)}'")
+            return backend
+
+    def _locked_backend(self, complexity: Optional[int]) -> Tuple[InferenceBackend, threading.Lock]:
+        """Get a tier's backend together with the lock its calls must hold"""
+        if complexity is None:
+            complexity = settings.POSE_MODEL_COMPLEXITY
+        backend = self.get_backend(complexity)
+        return backend, self._inference_locks[backend_tier(complexity)]
+
+    def process_image(self, image, complexity: Optional[int] = None) -> Optional[np.ndarray]:
+        """Detect landmarks in a single image"""
+        backend, lock = self._locked_backend(complexity)
+        with lock:
+            return backend.detect(image)
+
+    def detect_batch(
+        self,
+        images: Sequence[np.ndarray],
+        complexity: Optional[int] = None
+    ) -> List[Optional[np.ndarray]]:
+        """Detect landmarks in several standalone images, in one call when the backend batches"""
+        backend, lock = self._locked_backend(complexity)
+        with lock:
+            return backend.detect_batch(images)
 
-    def process_frame(self, frame):
-        """Process a video frame"""
+    def process_frame(self, frame, session_id: str, complexity: Optional[int] = None):
+        """
+        Run a video frame through the session's tracking graph
+
+        Args:
+            frame: BGR video frame
+            session_id: Session whose tracking graph should be used
+            complexity: Model tier, defaults to POSE_MODEL_COMPLEXITY
+        """
         frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        return self.stream_pose.process(frame_rgb)
+        return self.trackers.process(session_id, frame_rgb, complexity)
+
+    def detect_frame(
+        self,
+        frame,
+        session_id: Optional[str] = None,
+        complexity: Optional[int] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Detect landmarks in a video frame, cropping to the previous pose when possible
+
+        Args:
+            frame: BGR video frame
+            session_id: Session whose tracking graph and previous pose are used
+            complexity: Model tier, defaults to POSE_MODEL_COMPLEXITY
+
+        Returns:
+            (33, 4) full-frame normalized landmarks or None if no pose found
+        """
+        if session_id is None:
+            return self.process_image(frame, complexity)
+
+        with self.trackers.use(session_id, complexity) as tracker:
+            return self._detect_tracked(tracker, frame)
+
+    def _detect_tracked(self, tracker, frame) -> Optional[np.ndarray]:
+        """
+        Detect landmarks with a pinned tracker, see detect_frame
+
+        Each frame gets exactly one inference. Crops around the previous
+        pose go through the tracker's crop graph, since the full-frame
+        tracking graph keeps state between calls and must only ever see
+        full frames. Both are tracking graphs of the session's own, so
+        crops neither run the person detector on every frame nor wait on
+        other sessions. When the crop loses the pose the frame reports none
+        and the next frame goes back to the full frame on a freshly reset
+        tracking graph; the crop graph starts afresh with the next crop.
+        """
+        frame_height, frame_width = frame.shape[:2]
+
+        landmarks = None
+        box = None
+        if self.roi is not None and tracker.last_landmarks is not None:
+            box = self.roi.compute_box(tracker.last_landmarks, frame_width, frame_height)
+
+        if box is not None:
+            crop = cv2.cvtColor(self.roi.crop(frame, box), cv2.COLOR_BGR2RGB)
+            results = tracker.process_crop(crop)
+            crop_landmarks = None
+            if results and results.pose_landmarks:
+                crop_landmarks = self.landmarks_to_array(results.pose_landmarks)
+            if self.roi.is_confident(crop_landmarks):
+                landmarks = self.roi.to_full_frame(crop_landmarks, box, frame_width, frame_height)
+            tracker.roi_frames += 1
+            if landmarks is None:
+                # The graph last saw a frame before the crops took over
+                tracker.reset_graph()
+        else:
+            # Whatever the crop graph tracked is gone by the next crop
+            tracker.reset_crop_graph()
+            results = tracker.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if results and results.pose_landmarks:
+                landmarks = self.landmarks_to_array(results.pose_landmarks)
+            tracker.full_frames += 1
+
+        tracker.last_landmarks = landmarks
+        return landmarks
+
+    def track_frame(
+        self,
+        frame,
+        session_id: str,
+        complexity: Optional[int] = None
+    ) -> Tuple[Optional[np.ndarray], str]:
+        """
+        Propagate the session's landmarks with optical flow, detecting only when needed
+
+        Args:
+            frame: BGR video frame
+            session_id: Session whose tracking state is used
+            complexity: Model tier, defaults to POSE_MODEL_COMPLEXITY
+
+        Returns:
+            Tuple of (33, 4) landmarks or None, and "tracked" or "detected"
+        """
+        with self.trackers.use(session_id, complexity) as tracker:
+            if tracker.flow is None:
+                tracker.flow = LandmarkFlowTracker(
+                    max_error=settings.OPTICAL_FLOW_MAX_ERROR,
+                    min_tracked_ratio=settings.OPTICAL_FLOW_MIN_TRACKED_RATIO,
+                    min_visibility=settings.OPTICAL_FLOW_MIN_VISIBILITY,
+                    max_tracked_frames=settings.OPTICAL_FLOW_MAX_TRACKED_FRAMES
+                )
+
+            landmarks = tracker.flow.update(frame)
+            if landmarks is not None:
+                tracker.last_landmarks = landmarks
+                return landmarks, "tracked"
+
+            landmarks = self._detect_tracked(tracker, frame)
+            tracker.flow.reset(frame, landmarks)
+            return landmarks, "detected"
+
+    def smooth_landmarks(self, session_id: str, landmarks: Optional[np.ndarray], timestamp: float) -> Optional[np.ndarray]:
+        """
+        Run landmarks through the session's temporal filter
+
+        The raw landmarks stay the tracker's reference for cropping and
+        optical flow; only the returned copy is smoothed.
+
+        Args:
+            session_id: Session whose filter state is used
+            landmarks: (33, 4) raw landmarks, None resets the filter
+            timestamp: Frame time in seconds
+
+        Returns:
+            Smoothed (33, 4) landmarks, the input when smoothing is off
+        """
+        with self.trackers.use(session_id, create=False) as tracker:
+            if tracker is None:
+                return landmarks
+            if tracker.smoother is None:
+                tracker.smoother = create_filter()
+                if tracker.smoother is None:
+                    return landmarks
+            if landmarks is None:
+                tracker.smoother.reset()
+                return None
+            return tracker.smoother.update(landmarks, timestamp)
+
+    def tracking_stats(self, session_id: str) -> Dict[str, int]:
+        """Return tracked versus detected frame counts for a session"""
+        tracker = self.trackers.get(session_id)
+        if tracker is None or tracker.flow is None:
+            return {"tracked": 0, "detected": 0}
+        return tracker.flow.stats()
+
+    def release_tracker(self, session_id: str):
+        """Return the session's tracking graph to the idle pool"""
+        self.trackers.release(session_id)
+
+    @staticmethod
+    def landmarks_to_array(pose_landmarks) -> np.ndarray:
+        """Convert MediaPipe pose landmarks to a (33, 4) array of x, y, z, visibility"""
+        return LandmarkFrame.from_mediapipe(pose_landmarks).data
 
     def get_landmarks_dict(self, landmarks):
-        """Convert landmarks to dictionary"""
-        if not landmarks:
+        """Convert a (33, 4) landmark array or LandmarkFrame to dictionary"""
+        if landmarks is None or len(landmarks) == 0:
             return {}
-        
-        landmark_names = [
-            'nose', 'left_eye_inner', 'left_eye', 'left_eye_outer',
-            'right_eye_inner', 'right_eye', 'right_eye_outer',
-            'left_ear', 'right_ear', 'mouth_left', 'mouth_right',
-            'left_shoulder', 'right_shoulder', 'left_elbow', 'right_elbow',
-            'left_wrist', 'right_wrist', 'left_pinky', 'right_pinky',
-            'left_index', 'right_index', 'left_thumb', 'right_thumb',
-            'left_hip', 'right_hip', 'left_knee', 'right_knee',
-            'left_ankle', 'right_ankle', 'left_heel', 'right_heel',
-            'left_foot_index', 'right_foot_index'
-        ]
-        
-        result = {}
-        for idx, landmark in enumerate(landmarks.landmark):
-            if idx < len(landmark_names):
-                result[landmark_names[idx]] = {
-                    'x': landmark.x,
-                    'y': landmark.y,
-                    'z': landmark.z,
-                    'visibility': landmark.visibility
-                }
-        return result
-
-    def draw_landmarks(self, image, landmarks_dict):
-        """Draw landmarks on image - requires mediapipe landmark object"""
-        # Since we're receiving a dict, we need to convert it back or skip drawing
-        # For now, return the original image
-        # You can enhance this later to draw from the dictionary
-        return image
\ No newline at end of file
+        return as_frame(landmarks).to_dict()
+
+    @staticmethod
+    def landmarks_dict_to_array(landmarks_dict) -> np.ndarray:
+        """Convert a named landmark dict back to a (33, 4) array"""
+        return LandmarkFrame.from_dict(landmarks_dict).data
+
+    def draw_landmarks(self, image, landmarks):
+        """
+        Draw the pose skeleton on an image in place
+
+        Args:
+            image: BGR image or video frame
+            landmarks: (33, 4) landmark array, LandmarkFrame or named landmark dict
+
+        Returns:
+            The annotated image
+        """
+        if isinstance(landmarks, dict):
+            landmarks = self.landmarks_dict_to_array(landmarks)
+        return skeleton_renderer.draw(image, np.asarray(landmarks))
\ No newline at end of file
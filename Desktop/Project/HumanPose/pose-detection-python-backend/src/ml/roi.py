@@ -0,0 +1,126 @@
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Pixel box as (x0, y0, x1, y1), x1/y1 exclusive
+Box = Tuple[int, int, int, int]
+
+
+class RoiCropper:
+    """
+    Crop a frame to the region around the previous pose.
+
+    The padded bounding box of the last frame's landmarks is cut out of the
+    full frame and downscaled to the model input size, so the model only
+    looks at the pixels around the person. Landmarks found
+    in the crop are mapped back to full-frame normalized coordinates.
+    """
+
+    def __init__(
+        self,
+        padding: float = 0.25,
+        input_size: int = 256,
+        min_visibility: float = 0.5,
+        min_visible_landmarks: int = 8
+    ):
+        """
+        Args:
+            padding: Margin added on each side, as a fraction of the box's longest side
+            input_size: Longest side of the crop handed to the model
+            min_visibility: Visibility needed for a landmark to count as found
+            min_visible_landmarks: Landmarks that must be visible to trust a pose
+        """
+        self.padding = padding
+        self.input_size = input_size
+        self.min_visibility = min_visibility
+        self.min_visible_landmarks = min_visible_landmarks
+
+    def is_confident(self, landmarks: Optional[np.ndarray]) -> bool:
+        """Check that enough landmarks are visible to trust the pose"""
+        if landmarks is None:
+            return False
+        visible = np.count_nonzero(landmarks[:, 3] >= self.min_visibility)
+        return visible >= self.min_visible_landmarks
+
+    def compute_box(self, landmarks: np.ndarray, frame_width: int, frame_height: int) -> Optional[Box]:
+        """
+        Compute a padded, square pixel box around the visible landmarks
+
+        Args:
+            landmarks: (33, 4) full-frame normalized landmarks of the previous frame
+            frame_width: Frame width in pixels
+            frame_height: Frame height in pixels
+
+        Returns:
+            Box clipped to the frame, or None if the pose is not trustworthy
+        """
+        if not self.is_confident(landmarks):
+            return None
+
+        visible = landmarks[landmarks[:, 3] >= self.min_visibility]
+        xs = visible[:, 0] * frame_width
+        ys = visible[:, 1] * frame_height
+
+        center_x = (xs.min() + xs.max()) / 2
+        center_y = (ys.min() + ys.max()) / 2
+        side = max(xs.max() - xs.min(), ys.max() - ys.min())
+        side *= 1 + 2 * self.padding
+        half = side / 2
+
+        x0 = int(max(0, center_x - half))
+        y0 = int(max(0, center_y - half))
+        x1 = int(min(frame_width, center_x + half))
+        y1 = int(min(frame_height, center_y + half))
+
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            return None
+        return x0, y0, x1, y1
+
+    def crop(self, frame: np.ndarray, box: Box) -> np.ndarray:
+        """
+        Cut the box out of a BGR frame and downscale it to the model size
+
+        Args:
+            frame: Full BGR frame
+            box: Pixel box from compute_box
+
+        Returns:
+            BGR crop whose longest side is at most input_size
+        """
+        x0, y0, x1, y1 = box
+        region = frame[y0:y1, x0:x1]
+
+        scale = self.input_size / max(x1 - x0, y1 - y0)
+        if scale < 1:
+            region = cv2.resize(
+                region,
+                (max(1, int((x1 - x0) * scale)), max(1, int((y1 - y0) * scale))),
+                interpolation=cv2.INTER_AREA
+            )
+        return region
+
+    @staticmethod
+    def to_full_frame(landmarks: np.ndarray, box: Box, frame_width: int, frame_height: int) -> np.ndarray:
+        """
+        Map crop-normalized landmarks back to full-frame normalized space
+
+        Args:
+            landmarks: (33, 4) landmarks normalized to the crop
+            box: Pixel box the crop was cut from
+            frame_width: Frame width in pixels
+            frame_height: Frame height in pixels
+
+        Returns:
+            (33, 4) landmarks normalized to the full frame
+        """
+        x0, y0, x1, y1 = box
+        box_width = x1 - x0
+        box_height = y1 - y0
+
+        mapped = landmarks.copy()
+        mapped[:, 0] = (landmarks[:, 0] * box_width + x0) / frame_width
+        mapped[:, 1] = (landmarks[:, 1] * box_height + y0) / frame_height
+        # MediaPipe z uses the same scale as x
+        mapped[:, 2] = landmarks[:, 2] * box_width / frame_width
+        return mapped
@@ -0,0 +1,84 @@
+from typing import Optional
+
+import cv2
+import numpy as np
+
+# Same topology as mp.solutions.pose.POSE_CONNECTIONS
+POSE_CONNECTIONS = np.array([
+    (0, 1), (0, 4), (1, 2), (2, 3), (3, 7), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (11, 23), (12, 14), (12, 24), (13, 15), (14, 16),
+    (15, 17), (15, 19), (15, 21), (16, 18), (16, 20), (16, 22), (17, 19),
+    (18, 20), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28), (27, 29),
+    (27, 31), (28, 30), (28, 32), (29, 31), (30, 32)
+], dtype=np.int32)
+
+# BGR colors matching MediaPipe's default pose style
+LINE_COLOR = (224, 224, 224)
+LEFT_COLOR = (0, 138, 255)
+RIGHT_COLOR = (231, 217, 0)
+CENTER_COLOR = (224, 224, 224)
+
+# Landmark indices on the left and right side of the body
+LEFT_LANDMARKS = np.array([1, 2, 3, 7, 9, 11, 13, 15, 17, 19, 21, 23, 25, 27, 29, 31])
+RIGHT_LANDMARKS = np.array([4, 5, 6, 8, 10, 12, 14, 16, 18, 20, 22, 24, 26, 28, 30, 32])
+
+
+class SkeletonRenderer:
+    """
+    Draw a pose skeleton from landmark arrays.
+
+    All connections of one frame go out in a single cv2.polylines call and
+    pixel coordinates for every landmark are computed in one NumPy pass, so
+    rendering needs no MediaPipe protobuf and no second inference.
+    """
+
+    def __init__(self, min_visibility: float = 0.5):
+        self.min_visibility = min_visibility
+
+    def draw(
+        self,
+        image: np.ndarray,
+        landmarks: np.ndarray,
+        thickness: Optional[int] = None,
+        radius: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Draw the skeleton onto an image in place
+
+        Args:
+            image: BGR image or video frame
+            landmarks: (33, 4) normalized landmarks
+            thickness: Line thickness, scaled to the image size by default
+            radius: Landmark dot radius, scaled to the image size by default
+
+        Returns:
+            The same image, annotated
+        """
+        if landmarks is None or len(landmarks) == 0:
+            return image
+
+        height, width = image.shape[:2]
+        scale = max(1, round(min(height, width) / 320))
+        thickness = thickness or 2 * scale
+        radius = radius or 2 * scale + 1
+
+        points = np.rint(landmarks[:, :2] * (width, height)).astype(np.int32)
+        visible = landmarks[:, 3] >= self.min_visibility
+
+        connections = POSE_CONNECTIONS[visible[POSE_CONNECTIONS].all(axis=1)]
+        if len(connections):
+            cv2.polylines(image, list(points[connections]), False, LINE_COLOR, thickness, cv2.LINE_AA)
+
+        for indices, color in (
+            (LEFT_LANDMARKS, LEFT_COLOR),
+            (RIGHT_LANDMARKS, RIGHT_COLOR),
+            (np.array([0]), CENTER_COLOR)
+        ):
+            for x, y in points[indices[visible[indices]]]:
+                cv2.circle(image, (int(x), int(y)), radius, color, -1, cv2.LINE_AA)
+
+        return image
+
+
+# Global instance
+skeleton_renderer = SkeletonRenderer()
@@ -0,0 +1,255 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import numpy as np
+
+from src.config import settings
+
+FILTER_NAMES = ("one_euro", "kalman", "none")
+
+# Used for the first step after a duplicate or out-of-order timestamp
+_DEFAULT_DT = 1 / 30
+
+
+def _alpha(cutoff, dt: float):
+    """Smoothing factor of a first-order low-pass filter, cutoff in Hz (scalar or array)"""
+    tau = 1.0 / (2 * np.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class LandmarkFilter(ABC):
+    """
+    Streaming filter over one session's landmarks.
+
+    Each update smooths x, y and z of all 33 landmarks with a fixed
+    number of array operations; visibility passes through unchanged.
+    State resets by itself after a gap longer than max_gap seconds.
+    """
+
+    def __init__(self, max_gap: float = 1.0):
+        self.max_gap = max_gap
+        self._t: Optional[float] = None
+
+    def reset(self):
+        """Forget the filter state, e.g. when the person left the frame"""
+        self._t = None
+
+    def update(self, landmarks: np.ndarray, timestamp: float) -> np.ndarray:
+        """
+        Smooth one frame
+
+        Args:
+            landmarks: (33, 4) raw landmarks
+            timestamp: Frame time in seconds
+
+        Returns:
+            (33, 4) float32 smoothed landmarks (a new array)
+        """
+        points = np.asarray(landmarks, dtype=np.float64)[:, :3]
+        if self._t is None or timestamp - self._t > self.max_gap:
+            self._init(points, landmarks)
+        else:
+            dt = timestamp - self._t
+            self._step(points, landmarks, dt if dt > 0 else _DEFAULT_DT)
+        self._t = timestamp
+
+        smoothed = np.array(landmarks, dtype=np.float32)
+        smoothed[:, :3] = self._position()
+        return smoothed
+
+    @abstractmethod
+    def _init(self, points: np.ndarray, landmarks: np.ndarray):
+        """Start from a measurement"""
+
+    @abstractmethod
+    def _step(self, points: np.ndarray, landmarks: np.ndarray, dt: float):
+        """Fold in a measurement dt seconds after the previous one"""
+
+    @abstractmethod
+    def _position(self) -> np.ndarray:
+        """(33, 3) current estimate"""
+
+
+class OneEuroFilter(LandmarkFilter):
+    """
+    One-Euro filter: a low-pass whose cutoff rises with speed, so slow
+    movement is smoothed hard and fast movement keeps little lag.
+
+    Args:
+        min_cutoff: Cutoff in Hz when still, lower = smoother
+        beta: Cutoff increase per unit of speed (normalized units / second), higher = less lag
+        d_cutoff: Cutoff in Hz of the speed estimate
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 20.0, d_cutoff: float = 1.0, max_gap: float = 1.0):
+        super().__init__(max_gap)
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self._x: Optional[np.ndarray] = None
+        self._dx: Optional[np.ndarray] = None
+
+    def reset(self):
+        super().reset()
+        self._x = None
+        self._dx = None
+
+    def _init(self, points, landmarks):
+        self._x = points.copy()
+        self._dx = np.zeros_like(points)
+
+    def _step(self, points, landmarks, dt):
+        speed = (points - self._x) / dt
+        self._dx += _alpha(self.d_cutoff, dt) * (speed - self._dx)
+        cutoff = self.min_cutoff + self.beta * np.abs(self._dx)
+        self._x += _alpha(cutoff, dt) * (points - self._x)
+
+    def _position(self):
+        return self._x
+
+
+class KalmanFilter(LandmarkFilter):
+    """
+    Constant-velocity Kalman filter, one independent position/velocity
+    state per coordinate.
+
+    Measurement noise is divided by the landmark's visibility, so
+    occluded landmarks lean on the motion model instead of the detector.
+
+    Args:
+        process_noise: Acceleration variance ((units / s^2)^2), higher = follows faster
+        measurement_noise: Position variance of a fully visible landmark (units^2)
+    """
+
+    def __init__(self, process_noise: float = 10.0, measurement_noise: float = 1e-4, max_gap: float = 1.0):
+        super().__init__(max_gap)
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self._p: Optional[np.ndarray] = None
+        self._v: Optional[np.ndarray] = None
+        self._cov = None  # (P00, P01, P11) arrays
+
+    def reset(self):
+        super().reset()
+        self._p = None
+        self._v = None
+        self._cov = None
+
+    def _measurement_noise(self, landmarks) -> np.ndarray:
+        visibility = np.clip(np.asarray(landmarks, dtype=np.float64)[:, 3:4], 0.05, 1.0)
+        return self.measurement_noise / visibility
+
+    def _init(self, points, landmarks):
+        self._p = points.copy()
+        self._v = np.zeros_like(points)
+        self._cov = (
+            np.broadcast_to(self._measurement_noise(landmarks), points.shape).copy(),
+            np.zeros_like(points),
+            np.ones_like(points)
+        )
+
+    def _step(self, points, landmarks, dt):
+        p00, p01, p11 = self._cov
+        q = self.process_noise
+
+        # Predict
+        self._p += self._v * dt
+        p00 = p00 + dt * (2 * p01 + dt * p11) + q * dt ** 4 / 4
+        p01 = p01 + dt * p11 + q * dt ** 3 / 2
+        p11 = p11 + q * dt ** 2
+
+        # Update with the measured position
+        innovation = p00 + self._measurement_noise(landmarks)
+        gain_p = p00 / innovation
+        gain_v = p01 / innovation
+        residual = points - self._p
+        self._p += gain_p * residual
+        self._v += gain_v * residual
+        self._cov = ((1 - gain_p) * p00, (1 - gain_p) * p01, p11 - gain_v * p01)
+
+    def _position(self):
+        return self._p
+
+
+def create_filter(name: Optional[str] = None) -> Optional[LandmarkFilter]:
+    """
+    Build a streaming landmark filter from settings
+
+    Args:
+        name: "one_euro", "kalman" or "none", defaults to LANDMARK_SMOOTHING
+
+    Returns:
+        The filter, or None when smoothing is off
+    """
+    name = (name or settings.LANDMARK_SMOOTHING).lower()
+    if name == "one_euro":
+        return OneEuroFilter(
+            min_cutoff=settings.ONE_EURO_MIN_CUTOFF,
+            beta=settings.ONE_EURO_BETA,
+            d_cutoff=settings.ONE_EURO_D_CUTOFF,
+            max_gap=settings.SMOOTHING_MAX_GAP
+        )
+    if name == "kalman":
+        return KalmanFilter(
+            process_noise=settings.KALMAN_PROCESS_NOISE,
+            measurement_noise=settings.KALMAN_MEASUREMENT_NOISE,
+            max_gap=settings.SMOOTHING_MAX_GAP
+        )
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown smoothing filter '{name}'. Use one of: {', '.join(FILTER_NAMES)}")
+
+
+def smooth_offline(landmarks: np.ndarray, timestamps: np.ndarray, cutoff: Optional[float] = None) -> np.ndarray:
+    """
+    Zero-phase smoothing of a finished clip
+
+    Runs a first-order low-pass forward and then backward over the frames,
+    so the lag of one pass cancels the other and peaks stay where they
+    were (important for rep bottoms and angle extremes).
+
+    Args:
+        landmarks: (N, 33, 4) landmarks in time order
+        timestamps: (N,) frame times in seconds
+        cutoff: Cutoff in Hz, defaults to OFFLINE_SMOOTHING_CUTOFF
+
+    Returns:
+        (N, 33, 4) float32 landmarks, visibility unchanged
+    """
+    cutoff = cutoff or settings.OFFLINE_SMOOTHING_CUTOFF
+    smoothed = np.array(landmarks, dtype=np.float32).reshape(-1, 33, 4)
+    if len(smoothed) < 3:
+        return smoothed
+
+    dt = np.diff(np.asarray(timestamps, dtype=np.float64))
+    alphas = _alpha(cutoff, np.where(dt > 0, dt, _DEFAULT_DT))
+    points = smoothed[..., :3].astype(np.float64)
+
+    for i in range(1, len(points)):
+        points[i] = points[i - 1] + alphas[i - 1] * (points[i] - points[i - 1])
+    for i in range(len(points) - 2, -1, -1):
+        points[i] = points[i + 1] + alphas[i] * (points[i] - points[i + 1])
+
+    smoothed[..., :3] = points
+    return smoothed
+
+
+def settle_frames(fps: float, cutoff: Optional[float] = None, tolerance: float = 1e-3) -> int:
+    """
+    Frames after which smooth_offline has forgotten where it started
+
+    Smoothing a stretch of a clip with this many extra frames on each side
+    gives the same values, to within tolerance, as smoothing the whole clip.
+
+    Args:
+        fps: Frame rate of the clip
+        cutoff: Cutoff in Hz, defaults to OFFLINE_SMOOTHING_CUTOFF
+        tolerance: Weight of the first frame still allowed after settling
+
+    Returns:
+        Number of frames
+    """
+    alpha = float(_alpha(cutoff or settings.OFFLINE_SMOOTHING_CUTOFF, 1.0 / (fps or 30)))
+    if alpha >= 1.0:
+        return 0
+    return int(np.ceil(np.log(tolerance) / np.log(1.0 - alpha)))
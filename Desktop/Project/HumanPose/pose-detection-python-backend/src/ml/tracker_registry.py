@@ -0,0 +1,359 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional
+
+import mediapipe as mp
+import numpy as np
+
+from src.config import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def _build_tracking_graph(complexity: int):
+    """Build a MediaPipe graph in tracking (video) mode"""
+    return mp.solutions.pose.Pose(
+        static_image_mode=False,
+        model_complexity=complexity,
+        min_detection_confidence=settings.MIN_DETECTION_CONFIDENCE,
+        min_tracking_confidence=settings.MIN_TRACKING_CONFIDENCE
+    )
+
+
+def _build_crop_graph(complexity: int):
+    """
+    Build a MediaPipe graph in tracking mode for crops around the pose
+
+    The crop moves with the person, so MediaPipe's own landmark smoothing
+    (which works in the coordinates of the image it is given) is left to
+    the session's filter on the full-frame landmarks instead.
+    """
+    return mp.solutions.pose.Pose(
+        static_image_mode=False,
+        model_complexity=complexity,
+        smooth_landmarks=False,
+        min_detection_confidence=settings.MIN_DETECTION_CONFIDENCE,
+        min_tracking_confidence=settings.MIN_TRACKING_CONFIDENCE
+    )
+
+
+class PoseTracker:
+    """
+    A tracking graph leased to a single session.
+
+    Frames of one session are serialized on the tracker's own lock, so
+    different sessions never wait on each other. While a frame is being
+    worked on the tracker is pinned (users > 0) and the registry neither
+    reclaims nor resets it.
+
+    Crops around the previous pose go through a second tracking graph of
+    the tracker's own, built on the first crop and kept with the tracker
+    when it goes back to the idle pool.
+    """
+
+    def __init__(self, pose, complexity: int, crop_factory: Callable = _build_crop_graph):
+        self.pose = pose
+        self.complexity = complexity
+        self.crop_pose = None
+        self._crop_factory = crop_factory
+        # Whether the crop graph has seen crops since it was last reset
+        self._crop_tracking = False
+        self.session_id: Optional[str] = None
+        self.frames_processed = 0
+        self.last_used = time.monotonic()
+        # Previous frame's full-frame landmarks, used to place the next crop
+        self.last_landmarks: Optional[np.ndarray] = None
+        self.roi_frames = 0
+        self.full_frames = 0
+        # Optical-flow propagation state, created on first tracked frame
+        self.flow = None
+        # Temporal landmark filter, created on first smoothed frame
+        self.smoother = None
+        # Frames in flight, guarded by the registry lock
+        self.users = 0
+        # Set when the session released the tracker while it was pinned
+        self.release_pending = False
+        self._lock = threading.Lock()
+
+    def process(self, frame_rgb):
+        """Run the tracking graph on an RGB frame"""
+        with self._lock:
+            self.frames_processed += 1
+            self.last_used = time.monotonic()
+            return self.pose.process(frame_rgb)
+
+    def process_crop(self, crop_rgb):
+        """Run the crop graph on an RGB crop, building the graph on first use"""
+        with self._lock:
+            if self.crop_pose is None:
+                self.crop_pose = self._crop_factory(self.complexity)
+            self._crop_tracking = True
+            self.frames_processed += 1
+            self.last_used = time.monotonic()
+            return self.crop_pose.process(crop_rgb)
+
+    def reset_graph(self):
+        """Drop only the graph's tracking state, e.g. after frames it did not see"""
+        with self._lock:
+            self.pose.reset()
+
+    def reset_crop_graph(self):
+        """Drop the crop graph's tracking state, a no-op if it has not tracked since the last reset"""
+        with self._lock:
+            if self._crop_tracking:
+                self.crop_pose.reset()
+                self._crop_tracking = False
+
+    def reset(self):
+        """Drop tracking state so the graph can serve another session"""
+        with self._lock:
+            self.pose.reset()
+            if self._crop_tracking:
+                self.crop_pose.reset()
+                self._crop_tracking = False
+            self.frames_processed = 0
+            self.last_landmarks = None
+            self.roi_frames = 0
+            self.full_frames = 0
+            self.flow = None
+            self.smoother = None
+
+    def close(self):
+        """Release the underlying graphs"""
+        with self._lock:
+            self.pose.close()
+            if self.crop_pose is not None:
+                self.crop_pose.close()
+
+
+class TrackerRegistry:
+    """
+    Lease one tracking graph per session id.
+
+    Released graphs are reset and kept in an idle pool for reuse by a
+    session on the same model tier. The idle pool is trimmed
+    least-recently-used first, and the total number of graphs (leased +
+    idle) stays within max_trackers; when every graph is leased the least
+    recently used lease that is not pinned by a frame in flight is
+    reclaimed. Graphs are reset outside the registry lock, so a reset never
+    holds up other sessions.
+    """
+
+    def __init__(
+        self,
+        max_trackers: int = 16,
+        max_idle: int = 4,
+        factory: Callable = _build_tracking_graph,
+        crop_factory: Callable = _build_crop_graph
+    ):
+        self.max_trackers = max(1, max_trackers)
+        self.max_idle = max(0, max_idle)
+        self._factory = factory
+        self._crop_factory = crop_factory
+        self._leased: "OrderedDict[str, PoseTracker]" = OrderedDict()
+        self._idle: "OrderedDict[int, PoseTracker]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._reclaimed = 0
+
+    def lease(self, session_id: str, complexity: Optional[int] = None) -> PoseTracker:
+        """
+        Get the tracker leased to a session, leasing a new one if needed
+
+        The tracker is not pinned: use() it when running frames, or another
+        session may reclaim it once the tracker limit is reached.
+
+        Args:
+            session_id: Live or video session identifier
+            complexity: Model tier, defaults to POSE_MODEL_COMPLEXITY
+
+        Returns:
+            PoseTracker dedicated to this session
+        """
+        return self._acquire(session_id, complexity, pin=False)
+
+    @contextmanager
+    def use(self, session_id: str, complexity: Optional[int] = None, create: bool = True) -> Iterator[Optional[PoseTracker]]:
+        """
+        Lease a session's tracker and pin it for the duration of the block
+
+        Args:
+            session_id: Live or video session identifier
+            complexity: Model tier, defaults to POSE_MODEL_COMPLEXITY
+            create: Lease a tracker if the session has none, otherwise yield None
+
+        Yields:
+            The session's PoseTracker, None if create is False and it has none
+        """
+        tracker = self._acquire(session_id, complexity, pin=True, create=create)
+        try:
+            yield tracker
+        finally:
+            if tracker is not None:
+                self._unpin(tracker)
+
+    def _acquire(
+        self,
+        session_id: str,
+        complexity: Optional[int],
+        pin: bool,
+        create: bool = True
+    ) -> Optional[PoseTracker]:
+        """Lease (and optionally pin) a session's tracker, resetting a reclaimed one outside the lock"""
+        closed = []
+        reclaimed = None
+        with self._lock:
+            tracker = self._leased.get(session_id)
+            if tracker is not None and (complexity is None or tracker.complexity == complexity):
+                self._leased.move_to_end(session_id)
+            elif not create:
+                tracker = None
+            else:
+                if complexity is None:
+                    complexity = settings.POSE_MODEL_COMPLEXITY
+                if tracker is not None:
+                    # Session switched tier, its old graph is of no use to it
+                    del self._leased[session_id]
+                    if tracker.users:
+                        tracker.release_pending = True
+                    else:
+                        closed.append(tracker)
+                tracker, reclaimed = self._new_lease(complexity, closed)
+                tracker.session_id = session_id
+                self._leased[session_id] = tracker
+            if tracker is not None and pin:
+                tracker.users += 1
+
+        for stale in closed:
+            stale.close()
+        if reclaimed is not None:
+            # Still unusable by anyone else: its old session lost the lease and
+            # the new one only gets it when this returns
+            reclaimed.reset()
+        return tracker
+
+    def _new_lease(self, complexity: int, closed: list):
+        """
+        Find a graph for a new lease, called with the lock held
+
+        Returns:
+            The tracker, and the same tracker again if it was reclaimed and
+            still has to be reset
+        """
+        tracker = self._take_idle(complexity)
+        if tracker is not None:
+            return tracker, None
+
+        if len(self._leased) + len(self._idle) >= self.max_trackers and self._idle:
+            # Make room by dropping the least recently used idle graph
+            _, oldest = self._idle.popitem(last=False)
+            closed.append(oldest)
+
+        if len(self._leased) + len(self._idle) < self.max_trackers:
+            return self._build(complexity), None
+
+        stale_id = next((sid for sid, leased in self._leased.items() if leased.users == 0), None)
+        if stale_id is None:
+            # Every graph has a frame in flight: go over the limit rather than
+            # pull a graph out from under a running frame
+            logger.warning(f"Tracker limit reached with every tracker in use, building tracker {self._created + 1}")
+            return self._build(complexity), None
+
+        tracker = self._leased.pop(stale_id)
+        self._reclaimed += 1
+        logger.warning(f"Tracker limit reached, reclaiming tracker from session {stale_id}")
+        if tracker.complexity != complexity:
+            closed.append(tracker)
+            return self._build(complexity), None
+        return tracker, tracker
+
+    def _build(self, complexity: int) -> PoseTracker:
+        tracker = PoseTracker(self._factory(complexity), complexity, crop_factory=self._crop_factory)
+        self._created += 1
+        return tracker
+
+    def _unpin(self, tracker: PoseTracker):
+        """Drop a pin, finishing a release that waited for the frame in flight"""
+        with self._lock:
+            tracker.users -= 1
+            if tracker.users or not tracker.release_pending:
+                return
+            tracker.release_pending = False
+        self._return_idle(tracker)
+
+    def get(self, session_id: str) -> Optional[PoseTracker]:
+        """Get the tracker currently leased to a session without leasing one"""
+        with self._lock:
+            return self._leased.get(session_id)
+
+    def _take_idle(self, complexity: int) -> Optional[PoseTracker]:
+        """Pop the most recently released idle graph of a tier"""
+        for key in reversed(self._idle):
+            if self._idle[key].complexity == complexity:
+                return self._idle.pop(key)
+        return None
+
+    def release(self, session_id: str):
+        """
+        Return a session's tracker to the idle pool
+
+        A tracker pinned by a frame in flight is returned once that frame is done.
+        """
+        with self._lock:
+            tracker = self._leased.pop(session_id, None)
+            if tracker is None:
+                return
+            if tracker.users:
+                tracker.release_pending = True
+                return
+        self._return_idle(tracker)
+
+    def _return_idle(self, tracker: PoseTracker):
+        """Reset a tracker nobody leases any more and add it to the idle pool"""
+        tracker.reset()
+        tracker.session_id = None
+        with self._lock:
+            self._idle[id(tracker)] = tracker
+            evicted = []
+            while len(self._idle) > self.max_idle:
+                _, oldest = self._idle.popitem(last=False)
+                evicted.append(oldest)
+
+        for stale in evicted:
+            stale.close()
+
+    def process(self, session_id: str, frame_rgb, complexity: Optional[int] = None):
+        """Run a frame through the session's tracker"""
+        with self.use(session_id, complexity) as tracker:
+            return tracker.process(frame_rgb)
+
+    def stats(self) -> Dict[str, int]:
+        """Return lease and pool counters"""
+        with self._lock:
+            return {
+                "leased": len(self._leased),
+                "in_use": sum(1 for tracker in self._leased.values() if tracker.users),
+                "idle": len(self._idle),
+                "max_trackers": self.max_trackers,
+                "created": self._created,
+                "reclaimed": self._reclaimed
+            }
+
+    def close_all(self):
+        """Close every graph, leased or idle"""
+        with self._lock:
+            trackers = list(self._leased.values()) + list(self._idle.values())
+            self._leased.clear()
+            self._idle.clear()
+        for tracker in trackers:
+            tracker.close()
+
+
+# Global instance
+tracker_registry = TrackerRegistry(
+    max_trackers=settings.MAX_TRACKERS,
+    max_idle=settings.TRACKER_IDLE_POOL_SIZE
+)
@@ -21,15 +21,36 @@ class Session(BaseModel):
     status: SessionStatus = SessionStatus.INITIALIZING
     progress: int = 0
     file_path: Optional[str] = None
+    model_tier: Optional[str] = None  # Pose model tier used for analysis (lite/full/heavy)
+    video_info: Optional[Dict[str, Any]] = None  # Container, codec, fps and length of an uploaded video
     
     # FIX: Add fields the frontend is looking for
     score: Optional[float] = None
     feedback: Optional[List[Dict[str, Any]]] = None  # Changed to list of dicts for structured feedback
     results: List[Dict[str, Any]] = [] # For frame-by-frame data
+    frame_stats: Optional[Dict[str, Any]] = None  # Detected vs interpolated frame counts, decode pipeline stats
+    kinematics: Optional[Dict[str, Any]] = None  # Joint angle summary and timeline of a video
+    reps: Optional[Dict[str, Any]] = None  # Rep count and per-rep scores
+    stats: Optional[Dict[str, Any]] = None  # Score statistics and feedback counts
+    job: Optional[Dict[str, Any]] = None  # Analysis job status, timing and parameters
+    error: Optional[str] = None  # Why the analysis failed
+    frame_count: int = 0  # Frames received by a live session
+
+    # Live-session state, kept in memory only
+    scorer: Optional[Any] = Field(default=None, exclude=True)
+    rep_counter: Optional[Any] = Field(default=None, exclude=True)
+    stats_accumulator: Optional[Any] = Field(default=None, exclude=True)
+    feedback_engine: Optional[Any] = Field(default=None, exclude=True)
+    feedback_format: str = Field(default="full", exclude=True)  # "ids" skips the rendered feedback list
 
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
+    @property
+    def is_active(self) -> bool:
+        """Whether the session still takes frames"""
+        return self.status in (SessionStatus.INITIALIZING, SessionStatus.PROCESSING)
+
     class Config:
         use_enum_values = True
 
@@ -0,0 +1,132 @@
+from src.scoring.spec import Criterion, ExerciseSpec, Feature, RepSpec
+
+SHOULDERS = ('left_shoulder', 'right_shoulder')
+HIPS = ('left_hip', 'right_hip')
+KNEES = ('left_knee', 'right_knee')
+ANKLES = ('left_ankle', 'right_ankle')
+ELBOWS = ('left_elbow', 'right_elbow')
+WRISTS = ('left_wrist', 'right_wrist')
+
+SYMMETRY_PAIRS = (
+    ('left_shoulder', 'right_shoulder'),
+    ('left_elbow', 'right_elbow'),
+    ('left_wrist', 'right_wrist'),
+    ('left_hip', 'right_hip'),
+    ('left_knee', 'right_knee'),
+    ('left_ankle', 'right_ankle'),
+)
+
+KNEE_ANGLES = (
+    Feature('left_knee', 'angle', ('left_hip', 'left_knee', 'left_ankle')),
+    Feature('right_knee', 'angle', ('right_hip', 'right_knee', 'right_ankle')),
+)
+HIP_ANGLES = (
+    Feature('left_hip', 'angle', ('left_shoulder', 'left_hip', 'left_knee')),
+    Feature('right_hip', 'angle', ('right_shoulder', 'right_hip', 'right_knee')),
+)
+ELBOW_ANGLES = (
+    Feature('left_elbow', 'angle', ('left_shoulder', 'left_elbow', 'left_wrist')),
+    Feature('right_elbow', 'angle', ('right_shoulder', 'right_elbow', 'right_wrist')),
+)
+
+
+GENERAL = ExerciseSpec(
+    name='general',
+    features=(
+        Feature('visibility', 'visibility'),
+        Feature('symmetry', 'symmetry', SYMMETRY_PAIRS),
+        Feature('spine_offset', 'horizontal_gap', (SHOULDERS, HIPS)),
+        Feature('weight_offset', 'horizontal_gap', (HIPS, ANKLES)),
+    ),
+    criteria=(
+        Criterion('visibility', 'visibility', 0.3, kind='curve', points=((0, 0), (1, 100))),
+        # 5% of frame height between left and right is perfect, 20% is poor
+        Criterion('symmetry', 'symmetry', 0.3, kind='curve', points=((0.05, 100), (0.2, 50))),
+        # Shoulders stacked over hips
+        Criterion('posture', 'spine_offset', 0.4, kind='curve', points=((0.05, 100), (0.15, 50))),
+        # Hips centered over the ankles. Kept in the breakdown for clients
+        # reading "balance", it does not count towards the overall score
+        Criterion('balance', 'weight_offset', 0.0, kind='curve', points=((0, 100), (0.5, 50))),
+    ),
+    decimals=None
+)
+
+SQUAT = ExerciseSpec(
+    name='squat',
+    features=KNEE_ANGLES + (
+        # Positive once the hips drop below the knees
+        Feature('hip_depth', 'vertical_gap', (KNEES, HIPS)),
+        # Vertical extent of the torso, shrinks as the chest drops forward
+        Feature('torso_height', 'vertical_gap', (SHOULDERS, HIPS)),
+    ),
+    criteria=(
+        Criterion('knee_alignment', ('left_knee', 'right_knee'), 0.4, target_min=85, target_max=110, tolerance=15),
+        Criterion('hip_depth', 'hip_depth', 0.4, kind='curve', points=((0, 50), (0.2, 100))),
+        Criterion('back_angle', 'torso_height', 0.2, kind='curve', points=((0, 0), (0.5, 100))),
+    ),
+    required_landmarks=HIPS + KNEES + ANKLES,
+    report_angles=('left_knee', 'right_knee'),
+    # Thighs at or below parallel at the bottom, knees straight at the top
+    reps=RepSpec(('left_knee', 'right_knee'), down_below=120, up_above=155, bottom_min=70, bottom_max=100)
+)
+
+PUSHUP = ExerciseSpec(
+    name='pushup',
+    features=ELBOW_ANGLES + (
+        Feature('body_drop', 'vertical_gap', (SHOULDERS, HIPS)),
+    ),
+    criteria=(
+        # 90 degrees at the bottom
+        Criterion('elbow_angle', ('left_elbow', 'right_elbow'), 0.6, kind='curve',
+                  points=((40, 50), (90, 100), (140, 50))),
+        # Straight line from shoulders to hips
+        Criterion('body_alignment', 'body_drop', 0.4, kind='curve',
+                  points=((-0.25, 50), (0, 100), (0.25, 50))),
+    ),
+    required_landmarks=SHOULDERS + ELBOWS + WRISTS,
+    report_angles=('left_elbow', 'right_elbow'),
+    reps=RepSpec(('left_elbow', 'right_elbow'), down_below=120, up_above=150, bottom_min=70, bottom_max=95,
+                 lockout_min=160)
+)
+
+DEADLIFT = ExerciseSpec(
+    name='deadlift',
+    features=KNEE_ANGLES + HIP_ANGLES + (
+        # Bar (hands) should travel close over the midfoot
+        Feature('bar_offset', 'horizontal_gap', (WRISTS, ANKLES)),
+        Feature('symmetry', 'symmetry', SYMMETRY_PAIRS),
+    ),
+    criteria=(
+        Criterion('bar_path', 'bar_offset', 0.35, kind='curve', points=((0.03, 100), (0.15, 40))),
+        # A hinge, not a squat: knees stay fairly open
+        Criterion('knee_bend', ('left_knee', 'right_knee'), 0.25, target_min=110, target_max=180, tolerance=20),
+        Criterion('hip_hinge', ('left_hip', 'right_hip'), 0.25, target_min=45, target_max=180, tolerance=20),
+        Criterion('balance', 'symmetry', 0.15, kind='curve', points=((0.05, 100), (0.2, 50))),
+    ),
+    required_landmarks=SHOULDERS + HIPS + KNEES,
+    report_angles=('left_knee', 'right_knee', 'left_hip', 'right_hip'),
+    # Driven by the hip hinge, hips fully extended at lockout
+    reps=RepSpec(('left_hip', 'right_hip'), down_below=130, up_above=160, bottom_min=60, bottom_max=110,
+                 bottom_tolerance=20)
+)
+
+PLANK = ExerciseSpec(
+    name='plank',
+    features=KNEE_ANGLES + (
+        Feature('body_line', 'angle', (SHOULDERS, HIPS, ANKLES)),
+        Feature('shoulder_offset', 'horizontal_gap', (SHOULDERS, ELBOWS)),
+    ),
+    criteria=(
+        # Shoulders, hips and ankles in one straight line
+        Criterion('body_line', 'body_line', 0.6, target_min=165, target_max=180, tolerance=15),
+        # Elbows stacked under the shoulders
+        Criterion('shoulder_stack', 'shoulder_offset', 0.2, kind='curve', points=((0.03, 100), (0.12, 40))),
+        Criterion('leg_extension', ('left_knee', 'right_knee'), 0.2, target_min=160, target_max=180, tolerance=20),
+    ),
+    # Usually filmed side-on, so the far side is often barely visible
+    required_landmarks=SHOULDERS + HIPS,
+    min_visibility=0.3,
+    report_angles=('body_line',)
+)
+
+EXERCISE_SPECS = {spec.name: spec for spec in (GENERAL, SQUAT, PUSHUP, DEADLIFT, PLANK)}
@@ -0,0 +1,140 @@
+import importlib
+import threading
+from importlib.metadata import entry_points
+from typing import Any, Dict, List, Optional
+
+from src.scoring.spec import ExerciseSpec, SpecScoring
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Installed packages can add exercises under this entry point group, e.g.
+# [project.entry-points."humanpose.scorers"] lunge = "mypkg.lunge:LUNGE"
+ENTRY_POINT_GROUP = "humanpose.scorers"
+
+
+def _import_path(path: str) -> Any:
+    """Import "package.module:attribute" """
+    module_name, _, attribute = path.partition(":")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+class ScorerRegistry:
+    """
+    Single registry of exercise scorers
+
+    Scorers are registered as "module:attribute" import paths (or entry
+    points) and only imported when first requested. The target can be an
+    ExerciseSpec, a scorer class or a scorer instance. One instance per
+    exercise is built and shared by every session, job and thread, so
+    scorers must not keep per-call state.
+
+    A scorer provides calculate_score(frame, angles),
+    calculate_scores(landmarks) and generate_feedback(frame, angles, score).
+    """
+
+    def __init__(self, default: str = "general", group: Optional[str] = ENTRY_POINT_GROUP):
+        """
+        Args:
+            default: Exercise used by resolve() for unknown exercise types
+            group: Entry point group scanned for extra scorers, None to skip
+        """
+        self.default = default
+        self.group = group
+        self._sources: Dict[str, Any] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._entry_points_loaded = group is None
+
+    def register(self, exercise_type: str, scorer: Any) -> None:
+        """
+        Register a scorer for an exercise, replacing any previous one
+
+        Args:
+            exercise_type: Exercise name as used by the API
+            scorer: "module:attribute" path, ExerciseSpec, scorer class or instance
+        """
+        exercise_type = exercise_type.lower().strip()
+        with self._lock:
+            self._sources[exercise_type] = scorer
+            self._instances.pop(exercise_type, None)
+        logger.debug(f"Registered scorer for: {exercise_type}")
+
+    def _load_entry_points(self):
+        """Register (without importing) scorers advertised by installed packages"""
+        if self._entry_points_loaded:
+            return
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            try:
+                for entry_point in entry_points(group=self.group):
+                    # Built-in registrations win over plugins with the same name
+                    self._sources.setdefault(entry_point.name.lower(), entry_point)
+            except Exception as e:
+                logger.error(f"Failed to read '{self.group}' entry points: {e}")
+            self._entry_points_loaded = True
+
+    def _build(self, exercise_type: str, source: Any) -> Any:
+        """Turn a registered source into a scorer instance"""
+        if isinstance(source, str):
+            source = _import_path(source)
+        elif hasattr(source, "load") and hasattr(source, "group"):
+            source = source.load()
+
+        if isinstance(source, ExerciseSpec):
+            scorer = SpecScoring(source)
+        elif isinstance(source, type):
+            scorer = source()
+        else:
+            scorer = source
+
+        logger.info(f"✅ Loaded scorer for: {exercise_type}")
+        return scorer
+
+    def get(self, exercise_type: str) -> Any:
+        """
+        Get the shared scorer for an exercise, importing it on first use
+
+        Raises:
+            KeyError: If no scorer is registered for the exercise
+        """
+        exercise_type = exercise_type.lower().strip()
+        scorer = self._instances.get(exercise_type)
+        if scorer is not None:
+            return scorer
+
+        self._load_entry_points()
+        with self._lock:
+            scorer = self._instances.get(exercise_type)
+            if scorer is None:
+                if exercise_type not in self._sources:
+                    raise KeyError(f"No scorer registered for exercise: {exercise_type}")
+                scorer = self._build(exercise_type, self._sources[exercise_type])
+                self._instances[exercise_type] = scorer
+            return scorer
+
+    def resolve(self, exercise_type: Optional[str]) -> Any:
+        """Get the scorer for an exercise, falling back to the default exercise"""
+        if exercise_type and exercise_type.lower().strip() in self:
+            return self.get(exercise_type)
+        logger.warning(f"No scorer for exercise '{exercise_type}', using '{self.default}'")
+        return self.get(self.default)
+
+    def __contains__(self, exercise_type: str) -> bool:
+        self._load_entry_points()
+        return exercise_type.lower().strip() in self._sources
+
+    def get_supported_exercises(self) -> List[str]:
+        """Get list of supported exercises"""
+        self._load_entry_points()
+        return list(self._sources)
+
+
+# Global instance
+scoring_registry = ScorerRegistry()
+scoring_registry.register("general", "src.ml.general_scorer:GeneralScorer")
+scoring_registry.register("squat", "src.scoring.squat:SquatScoring")
+scoring_registry.register("pushup", "src.scoring.pushup:PushupScoring")
+scoring_registry.register("deadlift", "src.scoring.exercises:DEADLIFT")
+scoring_registry.register("plank", "src.scoring.exercises:PLANK")
@@ -0,0 +1,268 @@
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.scoring.spec import Criterion, RepSpec, _compile_criterion
+
+
+@dataclass
+class Rep:
+    """One completed repetition, times in seconds"""
+    number: int
+    start: float
+    bottom: float
+    end: float
+    bottom_angle: float
+    lockout_angle: float
+    depth: float
+    lockout: float
+    form: Optional[float]
+    overall: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        rep = asdict(self)
+        rep["duration"] = round(self.duration, 2)
+        return rep
+
+
+class RepScorer:
+    """Scores a rep from its key phases: bottom depth, lockout and form at the bottom"""
+
+    def __init__(self, spec: RepSpec):
+        self.spec = spec
+        self._depth = _compile_criterion(Criterion(
+            "depth", "", 1, target_min=spec.bottom_min, target_max=spec.bottom_max,
+            tolerance=spec.bottom_tolerance
+        ))
+        self._lockout = _compile_criterion(Criterion(
+            "lockout", "", 1, target_min=spec.lockout_min, target_max=spec.lockout_max,
+            tolerance=spec.lockout_tolerance
+        ))
+
+    def score(
+        self,
+        number: int,
+        start: float,
+        bottom: float,
+        end: float,
+        bottom_angle: float,
+        lockout_angle: float,
+        form: Optional[float]
+    ) -> Rep:
+        depth = float(self._depth(np.float64(bottom_angle)))
+        lockout = float(self._lockout(np.float64(lockout_angle)))
+        depth_weight, lockout_weight, form_weight = self.spec.weights
+        if form is None:
+            overall = (depth * depth_weight + lockout * lockout_weight) / (depth_weight + lockout_weight)
+        else:
+            overall = (depth * depth_weight + lockout * lockout_weight + form * form_weight) / sum(self.spec.weights)
+
+        return Rep(
+            number=number,
+            start=round(start, 3),
+            bottom=round(bottom, 3),
+            end=round(end, 3),
+            bottom_angle=round(bottom_angle, 1),
+            lockout_angle=round(lockout_angle, 1),
+            depth=round(depth, 1),
+            lockout=round(lockout, 1),
+            form=None if form is None else round(form, 1),
+            overall=round(overall, 1)
+        )
+
+
+def driving_angle(spec: RepSpec, angles: Dict[str, float]) -> float:
+    """Mean of the rep's driving joint angles for one frame"""
+    return sum(angles[name] for name in spec.angles) / len(spec.angles)
+
+
+def driving_angle_series(spec: RepSpec, kinematics) -> np.ndarray:
+    """(N,) driving angle of every frame from a clip's Kinematics"""
+    return np.mean([kinematics.angle(name) for name in spec.angles], axis=0)
+
+
+class RepCounter:
+    """
+    Streaming rep counter for one session, O(1) work per frame.
+
+    States:
+        waiting: before the first time the angle is at the top
+        top: at the top, a finished rep's lockout is still being measured
+        descent: below the top but not deep enough to count yet
+        bottom: deep enough, waiting to get back to the top
+
+    A rep is counted as soon as the angle is back at the top; it is
+    scored once its lockout is known, i.e. when the next descent starts
+    or the session finishes.
+    """
+
+    def __init__(self, spec: RepSpec):
+        self.spec = spec
+        self.scorer = RepScorer(spec)
+        self.reps: List[Rep] = []
+        self.state = "waiting"
+        self._pending: Optional[Dict[str, Any]] = None
+        self._start = 0.0
+        self._bottom_angle = 0.0
+        self._bottom_time = 0.0
+        self._bottom_score: Optional[float] = None
+        self._peak = 0.0
+
+    @property
+    def count(self) -> int:
+        """Reps counted so far, including one whose lockout is still being measured"""
+        return len(self.reps) + (self._pending is not None)
+
+    def _finalize(self) -> Optional[Rep]:
+        if self._pending is None:
+            return None
+        rep = self.scorer.score(len(self.reps) + 1, lockout_angle=self._peak, **self._pending)
+        self._pending = None
+        self.reps.append(rep)
+        return rep
+
+    def update(self, angles: Dict[str, float], timestamp: float, score: Optional[float] = None) -> Optional[Rep]:
+        """
+        Feed one frame
+
+        Args:
+            angles: Joint angles of the frame
+            timestamp: Frame time in seconds
+            score: Overall frame score, used as the rep's form score at the bottom
+
+        Returns:
+            The rep scored on this frame, if any
+        """
+        angle = driving_angle(self.spec, angles)
+        finished = None
+
+        if self.state in ("waiting", "top"):
+            if angle >= self.spec.up_above:
+                self.state = "top"
+                self._peak = max(self._peak, angle)
+                return None
+            if self.state == "waiting":
+                return None
+            finished = self._finalize()
+            self.state = "descent"
+            self._start = timestamp
+            self._bottom_angle = angle
+            self._bottom_time = timestamp
+            self._bottom_score = score
+
+        if angle < self._bottom_angle:
+            self._bottom_angle = angle
+            self._bottom_time = timestamp
+            self._bottom_score = score
+
+        if angle >= self.spec.up_above:
+            if self.state == "bottom":
+                self._pending = {
+                    "start": self._start,
+                    "bottom": self._bottom_time,
+                    "end": timestamp,
+                    "bottom_angle": self._bottom_angle,
+                    "form": self._bottom_score
+                }
+            # A descent that never got deep enough is just a dip at the top
+            self.state = "top"
+            self._peak = angle
+        elif angle < self.spec.down_below:
+            self.state = "bottom"
+
+        return finished
+
+    def finish(self) -> Optional[Rep]:
+        """Score the last rep at the end of the session"""
+        return self._finalize()
+
+    def progress(self, rep: Optional[Rep] = None) -> Dict[str, Any]:
+        """Live status for the client"""
+        return {
+            "count": self.count,
+            "state": self.state,
+            "rep": rep.to_dict() if rep else None
+        }
+
+
+def count_reps(
+    spec: RepSpec,
+    angle: np.ndarray,
+    timestamps: np.ndarray,
+    scores: Optional[np.ndarray] = None
+) -> List[Rep]:
+    """
+    Find and score every rep of a finished clip in one vectorized pass
+
+    Gives the same reps as feeding the frames one by one to a RepCounter.
+
+    Args:
+        spec: Rep definition of the exercise
+        angle: (N,) driving angle per frame, see driving_angle
+        timestamps: (N,) frame times in seconds
+        scores: (N,) overall frame scores, used as form score at the bottom
+
+    Returns:
+        Scored reps in time order
+    """
+    angle = np.asarray(angle, dtype=np.float64)
+    n = len(angle)
+    if n == 0:
+        return []
+
+    frames = np.arange(n)
+    at_top = angle >= spec.up_above
+    # Hysteresis state per frame: 1 = top side, -1 = bottom side, 0 = before either
+    event = np.where(angle < spec.down_below, -1, np.where(at_top, 1, 0))
+    last_event = np.maximum.accumulate(np.where(event != 0, frames, -1))
+    state = np.where(last_event >= 0, event[np.maximum(last_event, 0)], 0)
+    previous = np.concatenate(([0], state[:-1]))
+
+    downs = np.flatnonzero((state == -1) & (previous == 1))
+    ends = np.flatnonzero((state == 1) & (previous == -1))
+    if len(downs) == 0:
+        return []
+    ends = ends[ends > downs[0]]
+    downs = downs[:len(ends)]
+
+    # A rep starts on the first frame below the top before its bottom
+    last_top = np.maximum.accumulate(np.where(at_top, frames, -1))
+    starts = last_top[downs] + 1
+    # Its lockout is measured until the angle next leaves the top
+    below_top = np.append(np.flatnonzero(~at_top), n)
+    lockout_ends = below_top[np.searchsorted(below_top, ends)]
+
+    scorer = RepScorer(spec)
+    reps = []
+    for number, (start, end, lockout_end) in enumerate(zip(starts, ends, lockout_ends), start=1):
+        bottom = start + int(np.argmin(angle[start:end]))
+        reps.append(scorer.score(
+            number,
+            start=float(timestamps[start]),
+            bottom=float(timestamps[bottom]),
+            end=float(timestamps[end]),
+            bottom_angle=float(angle[bottom]),
+            lockout_angle=float(angle[end:lockout_end].max()),
+            form=None if scores is None else float(scores[bottom])
+        ))
+    return reps
+
+
+def summarize_reps(reps: List[Rep]) -> Dict[str, Any]:
+    """Compact rep report stored with a session"""
+    if not reps:
+        return {"count": 0, "average_score": None, "reps": []}
+    scores = [rep.overall for rep in reps]
+    return {
+        "count": len(reps),
+        "average_score": round(sum(scores) / len(scores), 1),
+        "best_rep": int(np.argmax(scores)) + 1,
+        "worst_rep": int(np.argmin(scores)) + 1,
+        "average_duration": round(sum(rep.duration for rep in reps) / len(reps), 2),
+        "reps": [rep.to_dict() for rep in reps]
+    }
@@ -0,0 +1,301 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.feedback.catalog import Emission, render_feedback
+from src.feedback.factory import FeedbackFactory
+from src.ml.features import Feature, FrameFeatures, compile_feature
+from src.ml.landmark_frame import LANDMARK_INDEX, LandmarkFrame
+from src.scoring.base import BaseScoring
+
+@dataclass(frozen=True)
+class Criterion:
+    """
+    Turn a feature into a 0-100 breakdown score
+
+    feature names one feature, or a tuple of features (e.g. left and right
+    knee angle) whose per-frame mean is scored.
+
+    Kinds:
+        range: 100 inside [target_min, target_max], down to 70 at tolerance
+            outside it, then linearly to 0 at twice the tolerance
+        curve: piecewise-linear through the (value, score) points, clamped at the ends
+    """
+    name: str
+    feature: Union[str, Tuple[str, ...]]
+    weight: float
+    kind: str = "range"
+    target_min: float = 0.0
+    target_max: float = 0.0
+    tolerance: float = 1.0
+    points: Tuple[Tuple[float, float], ...] = ()
+
+
+@dataclass(frozen=True)
+class RepSpec:
+    """
+    How repetitions of an exercise are counted and scored
+
+    A rep starts when the driving angle drops below up_above, reaches its
+    bottom once the angle is below down_below, and ends when the angle is
+    back above up_above. The gap between the two thresholds is the
+    hysteresis that keeps jitter from counting extra reps.
+
+    Attributes:
+        angles: Joint angle names (kinematics.JOINT_ANGLES) averaged into the driving angle
+        down_below: Angle the rep must go below to count
+        up_above: Angle that marks the top of the movement
+        bottom_min, bottom_max, bottom_tolerance: Target range of the deepest angle
+        lockout_min, lockout_max, lockout_tolerance: Target range of the angle at the top
+        weights: Weights of the depth, lockout and form (frame score at the bottom) scores
+    """
+    angles: Tuple[str, ...]
+    down_below: float
+    up_above: float
+    bottom_min: float
+    bottom_max: float
+    bottom_tolerance: float = 15.0
+    lockout_min: float = 165.0
+    lockout_max: float = 180.0
+    lockout_tolerance: float = 10.0
+    weights: Tuple[float, float, float] = (0.4, 0.2, 0.4)
+
+
+@dataclass(frozen=True)
+class ExerciseSpec:
+    """
+    Declarative definition of how an exercise is scored
+
+    Attributes:
+        name: Exercise type as used by the API
+        features: Measurements taken from the landmarks
+        criteria: Weighted breakdown scores built from the features
+        required_landmarks: Landmarks that must be visible, otherwise the
+            frame gets the default score
+        min_visibility: Visibility needed for a required landmark
+        report_angles: Features echoed under "angles" in the result
+        default_score: Overall and breakdown value for frames that can't be scored
+        decimals: Rounding of reported scores, None truncates to int
+        reps: Repetition counting, None for static or unstructured exercises
+    """
+    name: str
+    features: Tuple[Feature, ...]
+    criteria: Tuple[Criterion, ...]
+    required_landmarks: Tuple[str, ...] = ()
+    min_visibility: float = 0.5
+    report_angles: Tuple[str, ...] = ()
+    default_score: float = 50.0
+    decimals: Optional[int] = 2
+    reps: Optional[RepSpec] = None
+
+
+def _compile_criterion(criterion: Criterion) -> Callable[[np.ndarray], np.ndarray]:
+    """Build a kernel mapping (N,) feature values to (N,) scores"""
+    if criterion.kind == "range":
+        low, high, tolerance = criterion.target_min, criterion.target_max, criterion.tolerance
+
+        def kernel(values):
+            deviation = np.maximum(low - values, 0) + np.maximum(values - high, 0)
+            near = 100 - deviation / tolerance * 30
+            far = np.maximum(0, 70 - (deviation - tolerance) / tolerance * 70)
+            return np.where(deviation <= tolerance, near, far)
+        return kernel
+
+    if criterion.kind == "curve":
+        xs, ys = (np.array(axis, dtype=np.float64) for axis in zip(*criterion.points))
+        return lambda values: np.interp(values, xs, ys)
+
+    raise ValueError(f"Unknown criterion kind '{criterion.kind}' in criterion '{criterion.name}'")
+
+
+class CompiledSpec:
+    """
+    An ExerciseSpec turned into vectorized kernels.
+
+    score_batch evaluates every feature and criterion for N frames with
+    one NumPy pass per kernel; score() formats a single frame the way the
+    API returns it.
+    """
+
+    def __init__(self, spec: ExerciseSpec):
+        self.spec = spec
+        self.name = spec.name
+        self._features = [(feature.name, compile_feature(feature)) for feature in spec.features]
+        self.features = spec.features
+        self._criteria = [
+            (
+                criterion.name,
+                (criterion.feature,) if isinstance(criterion.feature, str) else criterion.feature,
+                _compile_criterion(criterion)
+            )
+            for criterion in spec.criteria
+        ]
+        weights = np.array([criterion.weight for criterion in spec.criteria], dtype=np.float64)
+        self._weights = weights / weights.sum()
+        self._required = (
+            np.array([LANDMARK_INDEX[name] for name in spec.required_landmarks])
+            if spec.required_landmarks else None
+        )
+
+    def score_batch(self, landmarks: np.ndarray, features: Dict[str, np.ndarray] = None) -> Dict[str, Any]:
+        """
+        Score N frames at once
+
+        Args:
+            landmarks: (N, 33, 4) landmark tensor
+            features: Feature values already known, by feature name
+
+        Returns:
+            Dict with "overall" (N,), "breakdown" {criterion: (N,)},
+            "features" {feature: (N,)} and "valid" (N,) masks
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float64).reshape(-1, 33, 4)
+        known = features or {}
+        features = {
+            name: known[name] if name in known else kernel(landmarks)
+            for name, kernel in self._features
+        }
+        breakdown = {
+            name: kernel(features[inputs[0]] if len(inputs) == 1 else np.mean([features[f] for f in inputs], axis=0))
+            for name, inputs, kernel in self._criteria
+        }
+
+        scores = np.stack(list(breakdown.values()), axis=1)
+        overall = scores @ self._weights
+
+        valid = np.ones(len(landmarks), dtype=bool)
+        if self._required is not None:
+            valid = (landmarks[:, self._required, 3] >= self.spec.min_visibility).all(axis=1)
+            overall = np.where(valid, overall, self.spec.default_score)
+            breakdown = {
+                name: np.where(valid, values, self.spec.default_score)
+                for name, values in breakdown.items()
+            }
+
+        return {"overall": overall, "breakdown": breakdown, "features": features, "valid": valid}
+
+    def _format(self, value: float) -> float:
+        if self.spec.decimals is None:
+            return int(value)
+        return round(float(value), self.spec.decimals)
+
+    def results(self, batch: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Format a score_batch result as one API score dict per frame"""
+        overall = batch["overall"].tolist()
+        breakdown = {name: values.tolist() for name, values in batch["breakdown"].items()}
+        angles = {name: batch["features"][name].tolist() for name in self.spec.report_angles}
+        valid = batch["valid"].tolist()
+
+        results = []
+        for i in range(len(overall)):
+            result = {
+                "overall": self._format(overall[i]),
+                "breakdown": {name: self._format(values[i]) for name, values in breakdown.items()}
+            }
+            if angles:
+                result["angles"] = {
+                    name: round(values[i], 2) if valid[i] else 0.0
+                    for name, values in angles.items()
+                }
+            results.append(result)
+        return results
+
+    def score(
+        self,
+        landmarks: Union[LandmarkFrame, np.ndarray, Dict[str, Any]],
+        features: Optional[FrameFeatures] = None
+    ) -> Dict[str, Any]:
+        """
+        Score a single frame
+
+        Args:
+            landmarks: LandmarkFrame, (33, 4) array or named dict
+            features: The frame's feature graph, shared with other consumers of the frame
+        """
+        if isinstance(landmarks, dict):
+            landmarks = LandmarkFrame.from_dict(landmarks)
+        if features is None:
+            features = FrameFeatures(landmarks)
+        values = {feature.name: np.array([features.value(feature)]) for feature in self.features}
+        return self.results(self.score_batch(np.asarray(landmarks)[None], values))[0]
+
+    def score_many(self, landmarks: np.ndarray) -> List[Dict[str, Any]]:
+        """Score an (N, 33, 4) tensor and format every frame"""
+        if len(landmarks) == 0:
+            return []
+        return self.results(self.score_batch(landmarks))
+
+
+def compile_spec(spec: ExerciseSpec) -> CompiledSpec:
+    """Compile an exercise spec into vectorized scoring kernels"""
+    feature_names = {feature.name for feature in spec.features}
+    for criterion in spec.criteria:
+        inputs = (criterion.feature,) if isinstance(criterion.feature, str) else criterion.feature
+        for name in inputs:
+            if name not in feature_names:
+                raise ValueError(f"Criterion '{criterion.name}' of '{spec.name}' uses unknown feature '{name}'")
+    for name in spec.report_angles:
+        if name not in feature_names:
+            raise ValueError(f"'{spec.name}' reports unknown feature '{name}'")
+    return CompiledSpec(spec)
+
+
+class SpecScoring(BaseScoring):
+    """
+    Scoring module backed by a compiled ExerciseSpec
+
+    Either pass a spec or subclass and set the spec class attribute.
+    """
+
+    spec: Optional[ExerciseSpec] = None
+
+    def __init__(self, spec: Optional[ExerciseSpec] = None):
+        super().__init__()
+        if spec is not None:
+            self.spec = spec
+        self.compiled = compile_spec(self.spec)
+
+    def get_exercise_name(self) -> str:
+        """Return the exercise name"""
+        return self.spec.name
+
+    def calculate_score(self, landmarks, angles=None) -> Dict[str, Any]:
+        """
+        Score one frame
+
+        Args:
+            landmarks: LandmarkFrame, (33, 4) array or named landmark dict
+            angles: The frame's FrameFeatures, so shared features are computed once
+
+        Returns:
+            Dictionary containing overall score and breakdown
+        """
+        return self.compiled.score(landmarks, angles if isinstance(angles, FrameFeatures) else None)
+
+    def calculate_scores(self, landmarks: np.ndarray) -> List[Dict[str, Any]]:
+        """Score an (N, 33, 4) tensor in one pass, one score dict per frame"""
+        return self.compiled.score_many(landmarks)
+
+    @property
+    def required_features(self) -> Tuple[str, ...]:
+        """Standard feature names read from the frame's features, besides the spec's own"""
+        return self.spec.reps.angles if self.spec.reps else ()
+
+    @property
+    def rep_spec(self) -> Optional[RepSpec]:
+        """Rep definition of the exercise, None if it has no reps"""
+        return self.spec.reps
+
+    def create_rep_counter(self):
+        """New streaming rep counter for a session, None if the exercise has no reps"""
+        from src.scoring.reps import RepCounter
+        return RepCounter(self.spec.reps) if self.spec.reps else None
+
+    def select_feedback(self, landmarks, angles: Dict[str, float], score: Dict[str, Any]) -> List[Emission]:
+        """Interned catalog messages for a score, from the exercise's feedback generator"""
+        return FeedbackFactory.get_feedback_generator(self.spec.name).select_feedback(landmarks, score)
+
+    def generate_feedback(self, landmarks, angles: Dict[str, float], score: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Feedback messages for a score, from the exercise's feedback generator"""
+        return render_feedback(self.select_feedback(landmarks, angles, score))
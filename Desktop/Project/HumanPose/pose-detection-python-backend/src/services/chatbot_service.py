@@ -1,7 +1,8 @@
-import logging
 from typing import Optional
 
-logger = logging.getLogger(__name__)
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
 
 try:
     import ollama
@@ -0,0 +1,209 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import settings
+from src.ml.kinematics import Kinematics, compute_kinematics
+from src.ml.smoothing import settle_frames, smooth_offline
+from src.scoring.reps import count_reps, driving_angle_series, summarize_reps
+from src.services.session_stats import SessionStats
+from src.utils.logger import setup_hot_path_logger, setup_logger
+
+logger = setup_logger(__name__)
+frame_logger = setup_hot_path_logger(__name__)
+
+# (frame number, (33, 4) landmarks, source)
+FrameRecord = Tuple[int, np.ndarray, str]
+
+
+class ClipScorer:
+    """
+    Scores the frames of a video as they come, a chunk at a time.
+
+    Frames are fed in frame order and scored in chunks of chunk_size:
+    offline smoothing, kinematics and the vectorized scorer run over the
+    chunk plus `context` frames on either side, enough for the zero-phase
+    smoother and the velocity estimates to come out as if the whole clip
+    had been processed at once. Landmarks are let go once their chunk and
+    its right-hand context are scored; only the per-joint kinematics and
+    the frame scores are kept for the summary and rep counting.
+
+    Per-frame results are kept for at most max_results frames, evenly
+    spaced: once the limit is passed every other one is dropped and only
+    every second frame after that is kept. Statistics still cover every
+    frame.
+    """
+
+    def __init__(
+        self,
+        exercise_type: str,
+        fps: float,
+        pose_service,
+        chunk_size: Optional[int] = None,
+        total: Optional[int] = None,
+        progress: Optional[Callable[[int], None]] = None,
+        on_stats: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_results: Optional[int] = None
+    ):
+        """
+        Args:
+            exercise_type: Exercise to score
+            fps: Frame rate, frame numbers are turned into timestamps with it
+            pose_service: PoseService that scores the landmarks
+            chunk_size: Frames scored per pass, defaults to VIDEO_SCORING_CHUNK_FRAMES
+            total: Frames expected, for progress reports
+            progress: Called with the percentage of the expected frames scored
+            on_stats: Called with the statistics summary after each chunk
+            max_results: Per-frame results kept, defaults to
+                VIDEO_RESULTS_MAX_FRAMES, 0 keeps every frame
+        """
+        self.exercise_type = exercise_type
+        self.fps = fps or 30
+        self.pose_service = pose_service
+        self.scorer = pose_service.get_scorer(exercise_type)
+        self.chunk_size = max(1, chunk_size or settings.VIDEO_SCORING_CHUNK_FRAMES)
+        # Derivatives need a neighbour on each side, the smoother a few more
+        self.context = 2 + (settle_frames(self.fps) if settings.OFFLINE_SMOOTHING_ENABLED else 0)
+        self.total = total
+        self.progress = progress
+        self.on_stats = on_stats
+        self.max_results = settings.VIDEO_RESULTS_MAX_FRAMES if max_results is None else max_results
+
+        self.results: List[Dict[str, Any]] = []
+        self.stats = SessionStats()
+        self._window: List[FrameRecord] = []
+        self._scored_in_window = 0  # leading frames of the window that are only context
+        self._kinematics: List[Kinematics] = []
+        self._overall: List[np.ndarray] = []
+        self._timestamps: List[np.ndarray] = []
+        self._scored = 0
+        self._result_stride = 1
+        self._results_offered = 0
+
+    def add(self, number: int, landmarks: np.ndarray, source: str):
+        """Feed the next frame, in frame order"""
+        self._window.append((number, landmarks, source))
+        if len(self._window) - self._scored_in_window >= self.chunk_size + self.context:
+            self._score_chunk(self.chunk_size)
+
+    def add_all(self, records: List[FrameRecord]):
+        for record in records:
+            self.add(*record)
+
+    def _score_chunk(self, count: int):
+        """Score the next `count` unscored frames of the window"""
+        window = self._window
+        start = self._scored_in_window
+        stop = start + count
+
+        landmarks = np.stack([record[1] for record in window])
+        timestamps = np.array([record[0] for record in window]) / self.fps
+        if settings.OFFLINE_SMOOTHING_ENABLED:
+            landmarks = smooth_offline(landmarks, timestamps)
+        kinematics = compute_kinematics(landmarks, timestamps).select(start, stop)
+
+        try:
+            frame_results = self.pose_service.analyze_landmarks_batch(
+                landmarks[start:stop], self.exercise_type, kinematics, scorer=self.scorer
+            )
+        except Exception as e:
+            logger.error(f"Error scoring frames {window[start][0]}-{window[stop - 1][0]}: {e}")
+            frame_results = [None] * count
+
+        overall = np.full(count, np.nan)
+        for i, ((number, _, source), result) in enumerate(zip(window[start:stop], frame_results)):
+            if result is None:
+                continue
+            overall[i] = result["score"].get("overall", np.nan)
+            self._add_result(number, result, source)
+
+        self._kinematics.append(kinematics.without_landmarks())
+        self._overall.append(overall)
+        self._timestamps.append(timestamps[start:stop])
+        self._scored += count
+
+        # Keep only what the next chunk needs as left-hand context
+        keep_from = max(0, stop - self.context)
+        del window[:keep_from]
+        self._scored_in_window = stop - keep_from
+
+        if self.progress is not None and self.total:
+            self.progress(min(int(self._scored / self.total * 100), 100))
+        if self.on_stats is not None:
+            self.on_stats(self.stats.summary())
+
+    def _add_result(self, number: int, result: Dict[str, Any], source: str):
+        try:
+            frame_score = result.get('score', {})
+            frame_feedback = result.get('feedback', [])
+            self.stats.update(frame_score, frame_feedback if isinstance(frame_feedback, list) else None, number)
+
+            offered = self._results_offered
+            self._results_offered += 1
+            if offered % self._result_stride:
+                return
+            self.results.append({
+                "frame": number,
+                "timestamp": number / self.fps,
+                "score": frame_score,
+                "feedback": frame_feedback,
+                "landmarks": result.get('landmarks', {}),  # Include landmarks for AR overlay
+                "source": source  # "detected", "interpolated" or "tracked"
+            })
+            if self.max_results and len(self.results) > self.max_results:
+                del self.results[1::2]
+                self._result_stride *= 2
+        except Exception as e:
+            frame_logger.error("Error on frame %s: %s", number, e)
+
+    def finish(self, frame_stats: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Score the frames still waiting and summarize the clip
+
+        Args:
+            frame_stats: Detected/interpolated/tracked counts of the detection
+
+        Returns:
+            Session fields to store: score, feedback, results, frame_stats,
+            stats, reps and kinematics
+        """
+        remaining = len(self._window) - self._scored_in_window
+        if remaining:
+            self._score_chunk(remaining)
+        self._window.clear()
+
+        kinematics = Kinematics.concatenate(self._kinematics) if self._kinematics else None
+        reps = None
+        if kinematics is not None and self.scorer.rep_spec is not None:
+            overall = np.concatenate(self._overall)
+            if not np.isnan(overall).any():
+                reps = count_reps(
+                    self.scorer.rep_spec,
+                    driving_angle_series(self.scorer.rep_spec, kinematics),
+                    np.concatenate(self._timestamps),
+                    overall
+                )
+
+        # Statistics were accumulated frame by frame
+        avg_score = self.stats.average_score
+
+        logger.info(
+            f"✅ Video analysis complete: {self.stats.frames} frames "
+            f"({frame_stats['detected']} detected, {frame_stats['interpolated']} interpolated, "
+            f"{frame_stats['tracked']} tracked), "
+            f"avg score: {avg_score:.1f}"
+        )
+
+        return {
+            "score": avg_score,
+            "feedback": self.stats.feedback_summary(),
+            "results": self.results,
+            # Every result_stride-th scored frame is in results
+            "frame_stats": {**frame_stats, "result_stride": self._result_stride},
+            "stats": self.stats.summary(),
+            "reps": summarize_reps(reps) if reps is not None else None,
+            "kinematics": {
+                "summary": kinematics.summary(),
+                "timeline": kinematics.timeline(settings.KINEMATICS_TIMELINE_POINTS)
+            } if kinematics is not None else None
+        }
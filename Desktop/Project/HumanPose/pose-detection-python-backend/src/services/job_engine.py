@@ -0,0 +1,528 @@
+import heapq
+import itertools
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+from src.config import settings
+from src.models.session import SessionStatus
+from src.services.session_service import SessionService, session_service
+from src.services.video_analysis import DETECTION_PROGRESS, init_job_worker, plan_segments, run_job, run_scoring, run_segment
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Finished jobs kept in memory for status lookups, older ones are only on their sessions
+FINISHED_JOBS_KEPT = 256
+
+# Task priorities, lower starts first. Scoring finishes a job whose segments are all
+# done and frees their landmarks, it should not wait behind jobs that have not started
+SCORING_PRIORITY = 0
+ANALYSIS_PRIORITY = 1
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at its admission limit"""
+
+
+@dataclass
+class Job:
+    """One video analysis job, times are UNIX timestamps"""
+    id: str
+    session_id: str
+    params: Dict[str, Any]
+    status: str = "queued"  # queued, running, completed or failed
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    progress: int = 0
+    error: Optional[str] = None
+    worker_pid: Optional[int] = None
+    segments: int = 1  # Parts of the video analyzed in parallel
+    revision: int = 0  # Bumped on every change mirrored to the session
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    @property
+    def queue_seconds(self) -> Optional[float]:
+        """Time spent waiting for a worker"""
+        end = self.started_at or self.finished_at
+        return round(end - self.submitted_at, 3) if end else None
+
+    @property
+    def run_seconds(self) -> Optional[float]:
+        """Time spent on a worker"""
+        if self.started_at is None:
+            return None
+        return round((self.finished_at or time.time()) - self.started_at, 3)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "session_id": self.session_id,
+            "params": self.params,
+            "status": self.status,
+            "progress": self.progress,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queue_seconds": self.queue_seconds,
+            "run_seconds": self.run_seconds,
+            "error": self.error,
+            "worker_pid": self.worker_pid,
+            "segments": self.segments
+        }
+
+
+class JobEngine:
+    """
+    Bounded pool of worker processes running video analysis jobs.
+
+    At most `workers` jobs run at once, each in its own process, so
+    analysis can neither starve the API process of CPU nor block its
+    event loop. Up to `max_queued` more jobs wait for a free worker;
+    beyond that submit() refuses new jobs instead of letting the backlog
+    grow without bound.
+
+    With VIDEO_PARALLEL_SEGMENTS a long video is split into time
+    segments (see plan_segments) that the workers analyze side by side;
+    once all are done one more task stitches them into a single timeline
+    and scores it. A job still counts once against the queue limit.
+
+    Tasks wait in a priority queue of the engine and are handed to the
+    pool only while a worker is free, so the scoring task of a job jumps
+    ahead of segments and jobs queued after it.
+
+    Every job is recorded on its session (status, timing, error and the
+    parameters it was started with), so jobs cut short by a restart are
+    resubmitted by resume_pending().
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_queued: int = 8,
+        sessions: Optional[SessionService] = None
+    ):
+        """
+        Args:
+            workers: Worker processes, 0 or None = half the CPU cores (at least 1)
+            max_queued: Jobs allowed to wait for a worker
+            sessions: Session store the jobs report to
+        """
+        self.workers = workers or max(1, (os.cpu_count() or 1) // 2)
+        self.max_queued = max_queued
+        self.sessions = sessions or session_service
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # (priority, sequence, fn, args, future) of tasks waiting for a worker
+        self._pending: List[tuple] = []
+        self._sequence = itertools.count()
+        self._running: Set[Future] = set()  # pool futures of the tasks handed to workers
+        self._events = None
+        self._event_thread: Optional[threading.Thread] = None
+        self._lock = threading.RLock()
+        self._jobs: Dict[str, Job] = {}
+        # Per segmented job: its segment futures, their results and progress
+        self._segment_runs: Dict[str, Dict[str, List]] = {}
+        # Session writes happen outside _lock; _record_lock orders them by job revision
+        self._record_lock = threading.Lock()
+        self._recorded: Dict[str, int] = {}
+        self._saved_at: Dict[str, float] = {}
+        self._completed = 0
+        self._failed = 0
+        self._busy_seconds = 0.0
+        self._started_at = time.time()
+
+    def start(self) -> ProcessPoolExecutor:
+        """Start the worker processes and the event thread if they are not running yet"""
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a parent that already runs MediaPipe threads can deadlock
+                context = multiprocessing.get_context("spawn")
+                if self._events is None:
+                    self._events = context.Queue()
+                    self._event_thread = threading.Thread(
+                        target=self._read_events, name="job-events", daemon=True
+                    )
+                    self._event_thread.start()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=init_job_worker,
+                    initargs=(self._events,)
+                )
+                logger.info(f"✅ JobEngine started with {self.workers} workers")
+            return self._executor
+
+    def _active(self) -> List[Job]:
+        return [job for job in self._jobs.values() if not job.finished]
+
+    def check_capacity(self):
+        """
+        Raise before accepting an upload that could not be queued
+
+        Raises:
+            JobQueueFull: If running and queued jobs are at the limit
+        """
+        with self._lock:
+            if len(self._active()) >= self.workers + self.max_queued:
+                raise JobQueueFull(
+                    f"Analysis queue is full ({self.workers} running, {self.max_queued} queued)"
+                )
+
+    def _submit_task(self, fn, *args, priority: int = ANALYSIS_PRIORITY) -> Future:
+        """
+        Queue a task for the pool
+
+        Returns:
+            Future of the task, cancelling it before it reaches a worker drops it
+        """
+        future = Future()
+        with self._lock:
+            heapq.heappush(self._pending, (priority, next(self._sequence), fn, args, future))
+        self._dispatch()
+        return future
+
+    def _dispatch(self):
+        """Hand waiting tasks to the pool, most urgent first, while workers are free"""
+        with self._lock:
+            while self._pending and len(self._running) < self.workers:
+                _, _, fn, args, future = heapq.heappop(self._pending)
+                if future.cancelled():
+                    continue
+                try:
+                    task = self.start().submit(fn, *args)
+                except BrokenProcessPool:
+                    logger.error("JobEngine workers died, restarting pool")
+                    self._stop_pool(wait=False)
+                    task = self.start().submit(fn, *args)
+                self._running.add(task)
+                task.add_done_callback(lambda done, future=future: self._task_done(done, future))
+
+    def _task_done(self, task: Future, future: Future):
+        """Pass a pool task's outcome on to the engine's future and start the next task"""
+        with self._lock:
+            self._running.discard(task)
+        if task.cancelled():
+            future.cancel()
+        elif future.set_running_or_notify_cancel():
+            error = task.exception()
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(task.result())
+        # The callbacks above may have queued a scoring task, it goes first
+        self._dispatch()
+
+    def _plan(self, session_id: str) -> List[Dict[str, Any]]:
+        """Segments to split a job into, a single one when splitting is off or pointless"""
+        # The length comes from the probe stored on the session, the video is not opened here
+        session = self.sessions.get_session(session_id)
+        video_info = session.video_info if session is not None else None
+        if not settings.VIDEO_PARALLEL_SEGMENTS or self.workers < 2 or not video_info:
+            return [{"start": 0, "end": None, "warmup": 0}]
+        return plan_segments(
+            video_info,
+            self.workers,
+            settings.VIDEO_SEGMENT_MIN_SECONDS,
+            settings.VIDEO_SEGMENT_OVERLAP
+        )
+
+    def submit(self, session_id: str, **params) -> Job:
+        """
+        Queue a video analysis for a session
+
+        Args:
+            session_id: Session that receives the results
+            **params: analyze_video arguments besides session_id
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFull: If running and queued jobs are at the limit
+        """
+        self.check_capacity()
+        segments = self._plan(session_id)
+        task_params = {"session_id": session_id, **params}
+
+        with self._lock:
+            self.check_capacity()
+            job = Job(id=uuid.uuid4().hex, session_id=session_id, params=params, segments=len(segments))
+            self._jobs[job.id] = job
+
+            if len(segments) == 1:
+                future = self._submit_task(run_job, job.id, task_params)
+                future.add_done_callback(lambda done: self._finish(job, done))
+            else:
+                run = self._segment_runs[job.id] = {
+                    "futures": [],
+                    "results": [None] * len(segments),
+                    "progress": [0] * len(segments)
+                }
+                for index, segment in enumerate(segments):
+                    run["futures"].append(self._submit_task(run_segment, job.id, index, task_params, segment))
+                # Callbacks of segments that are already done run right away, add them once all are queued
+                for index, future in enumerate(run["futures"]):
+                    future.add_done_callback(
+                        lambda done, index=index: self._segment_finished(job, index, done)
+                    )
+
+        self._record(job)
+        logger.info(f"Queued video job {job.id} for session {session_id} ({job.segments} segments)")
+        return job
+
+    def _segment_finished(self, job: Job, index: int, future: Future):
+        """Collect one segment, and score the job once all its segments are in"""
+        with self._lock:
+            run = self._segment_runs.get(job.id)
+            if run is None:
+                # The job already failed or was cancelled
+                return
+            if future.cancelled():
+                # Cancelled by shutdown, the session stays queued for resume_pending
+                del self._segment_runs[job.id]
+                self._jobs.pop(job.id, None)
+                return
+            try:
+                output = future.result()
+            except Exception as e:
+                # One missing segment leaves a gap in the timeline, give up on the job
+                del self._segment_runs[job.id]
+                for pending in run["futures"]:
+                    pending.cancel()
+                error = e
+            else:
+                error = None
+                self._busy_seconds += output["finished_at"] - output["started_at"]
+                run["results"][index] = output["result"]
+                run["progress"][index] = 100
+                if any(result is None for result in run["results"]):
+                    return
+                del self._segment_runs[job.id]
+                future = self._submit_task(
+                    run_scoring, job.id, job.params, run["results"], priority=SCORING_PRIORITY
+                )
+                future.add_done_callback(lambda done: self._finish(job, done))
+                return
+
+        self._fail(job, error)
+
+    def _read_events(self):
+        """Apply start, progress and statistics reports of the workers"""
+        while True:
+            event = self._events.get()
+            if event is None:
+                return
+            job_id, kind, value = event
+            try:
+                with self._lock:
+                    job = self._jobs.get(job_id)
+                    if job is None or job.finished:
+                        continue
+                    if kind == "started":
+                        job.status = "running"
+                        # Segmented jobs report once per segment, keep the first
+                        job.started_at = job.started_at or time.time()
+                        job.worker_pid = job.worker_pid or value
+                    elif kind == "progress" and isinstance(value, tuple):
+                        run = self._segment_runs.get(job_id)
+                        if run is None:
+                            continue
+                        index, percent = value
+                        run["progress"][index] = percent
+                        # The rest is left for scoring the stitched segments
+                        job.progress = sum(run["progress"]) * DETECTION_PROGRESS // (100 * len(run["progress"]))
+                    elif kind == "scoring":
+                        # 100 only once the results are stored
+                        job.progress = min(DETECTION_PROGRESS + value * (99 - DETECTION_PROGRESS) // 100, 99)
+                    elif kind == "progress":
+                        job.progress = value
+                    # Progress and statistics are frequent, they reach the disk at most every few seconds
+                    now = time.time()
+                    save = kind == "started" or now - self._saved_at.get(job_id, 0) >= settings.VIDEO_JOB_SAVE_INTERVAL
+                    if save:
+                        self._saved_at[job_id] = now
+                # Statistics of the frames scored so far, readable before the job finishes
+                self._record(job, result={"stats": value} if kind == "stats" else None, save=save)
+            except Exception as e:
+                logger.error(f"Failed to apply job event {kind} of {job_id}: {e}")
+
+    def _finish(self, job: Job, future: Future):
+        """Store the job's results on its session"""
+        if future.cancelled():
+            # Cancelled by shutdown before it ran, the session stays queued for resume_pending
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            return
+
+        try:
+            output = future.result()
+        except Exception as e:
+            self._fail(job, e)
+            return
+
+        with self._lock:
+            job.finished_at = time.time()
+            if job.segments == 1:
+                # Reported by the worker itself, the start event may not have been read yet
+                job.started_at = output["started_at"]
+                job.worker_pid = output["worker_pid"]
+            job.status = "completed"
+            job.progress = 100
+            self._completed += 1
+            self._busy_seconds += output["finished_at"] - output["started_at"]
+            self._prune()
+
+        logger.info(f"✅ Video job {job.id} completed in {job.run_seconds}s (queued {job.queue_seconds}s)")
+        # Saving a finished session writes every frame result, keep it outside the lock
+        self._record(job, SessionStatus.COMPLETED, output["result"])
+
+    def _fail(self, job: Job, error: Exception):
+        """Mark the job and its session failed"""
+        with self._lock:
+            if job.finished:
+                return
+            job.finished_at = time.time()
+            job.status = "failed"
+            job.error = str(error) or error.__class__.__name__
+            self._failed += 1
+            if job.started_at is not None:
+                # The worker's own timing was lost with the exception, count from the start event
+                self._busy_seconds += job.finished_at - job.started_at
+            self._prune()
+
+        logger.error(f"Video job {job.id} failed: {job.error}")
+        self._record(job, SessionStatus.FAILED)
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond FINISHED_JOBS_KEPT"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - FINISHED_JOBS_KEPT)]:
+            del self._jobs[job_id]
+            self._saved_at.pop(job_id, None)
+            self._recorded.pop(job_id, None)
+
+    def _record(
+        self,
+        job: Job,
+        status: Optional[SessionStatus] = None,
+        result: Dict[str, Any] = None,
+        save: bool = True
+    ):
+        """
+        Mirror the job onto its session
+
+        Called without holding _lock, saving a finished session writes
+        every frame result. A snapshot older than the one already on the
+        session, from a thread that lost the race, is dropped.
+
+        Args:
+            job: Job to mirror
+            status: Session status, derived from the job's when None
+            result: Further session fields, None values are skipped
+            save: Write the session to disk as well as updating it in memory
+        """
+        with self._lock:
+            job.revision += 1
+            revision = job.revision
+            if status is None:
+                status = SessionStatus.PROCESSING if job.status == "running" else SessionStatus.INITIALIZING
+            fields = {name: value for name, value in (result or {}).items() if value is not None}
+            fields.update(status=status, progress=job.progress, error=job.error, job=job.to_dict())
+
+        with self._record_lock:
+            if revision < self._recorded.get(job.id, 0):
+                return
+            self._recorded[job.id] = revision
+            self.sessions.update_session(job.session_id, save=save, **fields)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def resume_pending(self) -> int:
+        """
+        Resubmit jobs that were queued or running when the server stopped
+
+        Returns:
+            Number of jobs resubmitted
+        """
+        resumed = 0
+        for session in self.sessions.get_all_sessions():
+            job = session.job
+            if session.type != "video" or not job or job.get("status") in ("completed", "failed"):
+                continue
+            if session.status not in (SessionStatus.INITIALIZING, SessionStatus.PROCESSING):
+                continue
+            session_id = str(session.id)
+            if job.get("id") in self._jobs:
+                continue
+            if not session.file_path or not os.path.exists(session.file_path):
+                self.sessions.update_session_status(session_id, "failed")
+                continue
+            try:
+                self.submit(session_id, **job["params"])
+                resumed += 1
+            except JobQueueFull:
+                logger.warning(f"Queue full, video job of session {session_id} not resumed")
+                break
+        if resumed:
+            logger.info(f"✅ Resumed {resumed} interrupted video jobs")
+        return resumed
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and worker utilization"""
+        with self._lock:
+            active = self._active()
+            running = sum(1 for job in active if job.status == "running")
+            # A segmented job keeps a worker busy per segment still being analyzed
+            tasks = sum(
+                sum(1 for future in self._segment_runs[job.id]["futures"] if not future.done())
+                if job.id in self._segment_runs else 1
+                for job in active if job.status == "running"
+            )
+            busy = self._busy_seconds + sum(job.run_seconds or 0 for job in active)
+            uptime = max(time.time() - self._started_at, 1e-9)
+            return {
+                "workers": self.workers,
+                "started": self._executor is not None,
+                "running": running,
+                "queued": len(active) - running,
+                "max_queued": self.max_queued,
+                "completed": self._completed,
+                "failed": self._failed,
+                "utilization": round(min(tasks, self.workers) / self.workers, 2),
+                "average_utilization": round(min(busy / (uptime * self.workers), 1.0), 3)
+            }
+
+    def _stop_pool(self, wait: bool):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True):
+        """Stop all worker processes, queued jobs are resumed on the next start"""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for *_, future in pending:
+            future.cancel()
+        if self._executor is not None:
+            self._stop_pool(wait)
+            logger.info("JobEngine shut down")
+
+
+# Global instance
+job_engine = JobEngine(
+    workers=settings.VIDEO_JOB_WORKERS,
+    max_queued=settings.VIDEO_JOB_QUEUE_SIZE
+)
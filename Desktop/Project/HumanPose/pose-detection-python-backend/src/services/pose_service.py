@@ -1,139 +1,282 @@
+import asyncio
+import time
 import cv2
+import numpy as np
+from src.config import settings
+from src.feedback.catalog import render_feedback
 from src.ml.pose_detector import PoseDetector
-from src.ml.scoring_factory import ScoringFactory
-from src.ml.landmark_processor import LandmarkProcessor
-from src.models.pose import Keypoint
+from src.ml.landmark_frame import LandmarkFrame, as_frame
+from src.ml.features import FrameFeatures, compute_features
+from src.ml.backends import model_name
+from src.ml.detector_pool import DetectorPool, detector_pool
+from src.ml.model_tiers import resolve_tier, tier_name
+from src.scoring.registry import ScorerRegistry, scoring_registry
+from src.services.result_cache import LandmarkCache, landmark_cache
+from src.utils.helpers import decode_image_bytes
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 class PoseService:
-    def __init__(self):
+    def __init__(
+        self,
+        pool: DetectorPool = None,
+        cache: LandmarkCache = None,
+        registry: ScorerRegistry = None
+    ):
         self.detector = PoseDetector()
-        self.scorer_factory = ScoringFactory()
-        self.landmark_processor = LandmarkProcessor()
+        self.pool = pool or detector_pool
+        self.cache = cache or (landmark_cache if settings.RESULT_CACHE_ENABLED else None)
+        self.scorers = registry or scoring_registry
         logger.info("✅ PoseService initialized")
 
-    def _convert_landmarks_to_list(self, mediapipe_landmarks):
-        """Convert MediaPipe landmarks to list of dicts for scorer"""
-        landmarks_list = []
-        for idx, landmark in enumerate(mediapipe_landmarks.landmark):
-            landmarks_list.append({
-                'id': idx,
-                'x': landmark.x,
-                'y': landmark.y,
-                'z': landmark.z,
-                'visibility': landmark.visibility
+    def get_scorer(self, exercise_type: str):
+        """Resolve the shared scorer for an exercise, once per session or job"""
+        return self.scorers.resolve(exercise_type)
+
+    def analyze_landmarks(
+        self,
+        landmarks,
+        exercise_type: str,
+        angles: dict = None,
+        scorer=None,
+        feedback_engine=None,
+        timestamp: float = None,
+        render: bool = True
+    ):
+        """
+        Score a (33, 4) landmark array or LandmarkFrame and build the analysis result
+
+        Args:
+            landmarks: Landmarks of one frame
+            exercise_type: Exercise to score
+            angles: The frame's FrameFeatures, or joint angles already known (e.g. from
+                kinematics); anything else is computed on demand
+            scorer: Scorer already resolved for the session, looked up here if omitted
+            feedback_engine: The session's FeedbackEngine, adds the deduplicated
+                "feedback_update" to the result
+            timestamp: Frame time in seconds for the feedback engine
+            render: Render the selected messages to the "feedback" list. When
+                False the result carries the selected (message, params)
+                "emissions" instead, for clients that only take catalog ids.
+        """
+        frame = as_frame(landmarks)
+        if not isinstance(angles, FrameFeatures):
+            angles = FrameFeatures(frame, angles)
+
+        # Get scorer and calculate score/feedback
+        scorer = scorer or self.get_scorer(exercise_type)
+        score = scorer.calculate_score(frame, angles)
+        messages = scorer.select_feedback(frame, angles, score)
+
+        result = {
+            # Landmarks dict for frontend AR overlay
+            "landmarks": frame.to_dict(),
+            "score": score
+        }
+        if render:
+            result["feedback"] = render_feedback(messages)
+        else:
+            result["emissions"] = messages
+        if feedback_engine is not None:
+            result["feedback_update"] = feedback_engine.update(
+                messages, time.monotonic() if timestamp is None else timestamp
+            )
+        return result
+
+    def analyze_landmarks_batch(self, landmarks: np.ndarray, exercise_type: str, kinematics=None, scorer=None):
+        """
+        Score a stack of frames, with one vectorized scoring pass for the whole stack
+
+        Args:
+            landmarks: (N, 33, 4) landmark tensor
+            exercise_type: Exercise to score
+            kinematics: Kinematics of the same frames, angles computed here if omitted
+            scorer: Scorer already resolved for the job, looked up here if omitted
+
+        Returns:
+            One analysis result per frame, as analyze_landmarks builds them
+        """
+        landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, 33, 4)
+        scorer = scorer or self.get_scorer(exercise_type)
+        if kinematics is None:
+            # Only the features the scorer declared, in one vectorized pass each
+            known = compute_features(landmarks, scorer.required_features)
+            frame_angles = lambda i: {name: float(values[i]) for name, values in known.items()}
+        else:
+            frame_angles = kinematics.frame_angles
+
+        scores = scorer.calculate_scores(landmarks)
+
+        results = []
+        for i, score in enumerate(scores):
+            frame = LandmarkFrame(landmarks[i])
+            results.append({
+                "landmarks": frame.to_dict(),
+                "score": score,
+                "feedback": scorer.generate_feedback(frame, FrameFeatures(frame, frame_angles(i)), score)
             })
-        return landmarks_list
-
-    def _calculate_angles(self, mediapipe_landmarks):
-        """Calculate angles from landmarks"""
-        # Convert to Keypoint list for angle calculation
-        keypoints = []
-        landmark_names = [
-            'nose', 'left_eye_inner', 'left_eye', 'left_eye_outer',
-            'right_eye_inner', 'right_eye', 'right_eye_outer',
-            'left_ear', 'right_ear', 'mouth_left', 'mouth_right',
-            'left_shoulder', 'right_shoulder', 'left_elbow', 'right_elbow',
-            'left_wrist', 'right_wrist', 'left_pinky', 'right_pinky',
-            'left_index', 'right_index', 'left_thumb', 'right_thumb',
-            'left_hip', 'right_hip', 'left_knee', 'right_knee',
-            'left_ankle', 'right_ankle', 'left_heel', 'right_heel',
-            'left_foot_index', 'right_foot_index'
-        ]
-        for idx, landmark in enumerate(mediapipe_landmarks.landmark):
-            name = landmark_names[idx] if idx < len(landmark_names) else f'landmark_{idx}'
-            keypoints.append(Keypoint(
-                x=landmark.x,
-                y=landmark.y,
-                z=landmark.z,
-                visibility=landmark.visibility,
-                name=name
-            ))
-        
-        # Calculate basic angles
-        angles = {}
-        try:
-            # Knee angles
-            if len(keypoints) > 27:
-                left_knee_angle = LandmarkProcessor.calculate_angle(
-                    keypoints[LandmarkProcessor.LEFT_HIP],
-                    keypoints[LandmarkProcessor.LEFT_KNEE],
-                    keypoints[LandmarkProcessor.LEFT_ANKLE]
-                )
-                right_knee_angle = LandmarkProcessor.calculate_angle(
-                    keypoints[LandmarkProcessor.RIGHT_HIP],
-                    keypoints[LandmarkProcessor.RIGHT_KNEE],
-                    keypoints[LandmarkProcessor.RIGHT_ANKLE]
-                )
-                angles['left_knee'] = left_knee_angle
-                angles['right_knee'] = right_knee_angle
-            
-            # Hip angles
-            if len(keypoints) > 25:
-                left_hip_angle = LandmarkProcessor.calculate_angle(
-                    keypoints[LandmarkProcessor.LEFT_SHOULDER],
-                    keypoints[LandmarkProcessor.LEFT_HIP],
-                    keypoints[LandmarkProcessor.LEFT_KNEE]
-                )
-                right_hip_angle = LandmarkProcessor.calculate_angle(
-                    keypoints[LandmarkProcessor.RIGHT_SHOULDER],
-                    keypoints[LandmarkProcessor.RIGHT_HIP],
-                    keypoints[LandmarkProcessor.RIGHT_KNEE]
-                )
-                angles['left_hip'] = left_hip_angle
-                angles['right_hip'] = right_hip_angle
-        except Exception as e:
-            logger.warning(f"Error calculating angles: {e}")
-        
-        return angles
-
-    def analyze_image(self, image, exercise_type: str):
-        """Analyze a single image"""
-        results = self.detector.process_image(image)
-        if not results or not results.pose_landmarks:
+        return results
+
+    def analyze_image(self, image, exercise_type: str, quality: str = None):
+        """Analyze a single image, blocking until a pool worker returns"""
+        complexity = resolve_tier(quality)
+        landmarks = self.pool.detect_sync(image, complexity)
+        if landmarks is None:
             logger.warning("No pose detected in image")
             return None
-        
-        # Convert landmarks to format expected by scorer
-        landmarks_list = self._convert_landmarks_to_list(results.pose_landmarks)
-        angles = self._calculate_angles(results.pose_landmarks)
-        
-        # Get scorer and calculate score/feedback
-        scorer = self.scorer_factory.get_scorer(exercise_type)
-        score = scorer.calculate_score(landmarks_list, angles)
-        feedback = scorer.generate_feedback(landmarks_list, angles, score)
-        
-        landmarks_dict = self.detector.get_landmarks_dict(results.pose_landmarks)
-        
-        return {
-            "landmarks": landmarks_dict,
-            "score": score,
-            "feedback": feedback
-        }
 
-    def analyze_frame(self, frame, exercise_type: str):
-        """Analyze a video frame"""
-        results = self.detector.process_frame(frame)
-        
-        if not results or not results.pose_landmarks:
+        result = self.analyze_landmarks(landmarks, exercise_type)
+        result["model_tier"] = model_name(complexity)
+        return result
+
+    async def analyze_image_async(self, image, exercise_type: str, quality: str = None):
+        """Analyze a single image without blocking the event loop"""
+        complexity = resolve_tier(quality)
+        landmarks = await self.pool.detect(image, complexity)
+        if landmarks is None:
+            logger.warning("No pose detected in image")
             return None
-        
-        # Convert landmarks to format expected by scorer
-        landmarks_list = self._convert_landmarks_to_list(results.pose_landmarks)
-        angles = self._calculate_angles(results.pose_landmarks)
-        
-        # Get scorer and calculate score/feedback
-        scorer = self.scorer_factory.get_scorer(exercise_type)
-        score = scorer.calculate_score(landmarks_list, angles)
-        feedback = scorer.generate_feedback(landmarks_list, angles, score)
-        
-        # Get landmarks dict for frontend AR overlay
-        landmarks_dict = self.detector.get_landmarks_dict(results.pose_landmarks)
-        
-        return {
-            "landmarks": landmarks_dict,
-            "score": score,
-            "feedback": feedback
-        }
\ No newline at end of file
+
+        result = self.analyze_landmarks(landmarks, exercise_type)
+        result["model_tier"] = model_name(complexity)
+        return result
+
+    def _cache_lookup(self, contents: bytes, complexity: int):
+        """Key an upload and look it up, returning (key, hit, landmarks)"""
+        key = self.cache.make_key(contents, complexity)
+        return (key,) + tuple(self.cache.get(key))
+
+    async def analyze_image_bytes_async(
+        self,
+        contents: bytes,
+        exercise_type: str,
+        quality: str = None,
+        keep_image: bool = False
+    ):
+        """
+        Analyze raw upload bytes, reusing cached landmarks for images seen before
+
+        Args:
+            contents: Raw image file bytes
+            exercise_type: Exercise to score
+            quality: Model tier name, defaults to the configured tier
+            keep_image: Decode the image even on a cache hit, e.g. for annotation
+
+        Returns:
+            Tuple of the analysis result (None if no pose found) and the
+            decoded BGR image (None if it did not need decoding)
+
+        Raises:
+            ValueError: If the bytes are not a decodable image
+        """
+        complexity = resolve_tier(quality)
+        key = None
+        hit, landmarks = False, None
+        if self.cache is not None:
+            # Hashing the upload and the disk tier both block, keep them off the event loop
+            key, hit, landmarks = await asyncio.to_thread(self._cache_lookup, contents, complexity)
+
+        image = None
+        if not hit or keep_image:
+            image = await asyncio.to_thread(decode_image_bytes, contents)
+            if image is None:
+                raise ValueError("Invalid image")
+
+        if not hit:
+            landmarks = await self.pool.detect(image, complexity)
+            if self.cache is not None:
+                await asyncio.to_thread(self.cache.put, key, landmarks)
+
+        if landmarks is None:
+            logger.warning("No pose detected in image")
+            return None, image
+
+        result = self.analyze_landmarks(landmarks, exercise_type)
+        result["model_tier"] = model_name(complexity)
+        result["cached"] = hit
+        return result, image
+
+    @property
+    def supports_batch(self) -> bool:
+        """Whether the configured backend runs several frames per model call"""
+        return self.detector.get_backend().supports_batch
+
+    def detect_batch(self, frames, quality: str = None):
+        """Detect landmarks in a list of standalone frames, one result per frame"""
+        return self.detector.detect_batch(frames, resolve_tier(quality))
+
+    def detect_frame(self, frame, session_id: str = None, quality: str = None):
+        """Detect landmarks in a video frame without scoring them"""
+        return self.detector.detect_frame(frame, session_id, resolve_tier(quality))
+
+    def analyze_frame(
+        self,
+        frame,
+        exercise_type: str,
+        session_id: str = None,
+        quality: str = None,
+        optical_flow: bool = False,
+        scorer=None,
+        timestamp: float = None,
+        rep_counter=None,
+        feedback_engine=None,
+        render: bool = True
+    ):
+        """
+        Analyze a video frame using the session's tracking graph
+
+        Args:
+            frame: BGR video frame
+            exercise_type: Exercise to score
+            session_id: Session whose tracking state is used
+            quality: Model tier name, defaults to the configured tier
+            optical_flow: Propagate the previous landmarks with optical flow
+                and only run the detector when the flow loses them
+            scorer: Scorer already resolved for the session, looked up here if omitted
+            timestamp: Frame time in seconds for the session's smoothing filter
+                and rep counter, defaults to the arrival time
+            rep_counter: The session's RepCounter, adds "reps" progress to the result
+            feedback_engine: The session's FeedbackEngine, adds the deduplicated
+                "feedback_update" to the result
+            render: Render the "feedback" list, see analyze_landmarks
+        """
+        complexity = resolve_tier(quality)
+        if optical_flow and session_id is not None:
+            landmarks, source = self.detector.track_frame(frame, session_id, complexity)
+        else:
+            landmarks, source = self.detector.detect_frame(frame, session_id, complexity), "detected"
+        if landmarks is None:
+            return None
+
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if session_id is not None:
+            landmarks = self.detector.smooth_landmarks(session_id, landmarks, timestamp)
+
+        # One lazy feature graph per frame, shared by the scorer and the rep counter
+        angles = FrameFeatures(as_frame(landmarks))
+        result = self.analyze_landmarks(
+            landmarks, exercise_type, angles, scorer=scorer,
+            feedback_engine=feedback_engine, timestamp=timestamp, render=render
+        )
+        # Session frames run on MediaPipe tracking graphs whatever INFERENCE_BACKEND is
+        result["model_tier"] = tier_name(complexity) if session_id is not None else model_name(complexity)
+        result["source"] = source
+        if rep_counter is not None:
+            rep = rep_counter.update(angles, timestamp, result["score"].get("overall"))
+            result["reps"] = rep_counter.progress(rep)
+        return result
+
+    def track_frame(self, frame, session_id: str, quality: str = None):
+        """
+        Get landmarks for a video frame, propagating them with optical flow when possible
+
+        Returns:
+            Tuple of landmarks (or None) and "tracked" or "detected"
+        """
+        return self.detector.track_frame(frame, session_id, resolve_tier(quality))
+
+    def end_session(self, session_id: str):
+        """Release per-session detection state"""
+        self.detector.release_tracker(session_id)
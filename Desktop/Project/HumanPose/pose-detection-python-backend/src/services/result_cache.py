@@ -0,0 +1,219 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.config import settings
+from src.ml.backends import backend_tier
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Stored on disk for images where no pose was found
+_NO_POSE = np.empty((0, 4), dtype=np.float32)
+
+
+class LandmarkCache:
+    """
+    Cache detected landmarks keyed by a hash of the uploaded bytes.
+
+    Only landmarks are cached, never scores, so the same photo can be
+    re-scored for another exercise without running inference again.
+    "No pose found" is cached as well so retries of a bad photo are cheap.
+    Entries live in a bounded in-memory LRU with a TTL, optionally backed
+    by .npy files that survive restarts. The disk tier is swept from put()
+    at most every sweep_interval seconds: expired files are removed, then
+    the oldest ones beyond max_disk_entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600,
+        disk_dir: Optional[str] = None,
+        max_disk_entries: int = 10000,
+        sweep_interval: float = 300
+    ):
+        """
+        Args:
+            max_entries: Entries kept in memory before the least recently used is dropped
+            ttl_seconds: Age after which an entry is no longer served
+            disk_dir: Directory for the on-disk tier, None keeps the cache in memory only.
+                Landmarks of users' photos are stored there, keep it out of any
+                directory the app serves.
+            max_disk_entries: Files kept in the disk tier after a sweep
+            sweep_interval: Minimum seconds between two sweeps of the disk tier
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self.max_disk_entries = max(1, max_disk_entries)
+        self.sweep_interval = sweep_interval
+
+        self._entries: "OrderedDict[str, Tuple[float, Optional[np.ndarray]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._last_sweep = 0.0
+        self._swept = 0
+
+    @staticmethod
+    def make_key(contents: bytes, complexity: int) -> str:
+        """Build the cache key for raw image bytes analyzed on a model tier"""
+        digest = hashlib.blake2b(contents, digest_size=20).hexdigest()
+        tier = backend_tier(complexity)
+        # Exported-model backends give the same landmarks on every tier
+        return f"{digest}-{settings.INFERENCE_BACKEND}" + ("" if tier is None else f"-{tier}")
+
+    def get(self, key: str) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Look up landmarks for a key
+
+        Returns:
+            Tuple of (hit, landmarks). A hit with None landmarks means the
+            image was analyzed before and had no pose.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, landmarks = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._memory_hits += 1
+                    return True, landmarks
+                del self._entries[key]
+
+        found, landmarks, stored_at = self._read_disk(key, now)
+        with self._lock:
+            if found:
+                self._disk_hits += 1
+                self._store(key, landmarks, stored_at)
+            else:
+                self._misses += 1
+        return found, landmarks
+
+    def put(self, key: str, landmarks: Optional[np.ndarray]):
+        """Store landmarks (or None for "no pose") under a key"""
+        now = time.time()
+        with self._lock:
+            self._store(key, landmarks, now)
+            sweep = self.disk_dir is not None and now - self._last_sweep >= self.sweep_interval
+            if sweep:
+                self._last_sweep = now
+        self._write_disk(key, landmarks)
+        if sweep:
+            self.sweep()
+
+    def _store(self, key: str, landmarks: Optional[np.ndarray], stored_at: float):
+        self._entries[key] = (stored_at, landmarks)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, key: str, now: float) -> Tuple[bool, Optional[np.ndarray], float]:
+        if self.disk_dir is None:
+            return False, None, 0.0
+        path = self.disk_dir / f"{key}.npy"
+        try:
+            stored_at = path.stat().st_mtime
+            if now - stored_at > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return False, None, 0.0
+            landmarks = np.load(path)
+        except FileNotFoundError:
+            return False, None, 0.0
+        except Exception as e:
+            logger.warning(f"Unreadable cache entry {path}: {e}")
+            return False, None, 0.0
+        return True, (landmarks if len(landmarks) else None), stored_at
+
+    def _write_disk(self, key: str, landmarks: Optional[np.ndarray]):
+        if self.disk_dir is None:
+            return
+        path = self.disk_dir / f"{key}.npy"
+        tmp_path = path.with_suffix(".tmp.npy")
+        try:
+            np.save(tmp_path, _NO_POSE if landmarks is None else landmarks)
+            tmp_path.replace(path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry {path}: {e}")
+
+    def sweep(self) -> int:
+        """
+        Bound the disk tier: remove expired files, then the oldest beyond max_disk_entries
+
+        Returns:
+            Number of files removed
+        """
+        if self.disk_dir is None:
+            return 0
+
+        now = time.time()
+        kept = []
+        removed = 0
+        for path in self.disk_dir.glob("*.npy"):
+            try:
+                stored_at = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if now - stored_at > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                removed += 1
+            elif not path.name.endswith(".tmp.npy"):
+                # Writes in flight only go once they are as old as an expired entry
+                kept.append((stored_at, path))
+
+        if len(kept) > self.max_disk_entries:
+            kept.sort()
+            for _, path in kept[:len(kept) - self.max_disk_entries]:
+                path.unlink(missing_ok=True)
+                removed += 1
+
+        with self._lock:
+            self._swept += removed
+        if removed:
+            logger.info(f"🧹 Removed {removed} landmark cache files from {self.disk_dir}")
+        return removed
+
+    def clear(self):
+        """Drop every entry, in memory and on disk"""
+        with self._lock:
+            self._entries.clear()
+        if self.disk_dir is not None:
+            for path in self.disk_dir.glob("*.npy"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and occupancy"""
+        with self._lock:
+            hits = self._memory_hits + self._disk_hits
+            lookups = hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": hits,
+                "memory_hits": self._memory_hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+                "disk": self.disk_dir is not None,
+                "disk_swept": self._swept
+            }
+
+
+# Global instance
+landmark_cache = LandmarkCache(
+    max_entries=settings.RESULT_CACHE_SIZE,
+    ttl_seconds=settings.RESULT_CACHE_TTL,
+    disk_dir=settings.RESULT_CACHE_DIR if settings.RESULT_CACHE_DISK else None,
+    max_disk_entries=settings.RESULT_CACHE_DISK_SIZE,
+    sweep_interval=settings.RESULT_CACHE_SWEEP_INTERVAL
+)
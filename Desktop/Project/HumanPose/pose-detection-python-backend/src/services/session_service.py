@@ -1,9 +1,11 @@
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List, Set
 import json
+import os
+import threading
 from pathlib import Path
 
-from src.models.session import Session, SessionStatus
+from src.models.session import Session, SessionStatus, SessionSummary
 from src.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -11,10 +13,19 @@ logger = setup_logger(__name__)
 class SessionService:
     """
     Manage user exercise sessions
+
+    Sessions are changed from API handlers on the event loop and from the
+    job engine's threads, every change and snapshot goes through _lock.
+    Disk writes are serialized by _write_lock instead, so a slow write
+    never holds up a change in memory.
     """
     
     def __init__(self):
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
         self.sessions: Dict[str, Session] = {}
+        # Live sessions started and not yet ended by this process
+        self.live_sessions: Set[str] = set()
         self.sessions_dir = Path("sessions")
         self.sessions_dir.mkdir(exist_ok=True)
         logger.info("✅ SessionService initialized")
@@ -24,7 +35,8 @@ class SessionService:
         # FIX: Add 'type' as a required parameter
         type: str,
         exercise_type: str,
-        file_path: Optional[str] = None
+        file_path: Optional[str] = None,
+        model_tier: Optional[str] = None
     ) -> Session:
         """
         Create a new exercise session
@@ -32,6 +44,7 @@ class SessionService:
         Args:
             exercise_type: Type of exercise
             file_path: Optional file path for session data
+            model_tier: Pose model tier used for analysis
             
         Returns:
             New session object
@@ -41,9 +54,13 @@ class SessionService:
             type=type,
             exercise_type=exercise_type,
             file_path=file_path,
+            model_tier=model_tier,
             status=SessionStatus.INITIALIZING
         )
-        self.sessions[str(session.id)] = session
+        with self._lock:
+            self.sessions[str(session.id)] = session
+            if type == "live":
+                self.live_sessions.add(str(session.id))
         logger.info(f"Created session {session.id} of type '{type}' for {exercise_type}")
         self._save_session(session)
         return session
@@ -55,50 +72,115 @@ class SessionService:
     def update_session_status(self, session_id: str, status: str, 
                              progress: Optional[int] = None) -> Optional[Session]:
         """Update session status and progress"""
-        session = self.sessions.get(session_id)
-        if not session:
-            return None
-        
-        session.status = SessionStatus(status)
+        fields = {"status": SessionStatus(status)}
         if progress is not None:
-            session.progress = progress
-        session.updated_at = datetime.now()
-        self._save_session(session)
+            fields["progress"] = progress
+        return self.update_session(session_id, **fields)
+
+    def update_session(self, session_id: str, save: bool = True, **fields: Any) -> Optional[Session]:
+        """
+        Set fields of a session
+
+        Args:
+            session_id: Session to change
+            save: Write the session to disk as well
+            **fields: Session attributes to set
+
+        Returns:
+            The updated session, None if unknown
+        """
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if not session:
+                return None
+            for name, value in fields.items():
+                setattr(session, name, value)
+            session.updated_at = datetime.now()
+        if save:
+            self._save_session(session)
         return session
     
-    # FIX: Update add_result to populate the new model fields correctly
-    def add_frame_results(self, session_id: str, frame_results: List[Dict]) -> Optional[Session]:
-        session = self.sessions.get(session_id)
+    def is_at_capacity(self, max_sessions: int) -> bool:
+        """Check whether max_sessions live sessions are already running"""
+        with self._lock:
+            return len(self.live_sessions) >= max_sessions
+
+    def increment_frame_count(self, session_id: str):
+        """Count a frame received by a live session, kept in memory until the session ends"""
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session:
+                session.frame_count += 1
+
+    def end_session(self, session_id: str) -> Optional[SessionSummary]:
+        """
+        Mark a live session completed and save it
+
+        Returns:
+            Summary of the ended session, None if unknown
+        """
+        with self._lock:
+            self.live_sessions.discard(session_id)
+        session = self.update_session(session_id, status=SessionStatus.COMPLETED, progress=100)
         if not session:
             return None
-        
-        session.results = frame_results
+
+        logger.info(f"Ended session {session_id} after {session.frame_count} frames")
+        return SessionSummary(
+            id=session_id,
+            type=session.type,
+            status=session.status,
+            progress=session.progress,
+            created_at=session.created_at,
+            updated_at=session.updated_at
+        )
+
+    def delete_session(self, session_id: str):
+        """Forget a session and remove its file"""
+        with self._lock:
+            self.sessions.pop(session_id, None)
+            self.live_sessions.discard(session_id)
+        try:
+            with self._write_lock:
+                (self.sessions_dir / f"{session_id}.json").unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to delete session {session_id}: {e}")
+
+    # FIX: Update add_result to populate the new model fields correctly
+    def add_frame_results(self, session_id: str, frame_results: List[Dict]) -> Optional[Session]:
+        fields = {"results": frame_results, "status": SessionStatus.COMPLETED}
         
         # Calculate average score
         scores = [r['score'] for r in frame_results if r.get('score') is not None]
         if scores:
-            session.score = sum(scores) / len(scores)
-            session.feedback = f"Video analysis complete. Average score: {session.score:.1f}/100"
+            fields["score"] = sum(scores) / len(scores)
+            fields["feedback"] = f"Video analysis complete. Average score: {fields['score']:.1f}/100"
         else:
-            session.feedback = "No valid poses detected in video"
+            fields["feedback"] = "No valid poses detected in video"
         
-        session.status = SessionStatus.COMPLETED
-        session.updated_at = datetime.now()
-        
-        self._save_session(session)
+        session = self.update_session(session_id, **fields)
+        if not session:
+            return None
         logger.info(f"Results added to session {session_id}, avg score: {session.score}")
         return session
     
     def get_all_sessions(self) -> List[Session]:
         """Get all sessions"""
-        return list(self.sessions.values())
+        with self._lock:
+            return list(self.sessions.values())
     
     def _save_session(self, session: Session):
-        """Save session to disk"""
+        """Save session to disk, replacing the file in one step so readers never see half of it"""
         try:
-            session_file = self.sessions_dir / f"{session.id}.json"
-            with open(session_file, 'w') as f:
-                json.dump(session.dict(), f, indent=2, default=str)
+            with self._write_lock:
+                # Snapshot taken in write order, a later write always carries later changes
+                with self._lock:
+                    data = session.dict()
+                session_file = self.sessions_dir / f"{session.id}.json"
+                temp_file = session_file.with_suffix(".json.tmp")
+                with open(temp_file, 'w') as f:
+                    json.dump(data, f, indent=2, default=str)
+                os.replace(temp_file, session_file)
         except Exception as e:
             logger.error(f"Failed to save session {session.id}: {e}")
     
@@ -0,0 +1,213 @@
+import math
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Overall scores are binned into HISTOGRAM_BINS equal-width bins over 0-100
+HISTOGRAM_BINS = 10
+
+
+class RunningStat:
+    """
+    Running count, mean, variance and extremes of one value (Welford's algorithm)
+    """
+
+    __slots__ = ("count", "mean", "m2", "min", "min_frame", "max", "max_frame")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.min_frame: Optional[int] = None
+        self.max = -math.inf
+        self.max_frame: Optional[int] = None
+
+    def update(self, value: float, frame: Optional[int] = None):
+        """Add one value in O(1)"""
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min, self.min_frame = value, frame
+        if value > self.max:
+            self.max, self.max_frame = value, frame
+
+    def merge(self, other: "RunningStat"):
+        """Fold in statistics gathered separately, e.g. on another chunk of the video"""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            for name in self.__slots__:
+                setattr(self, name, getattr(other, name))
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+        if other.min < self.min:
+            self.min, self.min_frame = other.min, other.min_frame
+        if other.max > self.max:
+            self.max, self.max_frame = other.max, other.max_frame
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.count == 0:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 2),
+            "std": round(math.sqrt(self.variance), 2),
+            "min": round(self.min, 2),
+            "min_frame": self.min_frame,
+            "max": round(self.max, 2),
+            "max_frame": self.max_frame
+        }
+
+
+class SessionStats:
+    """
+    Incremental summary of a session's scored frames.
+
+    Every update is O(1) in the number of frames seen, so the summary is
+    available at any point of a job or live session without keeping the
+    frames around.
+    """
+
+    def __init__(self):
+        self.overall = RunningStat()
+        self.breakdown: Dict[str, RunningStat] = {}
+        self.histogram = [0] * HISTOGRAM_BINS
+        self.feedback_types: Counter = Counter()
+        self.feedback_messages: Counter = Counter()
+
+    @property
+    def frames(self) -> int:
+        return self.overall.count
+
+    def update(self, score: Dict[str, Any], feedback: Optional[List[Dict[str, Any]]] = None, frame: Optional[int] = None):
+        """
+        Add one scored frame
+
+        Args:
+            score: Score dict with "overall" and optional "breakdown"
+            feedback: Feedback dicts of the frame, or its (message, params)
+                emissions when the feedback was not rendered
+            frame: Frame number, recorded for the best and worst frames,
+                defaults to the number of frames seen so far
+        """
+        if frame is None:
+            frame = self.frames
+        overall = score.get("overall", 0) if isinstance(score, dict) else score
+        if not isinstance(overall, (int, float)):
+            overall = 0
+        self.overall.update(overall, frame)
+        bin_index = min(max(int(overall * HISTOGRAM_BINS // 100), 0), HISTOGRAM_BINS - 1)
+        self.histogram[bin_index] += 1
+
+        if isinstance(score, dict):
+            for key, value in score.get("breakdown", {}).items():
+                if isinstance(value, (int, float)):
+                    stat = self.breakdown.get(key)
+                    if stat is None:
+                        stat = self.breakdown[key] = RunningStat()
+                    stat.update(value, frame)
+
+        for item in feedback or ():
+            if isinstance(item, dict):
+                self.feedback_types[item.get("type")] += 1
+                self.feedback_messages[item.get("message")] += 1
+            elif isinstance(item, tuple):
+                message, params = item
+                self.feedback_types[message.type] += 1
+                self.feedback_messages[message.text.format(**params) if params else message.text] += 1
+
+    def merge(self, other: "SessionStats"):
+        """Fold in the statistics of another part of the same session"""
+        self.overall.merge(other.overall)
+        for key, stat in other.breakdown.items():
+            self.breakdown.setdefault(key, RunningStat()).merge(stat)
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+        self.feedback_types.update(other.feedback_types)
+        self.feedback_messages.update(other.feedback_messages)
+
+    @property
+    def average_score(self) -> float:
+        return self.overall.mean
+
+    def breakdown_means(self, decimals: int = 1) -> Dict[str, float]:
+        """Average of every breakdown key"""
+        return {key: round(stat.mean, decimals) for key, stat in self.breakdown.items()}
+
+    def feedback_summary(self) -> List[Dict[str, str]]:
+        """Overall coaching messages from the share of success, warning and error feedback"""
+        success_count = self.feedback_types["success"]
+        warning_count = self.feedback_types["warning"]
+        error_count = self.feedback_types["error"]
+        total_feedback_items = success_count + warning_count + error_count
+
+        feedback_summary = []
+        if total_feedback_items == 0:
+            return feedback_summary
+
+        success_percentage = (success_count / total_feedback_items) * 100
+        warning_percentage = (warning_count / total_feedback_items) * 100
+        error_percentage = (error_count / total_feedback_items) * 100
+
+        if success_percentage >= 60:
+            feedback_summary.append({
+                'type': 'success',
+                'message': 'Great form overall! Most of your movements show good technique.'
+            })
+        elif success_percentage >= 40:
+            feedback_summary.append({
+                'type': 'success',
+                'message': 'Good effort! You maintained proper form for a significant portion of the exercise.'
+            })
+
+        if warning_percentage >= 30:
+            feedback_summary.append({
+                'type': 'warning',
+                'message': 'Some minor form adjustments could improve your technique. Focus on maintaining consistency.'
+            })
+        elif warning_percentage >= 15:
+            feedback_summary.append({
+                'type': 'warning',
+                'message': 'A few areas need attention. Small adjustments will help improve your overall form.'
+            })
+
+        if error_percentage >= 30:
+            feedback_summary.append({
+                'type': 'error',
+                'message': 'Several form corrections are needed. Review the specific feedback below and focus on these areas.'
+            })
+        elif error_percentage >= 15:
+            feedback_summary.append({
+                'type': 'error',
+                'message': 'Some form issues detected. Pay attention to the recommendations below.'
+            })
+
+        return feedback_summary
+
+    def summary(self, top_messages: int = 10) -> Dict[str, Any]:
+        """JSON-friendly snapshot, cheap enough to build on every request"""
+        return {
+            "frames": self.frames,
+            "score": {
+                **self.overall.to_dict(),
+                "histogram": list(self.histogram)
+            },
+            "breakdown": {key: stat.to_dict() for key, stat in self.breakdown.items()},
+            "feedback": {
+                "by_type": dict(self.feedback_types),
+                "top_messages": [
+                    {"message": message, "count": count}
+                    for message, count in self.feedback_messages.most_common(top_messages)
+                ]
+            }
+        }
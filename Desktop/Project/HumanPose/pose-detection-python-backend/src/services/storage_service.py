@@ -1,3 +1,4 @@
+import os
 from typing import Optional, List
 from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime
@@ -12,6 +13,14 @@ from src.utils.logger import setup_logger
 logger = setup_logger(__name__)
 
 
+class UploadRejected(Exception):
+    """An upload refused for its type or size, status_code is the HTTP status to answer with"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
 class StorageService:
     """
     Handle database operations with MongoDB and file storage
@@ -27,11 +36,14 @@ class StorageService:
         self.images_dir = self.uploads_dir / "images"
         self.videos_dir = self.uploads_dir / "videos"
         self.results_dir = Path("results")
+        # Uploads in progress, on the same filesystem so finished ones can be renamed into place
+        self.incoming_dir = self.uploads_dir / "incoming"
 
         self.uploads_dir.mkdir(parents=True, exist_ok=True)
         self.images_dir.mkdir(parents=True, exist_ok=True)
         self.videos_dir.mkdir(parents=True, exist_ok=True)
         self.results_dir.mkdir(parents=True, exist_ok=True)
+        self.incoming_dir.mkdir(parents=True, exist_ok=True)
 
         logger.info("✅ StorageService initialized")
 
@@ -181,6 +193,121 @@ class StorageService:
             logger.error(f"Failed to save async file: {e}")
             raise
 
+    @staticmethod
+    def check_extension(filename: Optional[str], allowed_extensions: set) -> str:
+        """
+        Get an upload's extension, refusing types that are not allowed
+
+        Raises:
+            UploadRejected: 415 if the extension is not in allowed_extensions
+        """
+        ext = Path(filename or "").suffix.lower()
+        if ext not in allowed_extensions:
+            raise UploadRejected(
+                f"Unsupported file type '{ext or filename}', expected one of {', '.join(sorted(allowed_extensions))}",
+                status_code=415
+            )
+        return ext
+
+    @staticmethod
+    def _check_size(size: Optional[int], max_size: int):
+        if size is not None and size > max_size:
+            raise UploadRejected(
+                f"File too large, at most {round(max_size / (1024 * 1024), 2):g}MB allowed",
+                status_code=413
+            )
+
+    async def read_upload(self, file: UploadFile, allowed_extensions: set, max_size: Optional[int] = None) -> bytes:
+        """
+        Read a small upload, e.g. an image, into memory
+
+        Reads in UPLOAD_CHUNK_SIZE chunks and stops as soon as the upload
+        is over the size limit instead of reading all of it first.
+
+        Raises:
+            UploadRejected: For a disallowed extension (415) or size (413)
+        """
+        max_size = max_size or settings.MAX_FILE_SIZE
+        self.check_extension(file.filename, allowed_extensions)
+        self._check_size(file.size, max_size)
+
+        chunks = []
+        size = 0
+        while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            self._check_size(size, max_size)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def receive_upload(self, file: UploadFile, allowed_extensions: set, max_size: Optional[int] = None) -> Path:
+        """
+        Stream an upload to a temporary file in chunks
+
+        At most one chunk is held in memory, and writing goes through
+        aiofiles so the event loop never waits for the disk. An upload
+        over the size limit is refused as soon as it crosses it and its
+        partial file deleted. Move the result into place with store_upload.
+
+        Args:
+            file: The upload
+            allowed_extensions: Accepted lowercase extensions, e.g. {".mp4"}
+            max_size: Size limit in bytes, defaults to MAX_FILE_SIZE
+
+        Returns:
+            Path of the temporary file
+
+        Raises:
+            UploadRejected: For a disallowed extension (415) or size (413)
+        """
+        max_size = max_size or settings.MAX_FILE_SIZE
+        ext = self.check_extension(file.filename, allowed_extensions)
+        self._check_size(file.size, max_size)
+
+        # Keeps its extension, FFmpeg uses it to pick the demuxer when probing
+        temp_path = self.incoming_dir / f"{uuid.uuid4()}{ext}"
+        size = 0
+        try:
+            async with aiofiles.open(temp_path, "wb") as out:
+                while chunk := await file.read(settings.UPLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    self._check_size(size, max_size)
+                    await out.write(chunk)
+        except BaseException:
+            self.discard_upload(temp_path)
+            raise
+
+        logger.debug(f"Received upload {file.filename} ({size} bytes)")
+        return temp_path
+
+    def store_upload(self, temp_path: Path, subfolder: str = "videos") -> str:
+        """
+        Move a received upload into its uploads subfolder
+
+        A rename on the same filesystem, so the file appears in the
+        uploads folder complete or not at all.
+
+        Returns:
+            str: relative path like 'uploads/videos/<uuid>.ext'
+        """
+        target_dir = self.uploads_dir / subfolder
+        target_dir.mkdir(parents=True, exist_ok=True)
+        file_path = target_dir / temp_path.name
+        os.replace(temp_path, file_path)
+        logger.info(f"✅ File saved: {file_path}")
+        return str(file_path)
+
+    def unstore_upload(self, file_path: str, temp_path: Path):
+        """Move an upload stored by store_upload back to where it was received"""
+        os.replace(file_path, temp_path)
+        logger.info(f"Moved {file_path} back to {temp_path}")
+
+    def discard_upload(self, temp_path: Path):
+        """Delete a received upload that is not kept"""
+        try:
+            temp_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"Failed to delete upload {temp_path}: {e}")
+
     def save_result(self, data: bytes, filename: str) -> str:
         """Save analysis result and return path"""
         filepath = self.results_dir / filename
@@ -214,6 +341,7 @@ class StorageService:
 
         cutoff = datetime.now() - timedelta(hours=hours)
         deleted_count = 0
+        # Not incoming_dir: resumable uploads there expire by creation time (ResumableUploadStore.expire)
         for directory in [self.uploads_dir, self.results_dir]:
             for filepath in directory.iterdir():
                 if filepath.is_file():
@@ -0,0 +1,234 @@
+import asyncio
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Container, Dict, Optional
+
+import aiofiles
+
+from src.config import settings
+from src.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class UploadConflict(Exception):
+    """A chunk that does not continue the upload where it stands"""
+
+
+@dataclass
+class ResumableUpload:
+    """State of one resumable upload, persisted next to its data file"""
+    id: str
+    length: int
+    extension: str
+    metadata: Dict[str, str] = field(default_factory=dict)
+    offset: int = 0
+    created_at: float = field(default_factory=time.time)
+    # Set once the upload was handed to the analysis
+    session_id: Optional[str] = None
+    job_id: Optional[str] = None
+
+    @property
+    def complete(self) -> bool:
+        return self.offset >= self.length
+
+    @property
+    def expires_at(self) -> float:
+        return self.created_at + settings.RESUMABLE_UPLOAD_EXPIRY_HOURS * 3600
+
+
+class ResumableUploadStore:
+    """
+    Uploads received piece by piece, for the tus resumable upload routes.
+
+    Every upload is a data file the size of the whole upload, created
+    sparse so no disk is used for the parts not received yet, and a small
+    JSON file with its length, offset and metadata. Chunks are written at
+    their offset, and the offset is saved as they arrive, so after a
+    dropped connection the client only resends what was not stored.
+
+    Files live in uploads/incoming, where store_upload moves complete
+    uploads into place. expire(), run periodically by the app, removes
+    uploads older than RESUMABLE_UPLOAD_EXPIRY_HOURS counted from their
+    creation, so an upload resumed over several days is not cut off by
+    how recently a chunk arrived.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        """
+        Args:
+            directory: Where data and metadata files are kept
+        """
+        self.directory = Path(directory or Path(settings.UPLOAD_DIR) / "incoming")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # One writer per upload, a second PATCH for the same upload is refused
+        self._writing: set = set()
+
+    def _meta_path(self, upload_id: str) -> Path:
+        return self.directory / f"{upload_id}.json"
+
+    def data_path(self, upload: ResumableUpload) -> Path:
+        # Keeps its extension, FFmpeg uses it to pick the demuxer when probing
+        return self.directory / f"{upload.id}{upload.extension}"
+
+    def _save(self, upload: ResumableUpload):
+        """Write the metadata, replacing the old file in one step"""
+        meta_path = self._meta_path(upload.id)
+        temp_path = meta_path.with_suffix(".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(asdict(upload), f)
+        os.replace(temp_path, meta_path)
+
+    def create(self, length: int, extension: str, metadata: Dict[str, str]) -> ResumableUpload:
+        """
+        Start an upload
+
+        Args:
+            length: Total size in bytes
+            extension: Lowercase file extension, e.g. ".mp4"
+            metadata: Client metadata such as the file name and analysis options
+
+        Returns:
+            The new upload at offset 0
+        """
+        upload = ResumableUpload(id=uuid.uuid4().hex, length=length, extension=extension, metadata=metadata)
+        with open(self.data_path(upload), "wb") as f:
+            # Sparse: blocks are only allocated as chunks are written
+            f.truncate(length)
+        self._save(upload)
+        logger.info(f"Created resumable upload {upload.id} ({length} bytes)")
+        return upload
+
+    def get(self, upload_id: str) -> Optional[ResumableUpload]:
+        """Load an upload, None if unknown or already removed"""
+        # Ids are hex uuids, anything else could point outside the directory
+        if not upload_id.isalnum():
+            return None
+        try:
+            with open(self._meta_path(upload_id)) as f:
+                return ResumableUpload(**json.load(f))
+        except FileNotFoundError:
+            return None
+
+    async def append(self, upload: ResumableUpload, offset: int, chunks: AsyncIterator[bytes]) -> ResumableUpload:
+        """
+        Write the bytes of a PATCH request at the upload's offset
+
+        The offset is saved every UPLOAD_CHUNK_SIZE bytes and once more
+        when the stream ends or breaks off, so whatever arrived is kept.
+
+        Args:
+            upload: The upload
+            offset: Offset the client says the bytes start at
+            chunks: Request body
+
+        Returns:
+            The upload with its new offset
+
+        Raises:
+            UploadConflict: If offset is not the upload's offset or another
+                request is writing to the upload
+            ValueError: If the bytes run past the upload's length
+        """
+        if upload.id in self._writing:
+            raise UploadConflict("Upload is already receiving data")
+        if offset != upload.offset:
+            raise UploadConflict(f"Upload is at offset {upload.offset}, not {offset}")
+
+        self._writing.add(upload.id)
+        try:
+            async with aiofiles.open(self.data_path(upload), "r+b") as out:
+                await out.seek(upload.offset)
+                saved = upload.offset
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if upload.offset + len(chunk) > upload.length:
+                        raise ValueError(f"Upload is longer than the declared {upload.length} bytes")
+                    await out.write(chunk)
+                    upload.offset += len(chunk)
+                    if upload.offset - saved >= settings.UPLOAD_CHUNK_SIZE:
+                        # Never record an offset whose bytes are not on disk yet
+                        await out.flush()
+                        await asyncio.to_thread(self._save, upload)
+                        saved = upload.offset
+        finally:
+            self._writing.discard(upload.id)
+            self._save(upload)
+        return upload
+
+    def mark_queued(self, upload: ResumableUpload, session_id: str, job_id: str):
+        """Remember the analysis a complete upload was handed to"""
+        upload.session_id = session_id
+        upload.job_id = job_id
+        self._save(upload)
+
+    def delete(self, upload: ResumableUpload):
+        """
+        Remove an upload's data, if still there, and its metadata
+
+        Raises:
+            UploadConflict: If a request is still writing to the upload
+        """
+        if upload.id in self._writing:
+            raise UploadConflict("Upload is receiving data")
+        for path in (self.data_path(upload), self._meta_path(upload.id)):
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.error(f"Failed to delete {path}: {e}")
+
+    def expire(self, busy: Container[str] = ()) -> int:
+        """
+        Remove uploads past their expiry time
+
+        Also removes files that belong to no upload, e.g. direct uploads
+        cut off by a crash, once they were last written before the expiry
+        time.
+
+        Args:
+            busy: Ids of uploads that must be left alone, e.g. being queued
+
+        Returns:
+            Number of uploads and stray files removed
+        """
+        now = time.time()
+        cutoff = now - settings.RESUMABLE_UPLOAD_EXPIRY_HOURS * 3600
+        removed = 0
+        known = set()
+        for meta_path in self.directory.glob("*.json"):
+            upload = self.get(meta_path.stem)
+            if upload is None:
+                continue
+            known.add(upload.id)
+            if upload.expires_at > now or upload.id in busy:
+                continue
+            try:
+                self.delete(upload)
+            except UploadConflict:
+                # Still receiving data, left for the next sweep
+                continue
+            removed += 1
+
+        for path in self.directory.iterdir():
+            upload_id = path.name.split(".")[0]
+            if upload_id in known or not path.is_file():
+                continue
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError as e:
+                logger.error(f"Failed to delete {path}: {e}")
+
+        if removed:
+            logger.info(f"Expired {removed} abandoned uploads")
+        return removed
+
+
+# Global instance
+upload_store = ResumableUploadStore()
@@ -0,0 +1,548 @@
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import cv2
+import numpy as np
+
+from src.config import settings
+from src.ml.interpolation import KeyframeScheduler, interpolate_landmarks
+from src.services.clip_scorer import ClipScorer
+from src.services.pose_service import PoseService
+from src.utils.frame_reader import FrameReader
+from src.utils.logger import setup_hot_path_logger, setup_logger
+
+logger = setup_logger(__name__)
+# Per-frame errors of a broken video would otherwise log once per frame
+frame_logger = setup_hot_path_logger(__name__)
+
+# Built on first use, so importing this module in the API process costs nothing
+_pose_service: Optional[PoseService] = None
+
+# Event queue of a job worker process, set by init_job_worker
+_job_events = None
+
+# Share of a job's progress given to finding landmarks, scoring gets the rest up to 99
+DETECTION_PROGRESS = 90
+
+
+class VideoAnalysisError(Exception):
+    """The video could not be analyzed at all"""
+
+
+def get_pose_service() -> PoseService:
+    """The PoseService of this process, owning its own pose detector"""
+    global _pose_service
+    if _pose_service is None:
+        _pose_service = PoseService()
+    return _pose_service
+
+
+def seek_frame(cap: cv2.VideoCapture, frame_number: int) -> int:
+    """
+    Position a capture at or before frame_number
+
+    Seeking can land after the requested frame on containers with sparse
+    keyframes. When it does, the seek is retried further back, 16 frames
+    and then twice as far each time, until the capture is at or before frame_number; the
+    caller decodes forward from there.
+
+    Returns:
+        Number of the next frame the capture will return
+
+    Raises:
+        VideoAnalysisError: If no position at or before frame_number can be reached
+    """
+    target, back = frame_number, 16
+    while True:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+        landed = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        if landed <= frame_number:
+            return landed
+        if target == 0:
+            raise VideoAnalysisError(f"Cannot seek to frame {frame_number}, landed on {landed}")
+        target, back = max(0, frame_number - back), back * 2
+
+
+def detect_frames(
+    video_path: str,
+    session_id: str,
+    quality: str = None,
+    keyframe_interval: int = 1,
+    optical_flow: bool = False,
+    start: int = 0,
+    end: Optional[int] = None,
+    warmup: int = 0,
+    progress: Optional[Callable[[int], None]] = None,
+    pose_service: Optional[PoseService] = None,
+    sink: Optional[Callable[[int, np.ndarray, str], None]] = None
+) -> Dict[str, Any]:
+    """
+    Find the landmarks of every frame of a video, or of the frames [start, end)
+
+    With keyframe_interval > 1 detection only runs on every keyframe_interval-th
+    frame (or sooner when the scene moves a lot) and the frames in between
+    get landmarks interpolated from the surrounding keyframes. With
+    optical_flow the landmarks are carried forward by optical flow and the
+    detector only runs when the flow loses them. Otherwise, when the
+    inference backend can batch, frames are detected INFERENCE_BATCH_SIZE
+    at a time.
+
+    Args:
+        video_path: Path of the uploaded video
+        session_id: Keys the tracking state, unique per concurrently analyzed segment
+        quality: Model tier name, defaults to the configured tier
+        keyframe_interval: Detect every keyframe_interval-th frame
+        optical_flow: Track landmarks between detections
+        start: First frame to record
+        end: Frame to stop at, None = end of the video
+        warmup: Frames before start that are analyzed but not recorded,
+            so tracking, keyframes and optical flow are settled at start
+        progress: Called with the percentage of the frames read
+        pose_service: Service to analyze with, defaults to this process's
+        sink: Called with frame number, landmarks and source of each frame
+            in frame order as soon as it is known, instead of collecting
+            them in "records", e.g. ClipScorer.add
+
+    Returns:
+        Dict with "records" ((frame number, landmarks, source) tuples in
+        frame order, empty with a sink), "frame_stats" (including the
+        decode "pipeline" stats), "fps" and "frame_range", the [first,
+        last + 1) frame numbers recorded or skipped for lack of a pose
+
+    Raises:
+        VideoAnalysisError: If the video cannot be opened, or not read from start
+    """
+    pose_service = pose_service or get_pose_service()
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        logger.error(f"Cannot open video: {video_path}")
+        raise VideoAnalysisError(f"Cannot open video: {video_path}")
+
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if end is None or end > frame_count > 0:
+        end = frame_count if frame_count > 0 else None
+
+    frame_records = []  # (frame number, landmarks, source)
+    scheduler = KeyframeScheduler(keyframe_interval, settings.KEYFRAME_MOTION_THRESHOLD)
+    frame_stats = {"keyframe_interval": scheduler.interval, "detected": 0, "interpolated": 0, "tracked": 0}
+    last_keyframe = None  # (frame number, landmarks) of the newest detected keyframe
+    pending_frames = []  # frame numbers waiting for the next keyframe
+    held_frame = None  # pixels of the newest pending frame, detected if the video ends
+    batch_frames = [] if (
+        not optical_flow and scheduler.interval == 1 and pose_service.supports_batch
+    ) else None  # (frame number, pixels) waiting for a batched detection
+
+    # Batched frames are detected independently, there is no state to warm up
+    read_start = start if batch_frames is not None else max(0, start - warmup)
+    first_frame = 0
+    if read_start > 0:
+        try:
+            first_frame = seek_frame(cap, read_start)
+        except VideoAnalysisError:
+            cap.release()
+            raise
+    total = (end - first_frame) if end else 0
+    last_frame = first_frame - 1  # newest frame read
+
+    if progress is not None:
+        progress(0)
+
+    def record_frame(number, landmarks, source):
+        # Warm-up frames belong to the previous segment
+        if number >= start:
+            if sink is not None:
+                sink(number, landmarks, source)
+            else:
+                frame_records.append((number, landmarks, source))
+            frame_stats[source] += 1
+
+    def analyze_keyframe(number, frame):
+        nonlocal last_keyframe
+        try:
+            landmarks = pose_service.detect_frame(frame, session_id, quality)
+        except Exception as e:
+            frame_logger.error("Error on frame %s: %s", number, e)
+            landmarks = None
+        scheduler.mark_keyframe(frame, landmarks is not None)
+
+        if landmarks is None:
+            # Can't interpolate across a frame without a pose
+            pending_frames.clear()
+            last_keyframe = None
+            return
+
+        if last_keyframe is not None and pending_frames:
+            start_number, start_landmarks = last_keyframe
+            filled = interpolate_landmarks(start_landmarks, landmarks, number - start_number - 1)
+            for pending_number in pending_frames:
+                record_frame(pending_number, filled[pending_number - start_number - 1], "interpolated")
+        pending_frames.clear()
+
+        record_frame(number, landmarks, "detected")
+        last_keyframe = (number, landmarks)
+
+    def flush_batch():
+        try:
+            detected = pose_service.detect_batch([frame for _, frame in batch_frames], quality)
+        except Exception as e:
+            frame_logger.error("Error on frames %s-%s: %s", batch_frames[0][0], batch_frames[-1][0], e)
+            detected = [None] * len(batch_frames)
+        for (number, _), landmarks in zip(batch_frames, detected):
+            if landmarks is not None:
+                record_frame(number, landmarks, "detected")
+        batch_frames.clear()
+
+    # The next frames are decoded on a background thread while this one is analyzed
+    reader = FrameReader(cap, first_frame, end, settings.VIDEO_DECODE_QUEUE_SIZE)
+    try:
+        for frame_number, frame in reader:
+            last_frame = frame_number
+            if frame_number < read_start:
+                # Decoding forward from where an inexact seek landed
+                continue
+            if optical_flow:
+                try:
+                    landmarks, source = pose_service.track_frame(frame, session_id, quality)
+                except Exception as e:
+                    frame_logger.error("Error on frame %s: %s", frame_number, e)
+                    landmarks = None
+                if landmarks is not None:
+                    record_frame(frame_number, landmarks, source)
+            elif batch_frames is not None:
+                batch_frames.append((frame_number, frame))
+                if len(batch_frames) >= settings.INFERENCE_BATCH_SIZE:
+                    flush_batch()
+            elif scheduler.should_detect(frame):
+                analyze_keyframe(frame_number, frame)
+                held_frame = None
+            else:
+                pending_frames.append(frame_number)
+                held_frame = frame
+
+            if progress is not None and (frame_number + 1) % 10 == 0 and total > 0:
+                progress(min(int(((frame_number + 1 - first_frame) / total) * 100), 99))
+
+        if batch_frames:
+            flush_batch()
+
+        # Close the tail by promoting the last frame to a keyframe
+        if pending_frames and held_frame is not None:
+            analyze_keyframe(pending_frames.pop(), held_frame)
+    finally:
+        reader.close()
+        cap.release()
+        pose_service.end_session(session_id)
+
+    frame_stats["pipeline"] = reader.stats()
+    # Interpolated frames are recorded before their closing keyframe, every mode emits in frame order
+    return {
+        "records": frame_records,
+        "frame_stats": frame_stats,
+        "fps": fps,
+        "frame_range": (start, max(start, last_frame + 1))
+    }
+
+
+def stitch_segments(segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Join the detect_frames output of consecutive segments into one timeline
+
+    Args:
+        segments: detect_frames results in segment order
+
+    Returns:
+        detect_frames-style dict for the whole video, each frame once
+
+    Raises:
+        VideoAnalysisError: If frames between two segments were not read
+    """
+    covered = 0
+    for segment in segments:
+        first, stop = segment["frame_range"]
+        if first > covered:
+            raise VideoAnalysisError(f"Frames {covered}-{first - 1} missing between segments")
+        covered = max(covered, stop)
+
+    records = []
+    frame_stats = dict(segments[0]["frame_stats"])
+    for key in ("detected", "interpolated", "tracked"):
+        frame_stats[key] = 0
+
+    frame_stats["pipeline"] = FrameReader.merge_stats(
+        [segment["frame_stats"]["pipeline"] for segment in segments]
+    )
+
+    last_number = -1
+    for segment in segments:
+        for record in segment["records"]:
+            # An inexact seek can make neighbouring segments overlap, keep the earlier copy
+            if record[0] > last_number:
+                records.append(record)
+                frame_stats[record[2]] += 1
+                last_number = record[0]
+
+    return {
+        "records": records,
+        "frame_stats": frame_stats,
+        "fps": segments[0]["fps"],
+        "frame_range": (0, covered)
+    }
+
+
+def score_frames(
+    detection: Dict[str, Any],
+    exercise_type: str,
+    pose_service: Optional[PoseService] = None,
+    progress: Optional[Callable[[int], None]] = None,
+    stats: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Score the landmarks of a whole video, a chunk at a time (see ClipScorer)
+
+    Args:
+        detection: detect_frames or stitch_segments output
+        exercise_type: Exercise to score
+        pose_service: Service to score with, defaults to this process's
+        progress: Called with the percentage of the frames scored
+        stats: Called with the statistics summary so far, after each chunk
+
+    Returns:
+        Session fields to store: score, feedback, results, frame_stats,
+        stats, reps and kinematics
+    """
+    records = detection["records"]
+    scorer = ClipScorer(
+        exercise_type, detection["fps"], pose_service or get_pose_service(),
+        total=len(records), progress=progress, on_stats=stats
+    )
+    scorer.add_all(records)
+    return scorer.finish(detection["frame_stats"])
+
+
+def video_fps(video_path: str) -> float:
+    """Frame rate from a video's header, 30 when it does not say"""
+    cap = cv2.VideoCapture(video_path)
+    try:
+        return cap.get(cv2.CAP_PROP_FPS) or 30
+    finally:
+        cap.release()
+
+
+def analyze_video(
+    video_path: str,
+    session_id: str,
+    exercise_type: str,
+    quality: str = None,
+    keyframe_interval: int = 1,
+    optical_flow: bool = False,
+    progress: Optional[Callable[[int], None]] = None,
+    pose_service: Optional[PoseService] = None,
+    stats: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """
+    Analyze a whole video file in this process
+
+    Args:
+        video_path: Path of the uploaded video
+        session_id: Session the analysis belongs to, keys the tracking state
+        exercise_type: Exercise to score
+        quality: Model tier name, defaults to the configured tier
+        keyframe_interval: Detect every keyframe_interval-th frame
+        optical_flow: Track landmarks between detections
+        progress: Called with the percentage done, landmarks are found up
+            to DETECTION_PROGRESS and the rest goes to the last scoring pass
+        pose_service: Service to analyze with, defaults to this process's
+        stats: Called with the statistics summary so far, after each chunk
+
+    Returns:
+        Session fields to store, see score_frames
+
+    Raises:
+        VideoAnalysisError: If the video cannot be opened
+    """
+    logger.info(f"Starting video analysis: {video_path}")
+    pose_service = pose_service or get_pose_service()
+    # Frames are scored while the video is still being read, nothing holds all the landmarks
+    scorer = ClipScorer(exercise_type, video_fps(video_path), pose_service, on_stats=stats)
+    detection = detect_frames(
+        video_path, session_id, quality, keyframe_interval, optical_flow,
+        progress=(lambda percent: progress(percent * DETECTION_PROGRESS // 100)) if progress else None,
+        pose_service=pose_service,
+        sink=scorer.add
+    )
+    result = scorer.finish(detection["frame_stats"])
+    if progress is not None:
+        progress(99)
+    return result
+
+
+def probe_video(video_path: str) -> Dict[str, Any]:
+    """
+    Read a video's container, codec, frame rate and length without analyzing it
+
+    Decodes only the first frame, to make sure OpenCV can read the video
+    before a job is queued for it.
+
+    Args:
+        video_path: Path of the video
+
+    Returns:
+        Dict with container, codec, fps, frame_count, width, height and duration
+
+    Raises:
+        VideoAnalysisError: If the video cannot be opened or decoded
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            raise VideoAnalysisError("Cannot open video")
+        ret, _ = cap.read()
+        if not ret:
+            raise VideoAnalysisError("Cannot decode video")
+
+        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+        fps = cap.get(cv2.CAP_PROP_FPS) or 0.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        return {
+            "container": os.path.splitext(video_path)[1].lstrip(".").lower() or None,
+            "codec": "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ") or None,
+            "fps": round(fps, 3),
+            "frame_count": max(frame_count, 0),
+            "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "duration": round(frame_count / fps, 2) if fps > 0 and frame_count > 0 else None
+        }
+    finally:
+        cap.release()
+
+
+def plan_segments(
+    video_info: Dict[str, Any],
+    max_segments: int,
+    min_segment_seconds: float,
+    overlap_seconds: float
+) -> List[Dict[str, Any]]:
+    """
+    Split a video into time segments that can be analyzed in parallel
+
+    Args:
+        video_info: probe_video result of the video
+        max_segments: Most segments to split into, e.g. the worker count
+        min_segment_seconds: Shortest segment worth a worker of its own
+        overlap_seconds: Warm-up analyzed before each segment but not recorded
+
+    Returns:
+        detect_frames start/end/warmup arguments per segment, a single
+        whole-video segment if the video is too short to split or its
+        length is unknown
+    """
+    fps = video_info.get("fps") or 30
+    frame_count = video_info.get("frame_count") or 0
+
+    count = min(max_segments, int(frame_count / (min_segment_seconds * fps))) if frame_count > 0 else 1
+    if count <= 1:
+        return [{"start": 0, "end": None, "warmup": 0}]
+
+    bounds = np.linspace(0, frame_count, count + 1).astype(int)
+    warmup = int(round(overlap_seconds * fps))
+    return [
+        {"start": int(bounds[i]), "end": int(bounds[i + 1]) if i < count - 1 else None, "warmup": warmup}
+        for i in range(count)
+    ]
+
+
+def init_job_worker(events):
+    """Job worker initializer: keep the queue used to report job start and progress"""
+    global _job_events
+    _job_events = events
+
+
+def run_job(job_id: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a video analysis job inside a job worker process
+
+    Lives here rather than next to the JobEngine so a worker only imports
+    what the analysis needs, not the API process's session store.
+
+    Returns:
+        Dict with the analysis result, the start and finish times and the worker's pid
+    """
+    started_at = time.time()
+    events = _job_events
+    events.put((job_id, "started", os.getpid()))
+    result = analyze_video(
+        **params,
+        progress=lambda percent: events.put((job_id, "progress", percent)),
+        stats=lambda summary: events.put((job_id, "stats", summary))
+    )
+    return {
+        "result": result,
+        "started_at": started_at,
+        "finished_at": time.time(),
+        "worker_pid": os.getpid()
+    }
+
+
+def run_segment(job_id: str, index: int, params: Dict[str, Any], segment: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Find the landmarks of one segment of a video inside a job worker process
+
+    Args:
+        job_id: Job the segment belongs to
+        index: Position of the segment in the video
+        params: Job parameters as for analyze_video
+        segment: plan_segments entry
+
+    Returns:
+        Dict with the detect_frames result, the start and finish times and the worker's pid
+    """
+    started_at = time.time()
+    events = _job_events
+    events.put((job_id, "started", os.getpid()))
+    detection = detect_frames(
+        params["video_path"],
+        # Segments of one session run side by side, each needs its own tracking state
+        f"{params['session_id']}:{index}",
+        params.get("quality"),
+        params.get("keyframe_interval", 1),
+        params.get("optical_flow", False),
+        progress=lambda percent: events.put((job_id, "progress", (index, percent))),
+        **segment
+    )
+    return {
+        "result": detection,
+        "started_at": started_at,
+        "finished_at": time.time(),
+        "worker_pid": os.getpid()
+    }
+
+
+def run_scoring(job_id: str, params: Dict[str, Any], segments: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Stitch the segments of a job and score the whole video inside a job worker process
+
+    Args:
+        job_id: Job the segments belong to
+        params: Job parameters as for analyze_video
+        segments: detect_frames results in segment order
+
+    Returns:
+        Dict with the analysis result, the start and finish times and the worker's pid
+    """
+    started_at = time.time()
+    events = _job_events
+    result = score_frames(
+        stitch_segments(segments),
+        params["exercise_type"],
+        progress=lambda percent: events.put((job_id, "scoring", percent)),
+        stats=lambda summary: events.put((job_id, "stats", summary))
+    )
+    return {
+        "result": result,
+        "started_at": started_at,
+        "finished_at": time.time(),
+        "worker_pid": os.getpid()
+    }
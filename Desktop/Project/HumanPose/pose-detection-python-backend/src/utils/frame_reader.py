@@ -0,0 +1,151 @@
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Put on the queue after the last frame, or with the exception that stopped the decoder
+_END = object()
+
+
+class FrameReader:
+    """
+    Decodes a video on a background thread into a bounded queue.
+
+    cv2.VideoCapture.read() releases the GIL while FFmpeg decodes, as does
+    pose inference, so the next frames are decoded while the current one
+    is being analyzed. The queue holds at most queue_size frames: when
+    inference falls behind the decoder waits instead of buffering the
+    whole video in memory.
+
+    Iterate to get (frame number, frame) pairs in order; stats() reports
+    how full the queue was and which side waited on the other.
+    """
+
+    def __init__(
+        self,
+        cap: cv2.VideoCapture,
+        first_frame: int = 0,
+        end: Optional[int] = None,
+        queue_size: int = 8
+    ):
+        """
+        Args:
+            cap: Opened capture positioned at first_frame, released by the caller
+            first_frame: Number of the next frame cap will return
+            end: Frame number to stop before, None = end of the video
+            queue_size: Decoded frames buffered ahead of the consumer
+        """
+        self.cap = cap
+        self.first_frame = first_frame
+        self.end = end
+        self.queue_size = max(1, queue_size)
+
+        self._queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._decoded = 0
+        self._decode_seconds = 0.0
+        self._blocked_seconds = 0.0  # decoder waiting for room in the queue
+        self._starved_seconds = 0.0  # consumer waiting for a frame
+        self._occupancy_sum = 0
+        self._occupancy_max = 0
+        self._reads = 0
+
+    def _decode(self):
+        """Decoder thread: read frames until the end, the stop event or an error"""
+        number = self.first_frame
+        try:
+            while not self._stop.is_set() and (self.end is None or number < self.end):
+                started = time.perf_counter()
+                ret, frame = self.cap.read()
+                self._decode_seconds += time.perf_counter() - started
+                if not ret:
+                    break
+                self._decoded += 1
+                if not self._put((number, frame)):
+                    return
+                number += 1
+            self._put(_END)
+        except Exception as e:
+            self._put((_END, e))
+
+    def _put(self, item) -> bool:
+        """Wait for room in the queue, False if the consumer stopped reading"""
+        started = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                self._blocked_seconds += time.perf_counter() - started
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def __iter__(self) -> Iterator[Tuple[int, np.ndarray]]:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._decode, name="frame-decoder", daemon=True)
+            self._thread.start()
+
+        while True:
+            occupancy = self._queue.qsize()
+            self._occupancy_sum += occupancy
+            self._occupancy_max = max(self._occupancy_max, occupancy)
+            self._reads += 1
+
+            started = time.perf_counter()
+            item = self._queue.get()
+            self._starved_seconds += time.perf_counter() - started
+
+            if item is _END:
+                return
+            if item[0] is _END:
+                raise item[1]
+            yield item
+
+    def close(self):
+        """Stop the decoder thread, e.g. when the consumer stops early"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        # Let go of the frames still buffered
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    def __enter__(self) -> "FrameReader":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue occupancy and time each stage spent waiting on the other"""
+        return {
+            "queue_size": self.queue_size,
+            "frames": self._decoded,
+            "mean_occupancy": round(self._occupancy_sum / self._reads, 2) if self._reads else 0.0,
+            "max_occupancy": self._occupancy_max,
+            "decode_seconds": round(self._decode_seconds, 3),
+            "decode_blocked_seconds": round(self._blocked_seconds, 3),
+            "inference_starved_seconds": round(self._starved_seconds, 3)
+        }
+
+    @staticmethod
+    def merge_stats(stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine the stats of readers that decoded parts of one video"""
+        frames = sum(entry["frames"] for entry in stats)
+        merged = {
+            "queue_size": max(entry["queue_size"] for entry in stats),
+            "frames": frames,
+            "mean_occupancy": round(
+                sum(entry["mean_occupancy"] * entry["frames"] for entry in stats) / frames, 2
+            ) if frames else 0.0,
+            "max_occupancy": max(entry["max_occupancy"] for entry in stats)
+        }
+        for key in ("decode_seconds", "decode_blocked_seconds", "inference_starved_seconds"):
+            merged[key] = round(sum(entry[key] for entry in stats), 3)
+        return merged
@@ -1,6 +1,9 @@
 import base64
 from typing import Optional
 
+import cv2
+import numpy as np
+
 
 def decode_base64_image(base64_string: str) -> Optional[bytes]:
     """
@@ -22,6 +25,20 @@ def decode_base64_image(base64_string: str) -> Optional[bytes]:
         return None
 
 
+def decode_image_bytes(contents: bytes) -> Optional[np.ndarray]:
+    """
+    Decode uploaded image bytes to a BGR array
+    
+    Args:
+        contents: Raw image file bytes
+        
+    Returns:
+        BGR image or None if the bytes are not an image
+    """
+    nparr = np.frombuffer(contents, np.uint8)
+    return cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+
+
 def encode_image_to_base64(image_bytes: bytes) -> str:
     """
     Encode image bytes to base64 string
@@ -1,45 +1,153 @@
+import atexit
 import logging
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Optional
+
+from src.config import settings
+
+_lock = threading.Lock()
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def _start_listener() -> QueueHandler:
+    """
+    Create the shared console and file handlers and the background thread writing to them
+
+    Loggers only put records on an in-memory queue, so a log call on the
+    frame loop or the event loop never waits for the console or the disk.
+    """
+    global _queue_handler, _listener
+    with _lock:
+        if _queue_handler is not None:
+            return _queue_handler
+
+        # Formatter
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+
+        # Console handler
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(settings.LOG_LEVEL.upper())
+        console_handler.setFormatter(formatter)
+
+        # File handler, one open file for the whole process
+        log_dir = Path("logs")
+        log_dir.mkdir(exist_ok=True)
+        file_handler = logging.FileHandler(
+            log_dir / f"pose_detection_{datetime.now().strftime('%Y%m%d')}.log"
+        )
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(formatter)
+
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+        _queue_handler = QueueHandler(log_queue)
+        return _queue_handler
+
+
+def shutdown_logging():
+    """Write out queued records and close the log file"""
+    global _queue_handler, _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket limiting how many records a logger emits per second
+
+    Records over the limit are dropped and counted; the next record that
+    gets through reports how many were suppressed.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Args:
+            rate: Records per second let through on average
+            burst: Records let through at once after a quiet period, defaults to rate
+        """
+        super().__init__()
+        self.rate = rate
+        self.burst = max(1.0, float(rate if burst is None else burst))
+        self._tokens = self.burst
+        self._last = time.monotonic()
+        self._suppressed = 0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens < 1:
+                self._suppressed += 1
+                return False
+            self._tokens -= 1
+            suppressed, self._suppressed = self._suppressed, 0
+
+        if suppressed:
+            record.msg = f"{record.msg} (+{suppressed} suppressed)"
+        return True
 
 
 def setup_logger(name: str = "pose_detection") -> logging.Logger:
     """
     Set up and configure logger
+
+    Every logger shares the queue to one console and file handler, so
+    calling this from many modules no longer opens a file per module.
     """
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-    
-    # Remove existing handlers
-    logger.handlers.clear()
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(formatter)
-    
-    logger.addHandler(console_handler)
-    
-    # File handler (optional)
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    file_handler = logging.FileHandler(
-        log_dir / f"pose_detection_{datetime.now().strftime('%Y%m%d')}.log"
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
+    queue_handler = _start_listener()
+    if queue_handler not in logger.handlers:
+        logger.setLevel(logging.DEBUG)
+        logger.handlers.clear()
+        logger.addHandler(queue_handler)
+        # The shared handlers already write the record, don't repeat it through the root logger
+        logger.propagate = False
+
+    return logger
+
+
+def setup_hot_path_logger(name: str) -> logging.Logger:
+    """
+    Logger for per-frame messages
+
+    Rate limited to LOG_HOT_PATH_RATE records per second. With
+    LOG_HOT_PATH disabled (production) only warnings and errors are
+    kept, and debug/info calls return before formatting anything, as
+    long as they pass %-style arguments instead of f-strings.
+
+    Args:
+        name: Module name, the logger is named "<name>.frames"
+
+    Returns:
+        Configured logger
+    """
+    logger = setup_logger(f"{name}.frames")
+    logger.setLevel(logging.DEBUG if settings.LOG_HOT_PATH else logging.WARNING)
+    if not any(isinstance(f, RateLimitFilter) for f in logger.filters):
+        logger.addFilter(RateLimitFilter(settings.LOG_HOT_PATH_RATE))
     return logger
 
 
 # Create global logger instance
-logger = setup_logger()
\ No newline at end of file
+logger = setup_logger()
@@ -22,12 +22,21 @@ class WebSocketMessageType:
     """Standard message structure"""
     
     @staticmethod
-    def session_started(session_id: str, exercise_type: str) -> dict:
+    def session_started(
+        session_id: str,
+        exercise_type: str,
+        model_tier: str = None,
+        messages: list = None,
+        feedback_format: str = "full"
+    ) -> dict:
         return {
             "type": WebSocketEvents.SESSION_STARTED,
             "data": {
                 "session_id": session_id,
                 "exercise_type": exercise_type,
+                "model_tier": model_tier,
+                "messages": messages,  # Feedback catalog, pose_data feedback refers to it by id
+                "feedback_format": feedback_format,
                 "timestamp": None  # Will be set by handler
             }
         }
@@ -1,10 +1,20 @@
+from typing import Optional
 from fastapi import WebSocket
+from src.services.pose_service import PoseService
 from src.services.session_service import SessionService
 from src.websocket.manager import ConnectionManager
 from src.websocket.events import WebSocketMessageType
 from src.utils.logger import logger
 from src.config import settings
-from src.scoring.factory import ScoringFactory  # ← ADD THIS
+from src.scoring.registry import scoring_registry
+from src.scoring.reps import summarize_reps
+from src.services.session_stats import SessionStats
+from src.feedback.catalog import feedback_catalog
+from src.feedback.engine import FeedbackEngine
+from src.ml.model_tiers import resolve_tier, tier_name
+
+# "full" sends the rendered feedback list with every frame, "ids" only the feedback_update ids
+FEEDBACK_FORMATS = ("full", "ids")
 
 
 async def handle_start_session(
@@ -19,7 +29,10 @@ async def handle_start_session(
     Expected data:
     {
         "user_id": "optional_user_id",
-        "exercise_type": "squat"
+        "exercise_type": "squat",
+        "quality": "lite",  # optional: lite, full or heavy
+        "feedback_format": "ids"  # optional: "full" (default) also sends the rendered
+                                  # feedback list, "ids" only the catalog ids in feedback_update
     }
     """
     try:
@@ -41,8 +54,8 @@ async def handle_start_session(
         user_id = data.get("user_id")
         exercise_type = data.get("exercise_type", "").lower()
         
-        # Get supported exercises from factory ← CHANGED
-        supported_exercises = ScoringFactory.get_supported_exercises()
+        # Get supported exercises from the scorer registry
+        supported_exercises = scoring_registry.get_supported_exercises()
         
         if not exercise_type or exercise_type not in supported_exercises:
             await websocket.send_json(
@@ -53,24 +66,54 @@ async def handle_start_session(
             )
             return None  # ← ADD RETURN
         
+        # Live coaching defaults to the configured tier, "lite" trades accuracy for frame rate
+        try:
+            model_tier = tier_name(resolve_tier(data.get("quality")))
+        except ValueError as e:
+            await websocket.send_json(
+                WebSocketMessageType.error(str(e), "INVALID_QUALITY")
+            )
+            return None
+        
+        feedback_format = data.get("feedback_format") or "full"
+        if feedback_format not in FEEDBACK_FORMATS:
+            await websocket.send_json(
+                WebSocketMessageType.error(
+                    f"Invalid feedback format '{feedback_format}'. Supported: {', '.join(FEEDBACK_FORMATS)}",
+                    "INVALID_FEEDBACK_FORMAT"
+                )
+            )
+            return None
+        
         # Create session
-        session = session_service.create_session(user_id, exercise_type)
+        session = session_service.create_session("live", exercise_type, model_tier=model_tier)
+        session_id = str(session.id)
+        session_service.update_session_status(session_id, "processing")
+        # Resolve the shared scorer once instead of on every frame
+        session.scorer = scoring_registry.get(exercise_type)
+        session.rep_counter = session.scorer.create_rep_counter()
+        session.stats_accumulator = SessionStats()
+        session.feedback_engine = FeedbackEngine()
+        session.feedback_format = feedback_format
         
-        # Connect WebSocket
-        await connection_manager.connect(websocket, session.session_id)
+        # Address the connection by the session
+        connection_manager.bind(websocket, session_id)
         
         # Send confirmation
         await connection_manager.send_message(
-            session.session_id,
+            session_id,
             WebSocketMessageType.session_started(
-                session.session_id,
-                exercise_type
+                session_id,
+                exercise_type,
+                model_tier,
+                feedback_catalog.to_list(),
+                feedback_format
             )
         )
         
-        logger.info(f"✅ Session started: {session.session_id} - Exercise: {exercise_type}")
+        logger.info(f"✅ Session started: {session_id} - Exercise: {exercise_type} - User: {user_id}")
         
-        return session.session_id
+        return session_id
         
     except Exception as e:
         logger.error(f"Error starting session: {e}", exc_info=True)  # ← ADD exc_info
@@ -86,12 +129,30 @@ async def handle_start_session(
 async def handle_stop_session(
     session_id: str,
     session_service: SessionService,
-    connection_manager: ConnectionManager
+    connection_manager: ConnectionManager,
+    pose_service: Optional[PoseService] = None
 ):
     """
     Handle session stop request
     """
     try:
+        # Free the session's tracking graph and optical-flow state
+        if pose_service is not None:
+            pose_service.end_session(session_id)
+        
+        # Score the last rep now that no lockout frames will follow
+        session = session_service.get_session(session_id)
+        if session is not None and session.rep_counter is not None:
+            session.rep_counter.finish()
+            session_service.update_session(session_id, save=False, reps=summarize_reps(session.rep_counter.reps))
+        if session is not None and session.stats_accumulator is not None:
+            session_service.update_session(
+                session_id,
+                save=False,
+                stats=session.stats_accumulator.summary(),
+                score=session.stats_accumulator.average_score
+            )
+        
         # End session
         summary = session_service.end_session(session_id)
         
@@ -101,14 +162,20 @@ async def handle_stop_session(
                 session_id,
                 WebSocketMessageType.session_stopped(
                     session_id,
-                    summary.model_dump()
+                    {
+                        **summary.model_dump(mode="json"),
+                        "frame_count": session.frame_count,
+                        "score": session.score,
+                        "reps": session.reps,
+                        "stats": session.stats
+                    }
                 )
             )
             
             logger.info(f"✅ Session stopped: {session_id}")
         
-        # Disconnect WebSocket
-        connection_manager.disconnect(session_id)
+        # The connection stays open for the next session
+        connection_manager.unbind(session_id)
         
     except Exception as e:
         logger.error(f"Error stopping session: {e}")
\ No newline at end of file
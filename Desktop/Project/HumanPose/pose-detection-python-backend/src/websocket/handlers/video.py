@@ -1,16 +1,21 @@
+import asyncio
 import base64
+import cv2
+import numpy as np
 from fastapi import WebSocket
-from src.services.pose_service import PoseDetectionService
+from src.services.pose_service import PoseService
 from src.services.session_service import SessionService
 from src.websocket.manager import ConnectionManager
 from src.websocket.events import WebSocketMessageType
-from src.utils.logger import logger
+from src.utils.logger import logger, setup_hot_path_logger
+
+frame_logger = setup_hot_path_logger(__name__)
 
 
 async def handle_video_frame(
     session_id: str,
     data: dict,
-    pose_service: PoseDetectionService,
+    pose_service: PoseService,
     session_service: SessionService,
     connection_manager: ConnectionManager
 ):
@@ -53,7 +58,7 @@ async def handle_video_frame(
             
             frame_bytes = base64.b64decode(frame_base64)
         except Exception as e:
-            logger.error(f"Error decoding frame: {e}")
+            frame_logger.error("Error decoding frame: %s", e)
             await connection_manager.send_error(
                 session_id,
                 "Failed to decode frame data"
@@ -63,11 +68,30 @@ async def handle_video_frame(
         # Increment frame count
         session_service.increment_frame_count(session_id)
         
-        # Process frame through ML pipeline
-        analysis = await pose_service.process_frame(
-            frame_bytes,
+        frame = cv2.imdecode(np.frombuffer(frame_bytes, np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            await connection_manager.send_error(
+                session_id,
+                "Failed to decode frame data"
+            )
+            return
+        
+        # Clients that resolve feedback_update ids from the catalog skip the rendered list
+        render = session.feedback_format != "ids"
+        
+        # Process frame through ML pipeline off the event loop. Live frames are
+        # tracked with optical flow so the detector only runs when tracking is lost.
+        analysis = await asyncio.to_thread(
+            pose_service.analyze_frame,
+            frame,
             session.exercise_type,
-            timestamp
+            session_id,
+            getattr(session, "model_tier", None),
+            True,
+            scorer=getattr(session, "scorer", None),
+            rep_counter=getattr(session, "rep_counter", None),
+            feedback_engine=getattr(session, "feedback_engine", None),
+            render=render
         )
         
         if analysis is None:
@@ -81,23 +105,33 @@ async def handle_video_frame(
             })
             return
         
+        if getattr(session, "stats_accumulator", None) is not None:
+            session.stats_accumulator.update(
+                analysis["score"], analysis["feedback"] if render else analysis["emissions"]
+            )
+        
+        pose_data = {
+            "pose_detected": True,
+            "landmarks": analysis["landmarks"],
+            "score": analysis["score"],
+            # Catalog ids to show and clear, when the session deduplicates feedback
+            "feedback_update": analysis.get("feedback_update"),
+            "model_tier": analysis["model_tier"],
+            "source": analysis["source"],
+            "tracking": pose_service.detector.tracking_stats(session_id),
+            "reps": analysis.get("reps"),
+            "timestamp": timestamp
+        }
+        if render:
+            pose_data["feedback"] = analysis["feedback"]
+        
         # Send pose analysis back to client
-        await connection_manager.send_message(
-            session_id,
-            WebSocketMessageType.pose_data({
-                "pose_detected": True,
-                "keypoints": [kp.model_dump() for kp in analysis.pose.keypoints],
-                "angles": analysis.angles.model_dump(),
-                "score": analysis.score.model_dump(),
-                "feedback": [fb.model_dump() for fb in analysis.feedback],
-                "timestamp": analysis.timestamp
-            })
-        )
+        await connection_manager.send_message(session_id, WebSocketMessageType.pose_data(pose_data))
         
-        logger.debug(f"Frame processed for session {session_id} - Score: {analysis.score.score}")
+        frame_logger.debug("Frame processed for session %s - Score: %s", session_id, analysis["score"].get("overall"))
         
     except Exception as e:
-        logger.error(f"Error processing video frame: {e}", exc_info=True)
+        frame_logger.error("Error processing video frame: %s", e, exc_info=True)
         await connection_manager.send_error(
             session_id,
             "Failed to process video frame"
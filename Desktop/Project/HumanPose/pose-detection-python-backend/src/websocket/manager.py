@@ -3,9 +3,12 @@ from fastapi import WebSocket
 import json
 import asyncio
 
-from src.utils.logger import setup_logger
+from src.websocket.events import WebSocketMessageType
+from src.utils.logger import setup_hot_path_logger, setup_logger
 
 logger = setup_logger(__name__)
+# Sends happen once per frame, a dropped client would log on every one
+frame_logger = setup_hot_path_logger(__name__)
 
 class ConnectionManager:
     """
@@ -55,6 +58,25 @@ class ConnectionManager:
         
         logger.info(f"WebSocket disconnected. Total: {len(self.active_connections)}")
     
+    def bind(self, websocket: WebSocket, session_id: str):
+        """
+        Address an accepted connection by a session id
+        
+        Args:
+            websocket: WebSocket connection
+            session_id: Live session running on the connection
+        """
+        self.user_connections[session_id] = websocket
+    
+    def unbind(self, session_id: str):
+        """
+        Stop addressing a connection by a session id, the connection stays open
+        
+        Args:
+            session_id: Live session that ended
+        """
+        self.user_connections.pop(session_id, None)
+    
     async def send_personal_message(self, message: dict, websocket: WebSocket):
         """
         Send message to specific WebSocket
@@ -66,7 +88,7 @@ class ConnectionManager:
         try:
             await websocket.send_text(json.dumps(message))
         except Exception as e:
-            logger.error(f"Error sending message: {str(e)}")
+            frame_logger.error("Error sending message: %s", e)
     
     async def send_to_user(self, message: dict, user_id: str):
         """
@@ -79,6 +101,27 @@ class ConnectionManager:
         if user_id in self.user_connections:
             await self.send_personal_message(message, self.user_connections[user_id])
     
+    async def send_message(self, session_id: str, message: dict):
+        """
+        Send message to the connection of a live session
+        
+        Args:
+            session_id: Target session identifier
+            message: Dictionary to send as JSON
+        """
+        await self.send_to_user(message, session_id)
+    
+    async def send_error(self, session_id: str, message: str, code: str = "UNKNOWN_ERROR"):
+        """
+        Send an error message to the connection of a live session
+        
+        Args:
+            session_id: Target session identifier
+            message: Error description
+            code: Machine-readable error code
+        """
+        await self.send_to_user(WebSocketMessageType.error(message, code), session_id)
+    
     async def broadcast(self, message: dict):
         """
         Send message to all connected clients
@@ -0,0 +1,80 @@
+from fastapi import FastAPI, File, UploadFile
+from fastapi.testclient import TestClient
+
+from src.api.body_limit import BodySizeLimitMiddleware
+from src.main import app as main_app
+from src.config import settings
+
+
+def make_client():
+    app = FastAPI()
+    app.add_middleware(BodySizeLimitMiddleware, limits={"/upload": 1000}, overhead=200)
+    app.state.reached = []
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        app.state.reached.append(file.filename)
+        return {"size": len(await file.read())}
+
+    @app.post("/other")
+    async def other(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return TestClient(app), app
+
+
+def test_body_within_limit_passes():
+    client, app = make_client()
+    response = client.post("/upload", files={"file": ("a.jpg", b"x" * 900)})
+    assert response.status_code == 200
+    assert response.json() == {"size": 900}
+
+
+def test_content_length_over_limit_refused_before_endpoint():
+    client, app = make_client()
+    response = client.post("/upload", files={"file": ("a.jpg", b"x" * 5000)})
+    assert response.status_code == 413
+    assert app.state.reached == []
+
+
+def test_streamed_body_over_limit_refused():
+    client, app = make_client()
+    body = (
+        b'--x\r\nContent-Disposition: form-data; name="file"; filename="a.jpg"\r\n\r\n'
+        + b"x" * 5000 + b"\r\n--x--\r\n"
+    )
+    # No Content-Length, the body is counted as it arrives
+    chunks = (body[i:i + 500] for i in range(0, len(body), 500))
+    response = client.post("/upload", content=chunks, headers={"Content-Type": "multipart/form-data; boundary=x"})
+    assert response.status_code == 413
+    assert app.state.reached == []
+
+
+def test_other_paths_not_limited():
+    client, _ = make_client()
+    response = client.post("/other", files={"file": ("a.jpg", b"x" * 5000)})
+    assert response.status_code == 200
+
+
+def test_video_upload_refused_on_content_length():
+    response = TestClient(main_app).post(
+        "/api/upload/video",
+        content=b"",
+        headers={
+            "Content-Type": "multipart/form-data; boundary=x",
+            "Content-Length": str(settings.MAX_FILE_SIZE + settings.UPLOAD_MULTIPART_OVERHEAD + 1)
+        }
+    )
+    assert response.status_code == 413
+
+
+def test_image_batch_refused_on_content_length():
+    response = TestClient(main_app).post(
+        "/api/analyze/images",
+        content=b"",
+        headers={
+            "Content-Type": "multipart/form-data; boundary=x",
+            "Content-Length": str(settings.MAX_BATCH_BYTES + settings.UPLOAD_MULTIPART_OVERHEAD + 1)
+        }
+    )
+    assert response.status_code == 413
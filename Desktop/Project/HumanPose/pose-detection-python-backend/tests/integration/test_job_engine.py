@@ -0,0 +1,158 @@
+import os
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.main import app
+from src.models.session import SessionStatus
+from src.services import job_engine as job_engine_module
+from src.services import video_analysis
+from src.services.job_engine import SCORING_PRIORITY, JobEngine, JobQueueFull
+from src.services.session_service import SessionService
+
+
+# Jobs run in spawned worker processes, so the stand-ins for run_job live at module level
+
+def quick_job(job_id, params):
+    started_at = time.time()
+    video_analysis._job_events.put((job_id, "started", os.getpid()))
+    video_analysis._job_events.put((job_id, "progress", 50))
+    return {
+        "result": {"score": 75.0, "stats": {"frames": 3}},
+        "started_at": started_at,
+        "finished_at": time.time(),
+        "worker_pid": os.getpid()
+    }
+
+
+def failing_job(job_id, params):
+    raise RuntimeError("decoder crashed")
+
+
+def blocking_job(job_id, params):
+    # Holds its worker until the test creates the release file
+    while not os.path.exists(params["release"]):
+        time.sleep(0.05)
+    return quick_job(job_id, params)
+
+
+def logged_task(name, log):
+    with open(log, "a") as f:
+        f.write(name + "\n")
+    return name
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    service = SessionService()
+    service.sessions_dir = tmp_path
+    return service
+
+
+@pytest.fixture
+def engine(sessions, monkeypatch):
+    monkeypatch.setattr(job_engine_module.settings, "VIDEO_PARALLEL_SEGMENTS", False)
+    engine = JobEngine(workers=1, max_queued=1, sessions=sessions)
+    yield engine
+    engine.shutdown(wait=False)
+
+
+def video_session(sessions, tmp_path):
+    video = tmp_path / "clip.mp4"
+    video.write_bytes(b"video")
+    return sessions.create_session("video", "squat", file_path=str(video))
+
+
+def wait_until_finished(job, timeout=60):
+    deadline = time.time() + timeout
+    while not job.finished:
+        assert time.time() < deadline, f"job still {job.status}"
+        time.sleep(0.05)
+
+
+def test_job_results_stored_on_session(engine, sessions, tmp_path, monkeypatch):
+    monkeypatch.setattr(job_engine_module, "run_job", quick_job)
+    session = video_session(sessions, tmp_path)
+
+    job = engine.submit(str(session.id), video_path=session.file_path, exercise_type="squat")
+    wait_until_finished(job)
+
+    assert job.status == "completed"
+    stored = sessions._load_session(str(session.id))
+    assert stored.status == SessionStatus.COMPLETED
+    assert stored.progress == 100
+    assert stored.score == 75.0
+    assert stored.job["status"] == "completed"
+
+
+def test_failed_job_marks_session_failed(engine, sessions, tmp_path, monkeypatch):
+    monkeypatch.setattr(job_engine_module, "run_job", failing_job)
+    session = video_session(sessions, tmp_path)
+
+    job = engine.submit(str(session.id), video_path=session.file_path, exercise_type="squat")
+    wait_until_finished(job)
+
+    assert job.status == "failed"
+    stored = sessions._load_session(str(session.id))
+    assert stored.status == SessionStatus.FAILED
+    assert stored.error == "decoder crashed"
+    assert engine.stats()["failed"] == 1
+
+
+def test_queue_refuses_jobs_beyond_limit(engine, sessions, tmp_path, monkeypatch):
+    monkeypatch.setattr(job_engine_module, "run_job", blocking_job)
+    release = tmp_path / "release"
+    params = {"video_path": "clip.mp4", "exercise_type": "squat", "release": str(release)}
+
+    # One running, one queued
+    jobs = [engine.submit(str(video_session(sessions, tmp_path).id), **params) for _ in range(2)]
+    with pytest.raises(JobQueueFull):
+        engine.submit(str(video_session(sessions, tmp_path).id), **params)
+
+    release.touch()
+    for job in jobs:
+        wait_until_finished(job)
+    assert [job.status for job in jobs] == ["completed", "completed"]
+
+
+def test_scoring_task_overtakes_queued_tasks(engine, tmp_path):
+    release, log = tmp_path / "release", tmp_path / "log"
+    busy = engine._submit_task(blocking_job, "busy", {"release": str(release)})
+    queued = engine._submit_task(logged_task, "queued", str(log))
+    scoring = engine._submit_task(logged_task, "scoring", str(log), priority=SCORING_PRIORITY)
+
+    release.touch()
+    for future in (busy, queued, scoring):
+        future.result(timeout=60)
+    assert log.read_text().split() == ["scoring", "queued"]
+
+
+def test_interrupted_jobs_resumed(engine, sessions, tmp_path, monkeypatch):
+    monkeypatch.setattr(job_engine_module, "run_job", quick_job)
+    interrupted = video_session(sessions, tmp_path)
+    params = {"video_path": interrupted.file_path, "exercise_type": "squat"}
+    sessions.update_session(
+        str(interrupted.id), status=SessionStatus.PROCESSING, job={"id": "old", "status": "running", "params": params}
+    )
+    gone = sessions.create_session("video", "squat", file_path=str(tmp_path / "missing.mp4"))
+    sessions.update_session(str(gone.id), job={"id": "older", "status": "queued", "params": params})
+
+    assert engine.resume_pending() == 1
+
+    assert sessions.get_session(str(gone.id)).status == SessionStatus.FAILED
+    job = engine.get(sessions.get_session(str(interrupted.id)).job["id"])
+    wait_until_finished(job)
+    assert sessions.get_session(str(interrupted.id)).status == SessionStatus.COMPLETED
+
+
+def test_upload_refused_with_503_when_queue_full(monkeypatch):
+    monkeypatch.setattr(job_engine_module.job_engine, "workers", 0)
+    monkeypatch.setattr(job_engine_module.job_engine, "max_queued", 0)
+
+    response = TestClient(app).post(
+        "/api/upload/video", files={"file": ("clip.mp4", b"video", "video/mp4")}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "30"
@@ -0,0 +1,166 @@
+import base64
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.synthetic_clip import write_clip
+from src.api import tus_routes, upload_routes
+from src.main import app
+from src.services.job_engine import JobQueueFull
+from src.services.session_service import session_service
+from src.services.upload_store import ResumableUploadStore
+
+TUS = {"Tus-Resumable": "1.0.0"}
+
+
+@pytest.fixture(scope="module")
+def video(tmp_path_factory):
+    path = tmp_path_factory.mktemp("clip") / "clip.mp4"
+    write_clip(str(path), 10)
+    return path.read_bytes()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ResumableUploadStore(tmp_path / "incoming")
+    monkeypatch.setattr(tus_routes, "upload_store", store)
+    monkeypatch.setattr(upload_routes.storage_service, "uploads_dir", tmp_path / "uploads")
+    monkeypatch.setattr(session_service, "sessions_dir", tmp_path)
+    return store
+
+
+@pytest.fixture
+def submitted(monkeypatch):
+    """Jobs handed to the engine, which is not started in these tests"""
+    jobs = []
+
+    def submit(session_id, **params):
+        jobs.append((session_id, params))
+        return SimpleNamespace(id=f"job-{len(jobs)}")
+
+    monkeypatch.setattr(upload_routes.job_engine, "check_capacity", lambda: None)
+    monkeypatch.setattr(upload_routes.job_engine, "submit", submit)
+    return jobs
+
+
+def queue_full(session_id, **params):
+    raise JobQueueFull("Analysis queue is full")
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def create(client, length, filename="clip.mp4"):
+    metadata = f"filename {base64.b64encode(filename.encode()).decode()}"
+    response = client.post("/api/uploads", headers={**TUS, "Upload-Length": str(length), "Upload-Metadata": metadata})
+    assert response.status_code == 201
+    return response.headers["Location"].split("/api")[-1]
+
+
+def patch(client, location, offset, data):
+    return client.patch(f"/api{location}", content=data, headers={
+        **TUS, "Upload-Offset": str(offset), "Content-Type": "application/offset+octet-stream"
+    })
+
+
+def test_create_and_head(client, store):
+    location = create(client, 1000)
+
+    response = client.head(f"/api{location}", headers=TUS)
+    assert response.status_code == 200
+    assert response.headers["Upload-Offset"] == "0"
+    assert response.headers["Upload-Length"] == "1000"
+    assert "Upload-Expires" in response.headers
+
+
+def test_unsupported_version_and_type_refused(client, store):
+    response = client.post("/api/uploads", headers={"Tus-Resumable": "0.2.2", "Upload-Length": "10"})
+    assert response.status_code == 412
+
+    metadata = f"filename {base64.b64encode(b'notes.txt').decode()}"
+    response = client.post("/api/uploads", headers={**TUS, "Upload-Length": "10", "Upload-Metadata": metadata})
+    assert response.status_code == 415
+
+
+def test_resume_after_partial_patch_and_finalize(client, store, submitted, video):
+    location = create(client, len(video))
+    half = len(video) // 2
+
+    response = patch(client, location, 0, video[:half])
+    assert response.status_code == 204
+    assert response.headers["Upload-Offset"] == str(half)
+
+    # A client that lost track of the offset is told where the upload stands
+    response = patch(client, location, 0, video)
+    assert response.status_code == 409
+    assert response.headers["Upload-Offset"] == str(half)
+
+    assert client.head(f"/api{location}", headers=TUS).headers["Upload-Offset"] == str(half)
+    response = patch(client, location, half, video[half:])
+    assert response.status_code == 204
+    session_id = response.headers["Upload-Session-Id"]
+    assert response.headers["Upload-Job-Id"] == "job-1"
+
+    (queued_session, params), = submitted
+    assert queued_session == session_id
+    assert Path(params["video_path"]).read_bytes() == video
+    assert session_service.get_session(session_id).video_info["frame_count"] == 10
+
+    # A retried last PATCH reports the same analysis instead of queueing another
+    response = patch(client, location, len(video), b"")
+    assert response.headers["Upload-Session-Id"] == session_id
+    assert len(submitted) == 1
+
+
+def test_full_queue_keeps_upload_for_retry(client, store, submitted, video, monkeypatch):
+    location = create(client, len(video))
+    upload = store.get(location.rsplit("/", 1)[-1])
+
+    with monkeypatch.context() as patched:
+        patched.setattr(upload_routes.job_engine, "submit", queue_full)
+        response = patch(client, location, 0, video)
+    assert response.status_code == 503
+    assert store.data_path(upload).read_bytes() == video
+    assert os.listdir(upload_routes.storage_service.uploads_dir / "videos") == []
+
+    response = patch(client, location, len(video), b"")
+    assert response.status_code == 204
+    assert "Upload-Session-Id" in response.headers
+
+
+def test_direct_upload_leaves_no_file_when_queue_full(client, store, video, monkeypatch):
+    monkeypatch.setattr(upload_routes.job_engine, "check_capacity", lambda: None)
+    monkeypatch.setattr(upload_routes.job_engine, "submit", queue_full)
+    monkeypatch.setattr(upload_routes.storage_service, "incoming_dir", store.directory)
+    sessions_before = len(session_service.sessions)
+
+    response = client.post("/api/upload/video", files={"file": ("clip.mp4", video, "video/mp4")})
+
+    assert response.status_code == 503
+    assert os.listdir(upload_routes.storage_service.uploads_dir / "videos") == []
+    assert os.listdir(store.directory) == []
+    assert len(session_service.sessions) == sessions_before
+
+
+def test_expired_uploads_removed_by_creation_time(store):
+    fresh = store.create(10, ".mp4", {})
+    old = store.create(10, ".mp4", {})
+    old.created_at = time.time() - 48 * 3600
+    store._save(old)
+    writing = store.create(10, ".mp4", {})
+    writing.created_at = old.created_at
+    store._save(writing)
+    store._writing.add(writing.id)
+
+    assert store.expire(busy={fresh.id}) == 1
+
+    assert store.get(old.id) is None
+    assert not store.data_path(old).exists()
+    assert store.get(fresh.id) is not None
+    assert store.get(writing.id) is not None
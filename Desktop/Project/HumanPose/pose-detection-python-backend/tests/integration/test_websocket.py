@@ -0,0 +1,92 @@
+import base64
+
+import cv2
+import pytest
+from fastapi.testclient import TestClient
+
+from benchmarks.synthetic_clip import draw_figure
+from src.main import app
+from src.ml.tracker_registry import tracker_registry
+from src.services.session_service import session_service
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(session_service, "sessions_dir", tmp_path)
+    return TestClient(app)
+
+
+def frame_message():
+    _, jpeg = cv2.imencode(".jpg", draw_figure())
+    return {"type": "video_frame", "data": {"frame": base64.b64encode(jpeg.tobytes()).decode(), "timestamp": 1.0}}
+
+
+def test_ping(client):
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"type": "ping"})
+        assert ws.receive_json()["type"] == "pong"
+
+
+def test_frame_without_session_is_refused(client):
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json(frame_message())
+        assert ws.receive_json()["error"]["code"] == "NO_SESSION"
+
+
+def test_stop_releases_tracker(client):
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"type": "start_session", "data": {"exercise_type": "squat", "user_id": "test"}})
+        started = ws.receive_json()
+        assert started["type"] == "session_started"
+        session_id = started["data"]["session_id"]
+
+        ws.send_json(frame_message())
+        pose = ws.receive_json()
+        assert pose["type"] == "pose_data"
+        assert pose["data"]["pose_detected"]
+        assert isinstance(pose["data"]["feedback"], list)
+        assert set(pose["data"]["feedback_update"]) == {"show", "clear"}
+        assert tracker_registry.get(session_id) is not None
+
+        ws.send_json({"type": "stop_session"})
+        stopped = ws.receive_json()
+        assert stopped["type"] == "session_stopped"
+        assert stopped["data"]["summary"]["frame_count"] == 1
+
+        assert tracker_registry.get(session_id) is None
+        assert session_id not in session_service.live_sessions
+        assert session_service.get_session(session_id).status == "completed"
+
+
+def test_disconnect_stops_session(client):
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"type": "start_session", "data": {"exercise_type": "squat"}})
+        session_id = ws.receive_json()["data"]["session_id"]
+        ws.send_json(frame_message())
+        ws.receive_json()
+
+    assert tracker_registry.get(session_id) is None
+    assert session_id not in session_service.live_sessions
+
+
+def test_ids_feedback_format_skips_rendered_feedback(client):
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"type": "start_session", "data": {"exercise_type": "squat", "feedback_format": "ids"}})
+        started = ws.receive_json()
+        assert started["data"]["feedback_format"] == "ids"
+
+        ws.send_json(frame_message())
+        pose = ws.receive_json()
+        assert pose["data"]["pose_detected"]
+        assert "feedback" not in pose["data"]
+        assert all(isinstance(item, (int, dict)) for item in pose["data"]["feedback_update"]["show"])
+
+        ws.send_json({"type": "stop_session"})
+        summary = ws.receive_json()["data"]["summary"]
+        assert summary["frame_count"] == 1
+
+
+def test_unknown_feedback_format_refused(client):
+    with client.websocket_connect("/ws") as ws:
+        ws.send_json({"type": "start_session", "data": {"exercise_type": "squat", "feedback_format": "text"}})
+        assert ws.receive_json()["error"]["code"] == "INVALID_FEEDBACK_FORMAT"
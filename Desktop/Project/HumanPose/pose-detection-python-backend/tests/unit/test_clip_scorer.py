@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from src.services.clip_scorer import ClipScorer
+from src.services.pose_service import PoseService
+
+FPS = 30
+
+
+def squat_landmarks(frames=300):
+    """Side-on figure squatting once every two seconds, (frames, 33, 4)"""
+    t = np.arange(frames) / FPS
+    depth = 0.5 - 0.5 * np.cos(2 * np.pi * t / 2)
+    landmarks = np.zeros((frames, 33, 4))
+    landmarks[:, :, 3] = 1.0
+    # Hips swing from above the knees (straight legs) to level with them (90 degrees)
+    hip_x = 0.5 - 0.18 * depth
+    hip_y = 0.54 + 0.18 * depth
+    landmarks[:, :23, 0] = hip_x[:, None] + 0.05  # head, shoulders and arms over the hips
+    landmarks[:, :11, 1] = hip_y[:, None] - 0.4
+    landmarks[:, 11:23, 1] = hip_y[:, None] - 0.3
+    landmarks[:, 23:25, 0] = hip_x[:, None]
+    landmarks[:, 23:25, 1] = hip_y[:, None]
+    landmarks[:, 25:, 0] = 0.5
+    landmarks[:, 25:27, 1] = 0.72  # knees
+    landmarks[:, 27:, 1] = 0.9  # ankles and feet
+    return landmarks
+
+
+def score(records, chunk_size):
+    scorer = ClipScorer("squat", FPS, PoseService(), chunk_size=chunk_size)
+    scorer.add_all(records)
+    return scorer.finish({"detected": len(records), "interpolated": 0, "tracked": 0})
+
+
+def test_chunked_scoring_matches_whole_clip():
+    records = [(number, landmarks, "detected") for number, landmarks in enumerate(squat_landmarks())]
+
+    whole = score(records, chunk_size=len(records))
+    chunked = score(records, chunk_size=16)
+
+    assert len(chunked["results"]) == len(whole["results"])
+    assert [r["score"]["overall"] for r in chunked["results"]] == pytest.approx(
+        [r["score"]["overall"] for r in whole["results"]], abs=0.5
+    )
+    assert chunked["score"] == pytest.approx(whole["score"], abs=0.1)
+    assert whole["reps"]["count"] > 0
+    assert chunked["reps"] == whole["reps"]
+    for joint, angles in whole["kinematics"]["timeline"].items():
+        assert chunked["kinematics"]["timeline"][joint] == pytest.approx(angles, abs=0.5, nan_ok=True)
+
+
+def test_progress_reported_per_chunk():
+    records = [(number, landmarks, "detected") for number, landmarks in enumerate(squat_landmarks(100))]
+    reported = []
+    scorer = ClipScorer("squat", FPS, PoseService(), chunk_size=40, total=len(records), progress=reported.append)
+    scorer.add_all(records)
+    scorer.finish({"detected": len(records), "interpolated": 0, "tracked": 0})
+
+    assert reported == sorted(reported)
+    assert len(reported) > 1 and reported[-1] == 100
+
+
+def test_results_capped_evenly_with_stats_over_every_frame():
+    records = [(number, landmarks, "detected") for number, landmarks in enumerate(squat_landmarks(100))]
+    summaries = []
+    scorer = ClipScorer("squat", FPS, PoseService(), chunk_size=40, on_stats=summaries.append, max_results=30)
+    scorer.add_all(records)
+    result = scorer.finish({"detected": len(records), "interpolated": 0, "tracked": 0})
+
+    assert [r["frame"] for r in result["results"]] == list(range(0, 100, 4))
+    assert result["frame_stats"]["result_stride"] == 4
+    assert result["stats"]["frames"] == 100
+    assert [summary["frames"] for summary in summaries] == [40, 80, 100]
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from src.ml.backends import backend_tier, model_name
+from src.ml.backends.base import LandmarkModelBackend, ssd_anchors
+from src.services.result_cache import LandmarkCache
+
+WIDTH, HEIGHT = 640, 480
+HIP = (320.0, 300.0)
+HEAD = (320.0, 100.0)
+
+
+class FixedOutputBackend(LandmarkModelBackend):
+    """Two-stage backend whose models return canned outputs"""
+
+    name = "fixed"
+
+    def __init__(self, score_logit=5.0):
+        super().__init__("landmarks.onnx", "detector.onnx")
+        self.score_logit = score_logit
+        self.landmark_batches = []
+
+    def _run_detector(self, batch):
+        boxes = np.zeros((len(batch), len(self.anchors), 12), dtype=np.float32)
+        scores = np.full((len(batch), len(self.anchors), 1), -10.0, dtype=np.float32)
+        # Letterboxing pads 640x480 to 640x640 with 80 rows on top
+        for k, (x, y) in enumerate((HIP, HEAD)):
+            normalized = np.array([x / WIDTH, (y + 80) / WIDTH])
+            boxes[:, 0, 4 + 2 * k:6 + 2 * k] = (normalized - self.anchors[0]) * self.detector_input_size
+        scores[:, 0, 0] = self.score_logit
+        # Export order varies, scores first here
+        return self._split_detector_outputs([scores, boxes])
+
+    def _run(self, batch):
+        self.landmark_batches.append(batch)
+        raw = np.zeros((len(batch), 39, 5), dtype=np.float32)
+        # Every landmark at the center of the model input, fully visible
+        raw[:, :, :2] = self.input_size / 2
+        raw[:, :, 3] = 10.0
+        return raw.reshape(len(batch), -1), None
+
+    def describe(self):
+        return {"backend": self.name}
+
+
+def test_anchor_count_matches_blazepose_detector():
+    anchors = ssd_anchors(224)
+    assert anchors.shape == (2254, 2)
+    assert anchors.min() > 0 and anchors.max() < 1
+
+
+def test_region_follows_hip_and_head():
+    backend = FixedOutputBackend()
+    batch, geometry = backend.preprocess_detector([np.zeros((HEIGHT, WIDTH, 3), np.uint8)])
+    region = backend.decode_regions(*backend._run_detector(batch), geometry)[0]
+
+    center_x, center_y, side, rotation = region
+    assert (center_x, center_y) == pytest.approx(HIP, abs=1e-3)
+    assert side == pytest.approx(2.5 * (HIP[1] - HEAD[1]), abs=1e-3)
+    # Upright body, no rotation
+    assert rotation == pytest.approx(0.0, abs=1e-6)
+
+
+def test_landmarks_mapped_back_from_region():
+    backend = FixedOutputBackend()
+    landmarks = backend.detect(np.zeros((HEIGHT, WIDTH, 3), np.uint8))
+
+    assert landmarks.shape == (33, 4)
+    assert landmarks[0, 0] == pytest.approx(HIP[0] / WIDTH, abs=1e-3)
+    assert landmarks[0, 1] == pytest.approx(HIP[1] / HEIGHT, abs=1e-3)
+    assert landmarks[0, 3] > 0.99
+
+
+def test_landmark_model_skipped_without_person():
+    backend = FixedOutputBackend(score_logit=-5.0)
+    images = [np.zeros((HEIGHT, WIDTH, 3), np.uint8)] * 2
+
+    assert backend.detect_batch(images) == [None, None]
+    assert backend.landmark_batches == []
+
+
+def test_exported_backends_share_one_model_across_tiers(monkeypatch):
+    monkeypatch.setattr("src.config.settings.POSE_MODEL_PATH", "/models/pose_landmark.onnx")
+    assert [backend_tier(c, "mediapipe") for c in (0, 1, 2)] == [0, 1, 2]
+    assert {backend_tier(c, "onnxruntime") for c in (0, 1, 2)} == {None}
+    assert model_name(2, "mediapipe") == "heavy"
+    assert model_name(2, "opencv") == "pose_landmark.onnx"
+
+    monkeypatch.setattr("src.config.settings.INFERENCE_BACKEND", "onnxruntime")
+    assert LandmarkCache.make_key(b"image", 0) == LandmarkCache.make_key(b"image", 2)
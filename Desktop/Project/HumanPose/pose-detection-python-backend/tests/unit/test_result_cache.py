@@ -0,0 +1,40 @@
+import os
+import time
+
+import numpy as np
+
+from src.services.result_cache import LandmarkCache
+
+LANDMARKS = np.zeros((33, 4), dtype=np.float32)
+
+
+def age(path, seconds):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def test_sweep_removes_expired_then_oldest(tmp_path):
+    cache = LandmarkCache(ttl_seconds=3600, disk_dir=str(tmp_path), max_disk_entries=2, sweep_interval=3600)
+    for i, key in enumerate(["expired", "oldest", "older", "newest"]):
+        cache.put(key, LANDMARKS)
+        age(tmp_path / f"{key}.npy", [7200, 300, 200, 100][i])
+
+    assert cache.sweep() == 2
+
+    assert sorted(path.stem for path in tmp_path.glob("*.npy")) == ["newest", "older"]
+    assert cache.stats()["disk_swept"] == 2
+
+
+def test_put_sweeps_at_most_once_per_interval(tmp_path):
+    cache = LandmarkCache(ttl_seconds=3600, disk_dir=str(tmp_path), max_disk_entries=1, sweep_interval=3600)
+    cache.put("first", LANDMARKS)
+    age(tmp_path / "first.npy", 100)
+
+    # The first put already swept, the next one is within the interval
+    cache.put("second", None)
+    age(tmp_path / "second.npy", 50)
+    assert len(list(tmp_path.glob("*.npy"))) == 2
+
+    cache._last_sweep = 0.0
+    cache.put("third", LANDMARKS)
+    assert [path.stem for path in tmp_path.glob("*.npy")] == ["third"]
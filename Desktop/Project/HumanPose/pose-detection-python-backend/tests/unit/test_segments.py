@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.services.video_analysis import VideoAnalysisError, plan_segments, seek_frame, stitch_segments
+
+
+class KeyframeCapture:
+    """Seeks to the next keyframe at or after the requested frame, like a sparse-keyframe container"""
+
+    def __init__(self, keyframes):
+        self.keyframes = keyframes
+        self.position = 0
+        self.seeks = []
+
+    def set(self, prop, value):
+        self.seeks.append(value)
+        self.position = min((k for k in self.keyframes if k >= value), default=self.keyframes[-1])
+
+    def get(self, prop):
+        return self.position
+
+
+def segment(first, stop, numbers):
+    records = [(number, np.zeros((33, 4)), "detected") for number in numbers]
+    pipeline = {"frames": len(numbers)}
+    return {
+        "records": records,
+        "frame_stats": {"keyframe_interval": 1, "detected": len(records), "interpolated": 0, "tracked": 0,
+                        "pipeline": pipeline},
+        "fps": 30,
+        "frame_range": (first, stop)
+    }
+
+
+def test_seek_backs_off_until_before_the_frame():
+    cap = KeyframeCapture([0, 100, 250])
+    assert seek_frame(cap, 120) == 100
+    assert cap.seeks == [120, 104, 88]
+
+
+def test_seek_to_exact_frame():
+    cap = KeyframeCapture(list(range(300)))
+    assert seek_frame(cap, 120) == 120
+    assert cap.seeks == [120]
+
+
+def test_stitch_refuses_missing_frames(monkeypatch):
+    monkeypatch.setattr("src.utils.frame_reader.FrameReader.merge_stats", staticmethod(lambda stats: {}))
+    with pytest.raises(VideoAnalysisError):
+        stitch_segments([segment(0, 100, range(100)), segment(110, 200, range(110, 200))])
+
+    # Frames without a pose are not recorded, that is no gap
+    stitched = stitch_segments([segment(0, 100, range(0, 100, 2)), segment(100, 200, range(100, 200))])
+    assert stitched["frame_range"] == (0, 200)
+    assert stitched["frame_stats"]["detected"] == 150
+
+
+def test_plan_segments_from_probe():
+    info = {"fps": 30.0, "frame_count": 30 * 180}
+    segments = plan_segments(info, 4, 60.0, 1.0)
+
+    assert [s["start"] for s in segments] == [0, 1800, 3600]
+    assert segments[-1]["end"] is None
+    assert all(s["warmup"] == 30 for s in segments)
+    assert plan_segments({"fps": 30.0, "frame_count": 0}, 4, 60.0, 1.0) == [{"start": 0, "end": None, "warmup": 0}]
@@ -0,0 +1,115 @@
+from src.ml.tracker_registry import TrackerRegistry
+
+
+class FakeGraph:
+    """Stands in for a MediaPipe tracking graph, counting resets"""
+
+    def __init__(self, complexity):
+        self.complexity = complexity
+        self.resets = 0
+        self.closed = False
+
+    def process(self, frame_rgb):
+        return frame_rgb
+
+    def reset(self):
+        self.resets += 1
+
+    def close(self):
+        self.closed = True
+
+
+def make_registry(max_trackers=2, max_idle=2):
+    return TrackerRegistry(max_trackers=max_trackers, max_idle=max_idle, factory=FakeGraph, crop_factory=FakeGraph)
+
+
+def test_lease_reuses_session_tracker():
+    registry = make_registry()
+    assert registry.lease("a", 1) is registry.lease("a", 1)
+    assert registry.stats()["created"] == 1
+
+
+def test_reclaims_least_recently_used_unpinned_tracker():
+    registry = make_registry()
+    first = registry.lease("a", 1)
+    registry.lease("b", 1)
+
+    reclaimed = registry.lease("c", 1)
+
+    assert reclaimed is first
+    assert reclaimed.session_id == "c"
+    assert reclaimed.pose.resets == 1
+    assert registry.get("a") is None
+    assert registry.stats()["reclaimed"] == 1
+
+
+def test_pinned_tracker_is_never_reclaimed():
+    registry = make_registry()
+    with registry.use("a", 1) as pinned:
+        second = registry.lease("b", 1)
+        third = registry.lease("c", 1)
+
+        assert third is second
+        assert pinned.session_id == "a"
+        assert pinned.pose.resets == 0
+        assert registry.get("a") is pinned
+
+
+def test_goes_over_limit_when_every_tracker_is_pinned():
+    registry = make_registry(max_trackers=1)
+    with registry.use("a", 1) as first:
+        with registry.use("b", 1) as second:
+            assert second is not first
+            assert registry.stats()["in_use"] == 2
+    assert registry.stats()["in_use"] == 0
+
+
+def test_release_waits_for_frame_in_flight():
+    registry = make_registry()
+    with registry.use("a", 1) as tracker:
+        registry.release("a")
+        assert registry.get("a") is None
+        assert tracker.pose.resets == 0
+        assert registry.stats()["idle"] == 0
+
+    assert tracker.pose.resets == 1
+    assert tracker.session_id is None
+    assert registry.stats()["idle"] == 1
+
+
+def test_release_returns_tracker_for_reuse():
+    registry = make_registry()
+    tracker = registry.lease("a", 1)
+    registry.release("a")
+
+    assert registry.lease("b", 1) is tracker
+    assert registry.stats()["created"] == 1
+
+
+def test_use_without_create_does_not_lease():
+    registry = make_registry()
+    with registry.use("a", create=False) as tracker:
+        assert tracker is None
+    assert registry.stats()["leased"] == 0
+
+
+def test_crop_graph_is_per_tracker_and_pooled():
+    registry = make_registry()
+    first = registry.lease("a", 1)
+    second = registry.lease("b", 1)
+    assert first.crop_pose is None
+
+    first.process_crop("crop")
+    second.process_crop("crop")
+    crop_graph = first.crop_pose
+    assert crop_graph is not second.crop_pose
+
+    # Resetting an untouched crop graph is skipped
+    first.reset_crop_graph()
+    first.reset_crop_graph()
+    assert crop_graph.resets == 1
+
+    first.process_crop("crop")
+    registry.release("a")
+    assert crop_graph.resets == 2
+    assert registry.lease("c", 1).crop_pose is crop_graph